@@ -0,0 +1,124 @@
+"""
+bench_page_parser.py
+--------------------
+Per-page cost of PageParser, broken down by phase.
+Point it at a folder of saved .html pages (e.g. `curl -o` a few gov pages).
+
+Usage:
+    python -m app.Experiments.bench_page_parser --html ./sample_html
+    python -m app.Experiments.bench_page_parser --html ./sample_html --repeat 5
+    python -m app.Experiments.bench_page_parser --html ./sample_html --engine lxml
+    python -m app.Experiments.bench_page_parser --prune-scaling
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from app.components.web_crawler.main import DEFAULT_CONFIG
+from app.components.web_crawler.crawler.page_parser import PageParser, ParsedPage
+from app.components.web_crawler.crawler.parser_engines import PARSER_ENGINES, build_soup
+
+
+def bench_phases(parser: PageParser, html: str, url: str) -> dict:
+    """Run the same steps as PageParser.parse, timing each one."""
+    timings = {}
+    page = ParsedPage()
+
+    t = time.perf_counter()
+    soup = build_soup(html, parser.engine)
+    timings["soup"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    parser._extract_all(soup, page, url)
+    timings["extract"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    parser._clean_soup(soup)
+    timings["clean_soup"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    raw_md = parser._md_converter.convert_soup(soup)
+    timings["markdownify"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    parser._clean_markdown(raw_md)
+    timings["clean_markdown"] = time.perf_counter() - t
+
+    return timings
+
+
+def nested_html(depth: int) -> str:
+    """Deeply nested empty layout wrappers around one paragraph of content."""
+    wrappers = "<div><section><span> </span>" * depth
+    closers = "</section></div>" * depth
+    return f"<html><body>{wrappers}<p>Content</p>{closers}{'<div><span> </span></div>' * depth}</body></html>"
+
+
+def bench_prune_scaling(parser: PageParser, depths: list[int]):
+    """Time _prune_empty_tags on growing nesting depth — should scale linearly."""
+    print(f"\n{'='*60}")
+    print(f"EMPTY-TAG PRUNING SCALING")
+    print(f"{'='*60}")
+    for depth in depths:
+        soup = build_soup(nested_html(depth), parser.engine)
+        n_tags = len(soup.find_all(True))
+        t = time.perf_counter()
+        parser._prune_empty_tags(soup)
+        sec = time.perf_counter() - t
+        print(f"  depth {depth:>5} | {n_tags:>6} tags | {1000 * sec:8.2f} ms | "
+              f"{1e6 * sec / n_tags:.2f} µs/tag")
+    print(f"{'='*60}\n")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--html", help="Directory of .html files")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus")
+    arg_parser.add_argument("--base-url", default="https://example.gov.in/",
+                            help="URL used to resolve relative links")
+    arg_parser.add_argument("--engine", default="html.parser", choices=PARSER_ENGINES)
+    arg_parser.add_argument("--prune-scaling", action="store_true",
+                            help="Benchmark empty-tag pruning on synthetic nested HTML")
+    args = arg_parser.parse_args()
+
+    config = {**DEFAULT_CONFIG, "extraction": {**DEFAULT_CONFIG["extraction"], "parser_engine": args.engine}}
+    parser = PageParser(config)
+
+    if args.prune_scaling:
+        bench_prune_scaling(parser, [100, 200, 400, 800, 1600])
+        return
+    if not args.html:
+        arg_parser.error("--html is required unless --prune-scaling is given")
+
+    files = sorted(Path(args.html).rglob("*.html"))
+    if not files:
+        print(f"No .html files found in {args.html}")
+        sys.exit(1)
+    docs = [f.read_text(encoding="utf-8", errors="replace") for f in files]
+    total_bytes = sum(len(d) for d in docs)
+
+    totals: dict = {}
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for html in docs:
+            for phase, sec in bench_phases(parser, html, args.base_url).items():
+                totals[phase] = totals.get(phase, 0.0) + sec
+    elapsed = time.perf_counter() - start
+    n_pages = len(docs) * args.repeat
+
+    print(f"\n{'='*60}")
+    print(f"PAGE PARSER BENCHMARK")
+    print(f"{'='*60}")
+    print(f"  Engine         : {parser.engine}")
+    print(f"  Pages          : {len(docs)} x {args.repeat} passes ({total_bytes / 1024:.0f} KB)")
+    print(f"  Per page       : {1000 * elapsed / n_pages:.1f} ms")
+    print(f"  Throughput     : {n_pages / elapsed:.1f} pages/s")
+    for phase, sec in totals.items():
+        print(f"    {phase:<15}: {1000 * sec / n_pages:7.2f} ms  ({100 * sec / elapsed:4.1f}%)")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
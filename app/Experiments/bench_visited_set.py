@@ -0,0 +1,97 @@
+"""
+bench_visited_set.py
+--------------------
+Memory and speed of the URLFrontier visited-set types (exact / hashed / bloom).
+
+Inserts N synthetic normalized URLs into each structure and reports
+bytes per URL (for the exact set including the URL strings it keeps),
+insert / lookup cost, the observed false-positive rate on N unseen URLs
+and the projected memory for larger crawls.
+
+Usage:
+    python -m app.Experiments.bench_visited_set
+    python -m app.Experiments.bench_visited_set --n 2000000 --types hashed bloom
+    python -m app.Experiments.bench_visited_set --bloom-error-rate 1e-6
+"""
+
+import argparse
+import sys
+import time
+
+from app.components.web_crawler.crawler.visited_set import VISITED_SET_TYPES, create_visited_set
+
+PROJECT_TO = [10_000_000, 50_000_000]
+
+
+def synthetic_urls(start: int, n: int) -> list[str]:
+    """Gov-portal-like normalized URLs, unique per index."""
+    return [
+        f"https://www.dept{i % 97}.gov.in/en/schemes/category-{i % 1013}/"
+        f"notice-{i}?lang=en&page={i % 31}"
+        for i in range(start, start + n)
+    ]
+
+
+def memory_bytes(visited) -> int:
+    """Bytes held by the structure, including the URL strings a plain set keeps."""
+    if isinstance(visited, set):
+        return sys.getsizeof(visited) + sum(sys.getsizeof(url) for url in visited)
+    return visited.nbytes
+
+
+def bench(kind: str, urls: list[str], unseen: list[str], expected: int, error_rate: float) -> dict:
+    cfg = {"visited_set": kind, "expected_urls": expected, "bloom_error_rate": error_rate}
+    n = len(urls)
+
+    visited = create_visited_set(cfg)
+    start = time.perf_counter()
+    for url in urls:
+        visited.add(url)
+    insert_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hits = sum(url in visited for url in urls)
+    hit_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    false_positives = sum(url in visited for url in unseen)
+    miss_sec = time.perf_counter() - start
+
+    return {
+        "bytes_per_url": memory_bytes(visited) / n,
+        "insert_us": 1e6 * insert_sec / n,
+        "hit_us": 1e6 * hit_sec / n,
+        "miss_us": 1e6 * miss_sec / len(unseen),
+        "hit_rate": hits / n,
+        "fp_rate": false_positives / len(unseen),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--n", type=int, default=1_000_000, help="URLs to insert")
+    arg_parser.add_argument("--types", nargs="+", default=list(VISITED_SET_TYPES), choices=VISITED_SET_TYPES)
+    arg_parser.add_argument("--expected", type=int, default=100_000,
+                            help="expected_urls (initial size; the sets grow past it)")
+    arg_parser.add_argument("--bloom-error-rate", type=float, default=1e-4)
+    args = arg_parser.parse_args()
+
+    urls = synthetic_urls(0, args.n)
+    unseen = synthetic_urls(args.n, args.n)
+
+    print(f"\n{'='*78}")
+    print(f"VISITED SET BENCHMARK — {args.n:,} URLs (expected_urls={args.expected:,})")
+    print(f"{'='*78}")
+    print(f"  {'type':<8}{'B/URL':>8}{'insert µs':>11}{'hit µs':>9}{'miss µs':>9}"
+          f"{'hits':>8}{'FP rate':>11}"
+          + "".join(f"{f'@{p // 1_000_000}M':>9}" for p in PROJECT_TO))
+    for kind in args.types:
+        r = bench(kind, urls, unseen, args.expected, args.bloom_error_rate)
+        projected = "".join(f"{r['bytes_per_url'] * p / 2**20:>7.0f}MB" for p in PROJECT_TO)
+        print(f"  {kind:<8}{r['bytes_per_url']:>8.1f}{r['insert_us']:>11.2f}{r['hit_us']:>9.2f}"
+              f"{r['miss_us']:>9.2f}{100 * r['hit_rate']:>7.1f}%{r['fp_rate']:>11.2e}{projected}")
+    print(f"{'='*78}\n")
+
+
+if __name__ == "__main__":
+    main()
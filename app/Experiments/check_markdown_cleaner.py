@@ -0,0 +1,128 @@
+"""
+check_markdown_cleaner.py
+-------------------------
+Golden-output check + microbenchmark for MarkdownCleaner.
+
+Compares MarkdownCleaner.clean() against the original multi-pass regex
+pipeline of PageParser._clean_markdown (frozen below as legacy_clean_markdown)
+on:
+  - raw markdownify output for a folder of saved .html pages (--html)
+  - randomly generated markdown-ish documents (--fuzz N)
+
+Usage:
+    python -m app.Experiments.check_markdown_cleaner --html ./sample_html
+    python -m app.Experiments.check_markdown_cleaner --fuzz 20000 --seed 1
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from app.components.web_crawler.main import DEFAULT_CONFIG
+from app.components.web_crawler.crawler.markdown_cleaner import MarkdownCleaner
+from app.components.web_crawler.crawler.page_parser import PageParser
+from app.components.web_crawler.crawler.parser_engines import build_soup
+
+
+def legacy_clean_markdown(text: str) -> str:
+    """PageParser._clean_markdown before the single-pass cleaner (reference)."""
+    text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)
+    text = re.sub(r"^#{1,6}\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^#{1,6}\s*[\W_]+\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = "\n".join(line.rstrip() for line in text.splitlines())
+    text = re.sub(r"^[-=*_]{3,}\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"\[\s*\]\([^)]*\)", "", text)
+    text = re.sub(r"^Click here\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^View all\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^Read more about .+$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^(Read more|और पढ़े)\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^Subscribe to\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"(Current page|Next page|Last page|Next ›|Last »).*", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^\s*Published Date:\s*\d{1,2}-\d{2}-\d{4}\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^#\w+(\s+#\w+)*\s*$", "", text, flags=re.MULTILINE)
+    lines = [line for line in text.splitlines() if line.strip()]
+    text = "\n".join(lines)
+    return text.strip()
+
+
+FUZZ_LINES = [
+    "", " ", "\t", "   \t ", "# Heading", "## ", "###", "####### x", "## »", "# !!", "### --",
+    "- item", "* * *", "---", "___", "===", "- »", "|", "| a | b |", "| --- | --- |",
+    "Click here", "Click here  ", "click here", "View all", "Read more", "और पढ़े",
+    "Read more about eligibility", "Subscribe to", "Current page 1", "Go to Next page",
+    "Last » 5", "Published Date: 12-03-2024", "  Published Date: 1-01-2020 ",
+    "#health #scheme", "#tag", "text [](http://x) more", "[ ](y)", "Plain sentence here.",
+    "प्रधानमंत्री जन आरोग्य योजना", "multi   space\tand\ttabs  ", "trailing   ", " ",
+    "a\rb", "x\x0cy", "line sep", "_", "**bold**", "1. first", "> quote",
+    "Published Date:", "Published Date: ", "12-03-2024", " 1-01-2020 ", "\t#tag", "  #a #b",
+    "#a\t", "Intro\n\nPublished Date:\n\n12-03-2024\n\nBody", "#health\n\t#tag\nBody",
+]
+
+
+def fuzz_docs(n: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "\n".join(rng.choice(FUZZ_LINES) for _ in range(rng.randint(1, 25)))
+        for _ in range(n)
+    ]
+
+
+def markdown_for_corpus(html_dir: Path) -> list[str]:
+    """Raw markdownify output (before _clean_markdown) for each page."""
+    parser = PageParser(DEFAULT_CONFIG)
+    docs = []
+    for f in sorted(html_dir.rglob("*.html")):
+        soup = build_soup(f.read_text(encoding="utf-8", errors="replace"), parser.engine)
+        parser._clean_soup(soup)
+        docs.append(parser._md_converter.convert_soup(soup))
+    return docs
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--html", help="Directory of saved .html pages")
+    arg_parser.add_argument("--fuzz", type=int, default=5000, help="Random documents to check")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Benchmark passes")
+    args = arg_parser.parse_args()
+
+    docs = fuzz_docs(args.fuzz, args.seed)
+    if args.html:
+        docs = markdown_for_corpus(Path(args.html)) + docs
+
+    cleaner = MarkdownCleaner()
+    mismatches = [d for d in docs if cleaner.clean(d) != legacy_clean_markdown(d)]
+
+    # Microbenchmark
+    timings = {}
+    for name, fn in [("legacy", legacy_clean_markdown), ("single-pass", cleaner.clean)]:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for d in docs:
+                fn(d)
+        timings[name] = time.perf_counter() - start
+    n_calls = len(docs) * args.repeat
+    total_kb = sum(len(d) for d in docs) / 1024
+
+    print(f"\n{'='*60}")
+    print(f"MARKDOWN CLEANER CHECK")
+    print(f"{'='*60}")
+    print(f"  Documents      : {len(docs)} ({total_kb:.0f} KB)")
+    print(f"  Mismatches     : {len(mismatches)}")
+    for name, sec in timings.items():
+        print(f"  {name:<15}: {1e6 * sec / n_calls:8.1f} µs/doc")
+    print(f"  Speedup        : {timings['legacy'] / timings['single-pass']:.2f}x")
+    print(f"{'='*60}\n")
+
+    for d in mismatches[:3]:
+        print(f"MISMATCH input:\n{d!r}\n  legacy: {legacy_clean_markdown(d)!r}\n  new:    {cleaner.clean(d)!r}\n")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+check_parser_engines.py
+-----------------------
+Conformance check for PageParser engines (html.parser / lxml).
+Parses a stored HTML corpus with every engine and compares each ParsedPage
+field against the html.parser reference output.
+
+app/Experiments/sample_html/ is the default corpus: a few small pages
+covering boilerplate, tables, broken markup, Hindi text, JSON-LD and asset
+links. Add saved pages from the sites you crawl (`curl -o`), with an
+optional sidecar `<name>.url` holding the page URL for link resolution.
+
+Usage:
+    python -m app.Experiments.check_parser_engines
+    python -m app.Experiments.check_parser_engines --html ./saved_pages
+    python -m app.Experiments.check_parser_engines --html ./sample_html --engines lxml --show 5
+"""
+
+import argparse
+import difflib
+import sys
+import time
+from pathlib import Path
+
+from app.components.web_crawler.main import DEFAULT_CONFIG
+from app.components.web_crawler.crawler.page_parser import PageParser
+from app.components.web_crawler.crawler.parser_engines import (
+    DEFAULT_ENGINE, PARSER_ENGINES, resolve_engine,
+)
+
+SAMPLE_HTML = Path(__file__).parent / "sample_html"
+
+# Fields compared exactly; URL lists compare the URLs only
+EXACT_FIELDS = [
+    "title", "meta_description", "meta_keywords", "og_title", "og_description",
+    "og_image", "canonical_url", "language", "page_type",
+    "headings", "heading_hierarchy", "tables", "schema_org", "body_text",
+]
+URL_FIELDS = ["images", "pdfs", "internal_links", "external_links"]
+
+
+def load_corpus(html_dir: Path, default_url: str) -> list[tuple[str, str, str]]:
+    docs = []
+    for f in sorted(html_dir.rglob("*.html")):
+        url_file = f.with_suffix(".url")
+        url = url_file.read_text().strip() if url_file.exists() else default_url
+        docs.append((f.name, f.read_text(encoding="utf-8", errors="replace"), url))
+    return docs
+
+
+def parse_all(engine: str, docs: list) -> tuple[dict, float]:
+    config = {**DEFAULT_CONFIG, "extraction": {**DEFAULT_CONFIG["extraction"], "parser_engine": engine}}
+    parser = PageParser(config)
+    start = time.perf_counter()
+    pages = {name: parser.parse(html, url).to_dict() for name, html, url in docs}
+    return pages, time.perf_counter() - start
+
+
+def compare(reference: dict, candidate: dict) -> dict:
+    """field → list of doc names whose value differs from the reference."""
+    mismatches = {f: [] for f in EXACT_FIELDS + URL_FIELDS}
+    for name, ref in reference.items():
+        cand = candidate[name]
+        for field in EXACT_FIELDS:
+            if ref[field] != cand[field]:
+                mismatches[field].append(name)
+        for field in URL_FIELDS:
+            if [x["url"] for x in ref[field]] != [x["url"] for x in cand[field]]:
+                mismatches[field].append(name)
+    return mismatches
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--html", default=str(SAMPLE_HTML), help="Directory of stored .html pages")
+    arg_parser.add_argument("--engines", nargs="+", default=[e for e in PARSER_ENGINES if e != DEFAULT_ENGINE],
+                            choices=PARSER_ENGINES)
+    arg_parser.add_argument("--base-url", default="https://example.gov.in/",
+                            help="URL for pages without a .url sidecar")
+    arg_parser.add_argument("--min-body-similarity", type=float, default=0.98,
+                            help="Fail if mean body_text similarity drops below this")
+    arg_parser.add_argument("--show", type=int, default=0, help="Print N differing doc names per field")
+    args = arg_parser.parse_args()
+
+    docs = load_corpus(Path(args.html), args.base_url)
+    if not docs:
+        print(f"No .html files found in {args.html}")
+        sys.exit(1)
+
+    reference, ref_sec = parse_all(DEFAULT_ENGINE, docs)
+    print(f"\nReference: {DEFAULT_ENGINE} — {len(docs)} pages, {1000 * ref_sec / len(docs):.1f} ms/page")
+
+    failed = False
+    for engine in args.engines:
+        if resolve_engine(engine) != engine:
+            print(f"\n[{engine}] not available — skipped")
+            continue
+
+        candidate, sec = parse_all(engine, docs)
+        mismatches = compare(reference, candidate)
+        similarity = sum(
+            difflib.SequenceMatcher(None, reference[n]["body_text"], candidate[n]["body_text"]).ratio()
+            for n in reference
+        ) / len(reference)
+
+        print(f"\n{'='*60}")
+        print(f"[{engine}] {1000 * sec / len(docs):.1f} ms/page "
+              f"({ref_sec / max(sec, 1e-9):.2f}x vs {DEFAULT_ENGINE})")
+        print(f"{'='*60}")
+        for field, names in mismatches.items():
+            match_pct = 100 * (1 - len(names) / len(docs))
+            print(f"  {field:<20}: {match_pct:5.1f}% identical")
+            for name in names[:args.show]:
+                print(f"      ≠ {name}")
+        print(f"  body_text similarity: {similarity:.4f}")
+
+        if similarity < args.min_body_similarity:
+            failed = True
+
+    print()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
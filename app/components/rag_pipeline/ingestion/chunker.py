@@ -26,11 +26,11 @@ Output per chunk:
 """
 
 import re
-import json
 from app.common.logger import get_logger
 from app.common.custom_exceptions import CustomException
 from pathlib import Path
 from app.config.config import CHUNK_OVERLAP, CHUNK_SIZE, MIN_CHUNK_SIZE
+from app.components.web_crawler.storage.page_store import iter_pages
 
 logger = get_logger(__name__)
 
@@ -266,7 +266,8 @@ def _split_by_headings(text: str) -> list[tuple[str, str]]:
  
 def chunk_all_pages(pages_dir: str) -> list[dict]:
     """
-    Load all page JSONs from output/pages/**/*.json
+    Load all crawled pages from output/pages (per-page JSON files or
+    compressed shards, via the crawler's page store reader).
     Returns all chunks across all pages.
     """
     pages_path = Path(pages_dir)
@@ -277,15 +278,18 @@ def chunk_all_pages(pages_dir: str) -> list[dict]:
     page_count = 0
     skipped = 0
  
-    for json_file in pages_path.rglob("*.json"):
+    for page in iter_pages(pages_path):
         try:
-            page = json.loads(json_file.read_text(encoding="utf-8"))
- 
             # Skip error pages
             if page.get("rag_status", {}).get("error"):
                 skipped += 1
                 continue
- 
+
+            # Skip near-duplicates (crawler dedup) — the canonical page is chunked
+            if page.get("duplicate_of"):
+                skipped += 1
+                continue
+
             # Skip pages with no body text
             if len(page.get("body_text", "")) < 100:
                 skipped += 1
@@ -296,7 +300,7 @@ def chunk_all_pages(pages_dir: str) -> list[dict]:
             page_count += 1
  
         except Exception as e:
-            logger.warning(f"Failed to chunk {json_file.name}: {e}")
+            logger.warning(f"Failed to chunk {page.get('url', '?')}: {e}")
             skipped += 1
  
     logger.info(
@@ -0,0 +1,392 @@
+"""
+async_crawler_engine.py
+-----------------------
+Concurrent crawl orchestrator built on asyncio.
+
+The crawl is a staged producer/consumer pipeline:
+
+    frontier → [fetch] → parse_q → [parse] → asset_q → [assets] → write_q → [write]
+
+- Each stage has its own worker pool and a bounded input queue
+  (config["pipeline"]), so a slow stage applies backpressure upstream
+  instead of buffering pages in memory.
+- Fetch workers = `crawl.concurrent_requests`, with the per-domain
+  politeness of PageFetcher._rate_limit:
+    - at most one in-flight request per host
+    - at least `delay_between_requests_sec` between request starts on a host
+- Blocking work (HTTP via requests, robots.txt fetches, parsing, asset
+  downloads, disk writes) runs in worker threads through asyncio.to_thread.
+- With `pipeline.parse_processes` > 0, parsing runs in a ParserPool
+  (worker processes) instead, so it no longer competes with fetching
+  for the GIL.
+- The parse stage also runs the near-duplicate check (config["dedup"]);
+  with action "drop" a duplicate finishes there, before assets.
+- Per-stage timing is logged with progress and saved in crawl_summary.json
+  so the bottleneck stage is visible.
+
+Writes the same outputs as CrawlOrchestrator (pages/, metadata/,
+crawl_summary.json).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+from app.components.web_crawler.crawler_engine import CrawlOrchestrator
+from app.components.web_crawler.crawler.page_parser import ParserPool
+
+logger = logging.getLogger(__name__)
+
+
+class PageJob:
+    """A page moving through the pipeline stages."""
+
+    def __init__(self, item: dict):
+        self.item = item
+        self.fetch_result = None
+        self.parsed = None
+        self.image_assets: list = []
+        self.pdf_assets: list = []
+        self.dedup: dict = {}
+        self.done = False            # set by _page_done / _job_dropped (counted once)
+
+
+class StageStats:
+    """Timing counters for one pipeline stage."""
+
+    def __init__(self, name: str, workers: int, queue: Optional[asyncio.Queue] = None):
+        self.name = name
+        self.workers = workers
+        self.queue = queue
+        self.processed = 0
+        self.busy_sec = 0.0
+        self.max_queue_depth = 0
+
+    def record(self, elapsed: float):
+        self.processed += 1
+        self.busy_sec += elapsed
+
+    def observe_queue(self):
+        if self.queue is not None:
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def to_dict(self) -> dict:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "busy_sec": round(self.busy_sec, 3),
+            "avg_ms": round(1000 * self.busy_sec / self.processed, 1) if self.processed else 0.0,
+            # busy time per worker — the stage closest to wall time is the bottleneck
+            "busy_sec_per_worker": round(self.busy_sec / max(self.workers, 1), 3),
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class AsyncCrawlOrchestrator(CrawlOrchestrator):
+    """
+    Concurrent variant of CrawlOrchestrator.
+    Reuses all components; only the scheduling differs.
+    """
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        pipeline_cfg = config.get("pipeline", {})
+
+        self.concurrency = max(1, int(config.get("crawl", {}).get("concurrent_requests", 1)))
+        self.parse_processes = max(0, int(pipeline_cfg.get("parse_processes", 0)))
+        # enough parse-stage workers to keep every process busy
+        self.parse_workers = max(1, int(pipeline_cfg.get("parse_workers", 2)), self.parse_processes)
+        self.asset_workers = max(1, int(pipeline_cfg.get("asset_workers", 4)))
+        self.write_workers = max(1, int(pipeline_cfg.get("write_workers", 1)))
+
+        self.fetch_queue_size = pipeline_cfg.get("fetch_queue_size", self.concurrency)
+        self.parse_queue_size = pipeline_cfg.get("parse_queue_size", 20)
+        self.asset_queue_size = pipeline_cfg.get("asset_queue_size", 20)
+        self.write_queue_size = pipeline_cfg.get("write_queue_size", 50)
+
+        self.parser_pool: Optional[ParserPool] = None
+        self._host_locks: dict = {}      # domain → asyncio.Lock
+        self._stage_stats: dict = {}     # stage name → StageStats
+        self._active = 0                 # jobs popped from frontier, not yet finished
+        self._progress: Optional[asyncio.Event] = None
+        self._pages_processed = 0
+        self._start_time = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # ──────────────────────────────────────────────────────────────
+    # Main run loop
+    # ──────────────────────────────────────────────────────────────
+
+    def run(self, seed_urls: list[str]):
+        """Start crawl from seed URLs."""
+        return asyncio.run(self._run(seed_urls))
+
+    async def _run(self, seed_urls: list[str]):
+        logger.info(f"Starting async crawl — seeds: {seed_urls}")
+        logger.info(f"Depth: {self.config['crawl']['max_depth']} | "
+                    f"Max pages: {self.config['crawl']['max_pages']} | "
+                    f"Workers: fetch={self.concurrency} parse={self.parse_workers} "
+                    f"assets={self.asset_workers} write={self.write_workers}")
+
+        self.frontier.add_seeds(seed_urls)
+        self._seed_from_sitemaps(seed_urls)
+        self._pages_processed = 0
+        self._start_time = time.time()
+        self._active = 0
+        self._progress = asyncio.Event()
+        if self.parse_processes:
+            self.parser_pool = ParserPool(self.config, self.parse_processes)
+
+        fetch_q = asyncio.Queue(maxsize=self.fetch_queue_size)
+        parse_q = asyncio.Queue(maxsize=self.parse_queue_size)
+        asset_q = asyncio.Queue(maxsize=self.asset_queue_size)
+        write_q = asyncio.Queue(maxsize=self.write_queue_size)
+
+        stages = [
+            # name, workers, input queue, handler, output queue
+            ("fetch", self.concurrency, fetch_q, self._fetch_stage, parse_q),
+            ("parse", self.parse_workers, parse_q, self._parse_stage, asset_q),
+            ("assets", self.asset_workers, asset_q, self._asset_stage, write_q),
+            ("write", self.write_workers, write_q, self._write_stage, None),
+        ]
+
+        workers = []
+        for name, n_workers, in_q, handler, out_q in stages:
+            self._stage_stats[name] = StageStats(name, n_workers, in_q)
+            for _ in range(n_workers):
+                workers.append(asyncio.create_task(
+                    self._stage_worker(name, in_q, handler, out_q)
+                ))
+
+        try:
+            await self._feed(fetch_q)
+
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            logger.info("Crawl interrupted by user")
+            self._interrupted = True
+
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if self._flush_task is not None:
+                await self._flush_task
+            if self.parser_pool is not None:
+                self.parser_pool.close()
+            self._log_stage_stats()
+            summary = self._finish(self._pages_processed, self._start_time)
+
+        return summary
+
+    async def _feed(self, fetch_q: asyncio.Queue):
+        """
+        Move URLs from the frontier into the fetch queue.
+        Returns once the frontier is drained and no job is left in the pipeline.
+        """
+        while True:
+            while self.frontier.has_items() and self.frontier.is_within_budget():
+                item = self.frontier.pop_ready()
+                if item is None:
+                    break                    # every queued host is cooling down
+                if self._should_skip(item):
+                    logger.debug(f"Skipping (already crawled): {item['url']}")
+                    self.frontier.mark_visited(item["url"])
+                    continue
+                self._active += 1
+                await fetch_q.put(PageJob(item))     # blocks while fetchers are saturated
+
+            cooldown = None
+            if self.frontier.has_items() and self.frontier.is_within_budget():
+                cooldown = self.frontier.seconds_until_ready()
+            if self._active == 0 and cooldown is None:
+                return
+
+            # Wait until a job finishes, a parse adds new links or a host cools down
+            self._progress.clear()
+            try:
+                await asyncio.wait_for(self._progress.wait(), timeout=cooldown)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _stage_worker(self, name: str, in_q: asyncio.Queue, handler, out_q: Optional[asyncio.Queue]):
+        """
+        Generic stage worker: take a job, run the handler, pass the result on.
+        A handler returning None means the job is finished.
+        """
+        stats = self._stage_stats[name]
+        while True:
+            job = await in_q.get()
+            stats.observe_queue()
+            try:
+                start = time.perf_counter()
+                result = await handler(job)
+                stats.record(time.perf_counter() - start)
+            except Exception as e:
+                logger.error(f"Stage '{name}' failed: {e}")
+                result = None
+                if not job.done:
+                    self._page_done(job)
+            finally:
+                in_q.task_done()
+
+            if result is not None and out_q is not None:
+                await out_q.put(result)      # backpressure from the next stage
+
+    # ──────────────────────────────────────────────────────────────
+    # Stages
+    # ──────────────────────────────────────────────────────────────
+
+    async def _fetch_stage(self, job: PageJob) -> Optional[PageJob]:
+        """STEP 1 + 2: Fetch (polite per host); finish non-HTML here."""
+        item = job.item
+        url = item["url"]
+        if not await self._robots_allowed_async(item):
+            self._job_dropped(job)
+            return None
+        logger.debug(f"[depth={item['depth']}] Crawling: {url}")
+
+        job.fetch_result = fetch_result = await self._fetch(url, self._validators(url))
+
+        if fetch_result.not_modified:
+            links = await asyncio.to_thread(self._not_modified_links, item, fetch_result)
+            self.frontier.add_links(links=links, from_url=url, current_depth=item["depth"])
+            self._page_done(job)
+            return None
+
+        if fetch_result.success and fetch_result.is_pdf:
+            await asyncio.to_thread(self._handle_direct_pdf, item, fetch_result)
+            self._page_done(job)
+            return None
+
+        if not fetch_result.success or not fetch_result.is_html:
+            self.writer.write_error(item, fetch_result)
+            logger.warning(f"Failed [{fetch_result.status_code}] [{fetch_result.error}]: {url}")
+            self._page_done(job)
+            return None
+
+        return job
+
+    async def _parse_stage(self, job: PageJob) -> Optional[PageJob]:
+        """STEP 3 + 4: Parse HTML, feed discovered links to the frontier, check for near-duplicates."""
+        url = job.item["url"]
+        if self.parser_pool is not None:
+            job.parsed = await asyncio.wrap_future(self.parser_pool.submit(
+                job.fetch_result.html, url, job.fetch_result.final_url
+            ))
+        else:
+            job.parsed = await asyncio.to_thread(
+                self.parser.parse,
+                html=job.fetch_result.html,
+                url=url,
+                final_url=job.fetch_result.final_url,
+            )
+        # raw HTML is no longer needed downstream
+        job.fetch_result.html = None
+
+        # frontier is only touched from the event loop thread
+        all_links = job.parsed.internal_links + job.parsed.external_links
+        self.frontier.add_links(
+            links=[{"url": l["url"], "text": l["text"]} for l in all_links],
+            from_url=url,
+            current_depth=job.item["depth"],
+        )
+        self._progress.set()
+
+        signature = await asyncio.to_thread(self._signature, job.parsed)
+        job.dedup = self._check_duplicate(url, signature)
+        if job.dedup and self._drop_duplicates:
+            self.writer.write_duplicate(job.item, job.fetch_result, job.parsed, job.dedup)
+            self._page_done(job)
+            return None
+        return job
+
+    async def _asset_stage(self, job: PageJob) -> PageJob:
+        """STEP 5 + 6: Download images and PDFs (only queues them when the AssetPool is on)."""
+        job.image_assets, job.pdf_assets = await asyncio.to_thread(
+            self._download_assets, job.item["url"], job.parsed
+        )
+        return job
+
+    async def _write_stage(self, job: PageJob) -> None:
+        """STEP 7: Write page JSON + update indexes."""
+        await asyncio.to_thread(
+            self.writer.write_page,
+            queue_item=job.item,
+            fetch_result=job.fetch_result,
+            parsed_page=job.parsed,
+            image_assets=job.image_assets,
+            pdf_assets=job.pdf_assets,
+            dedup=job.dedup,
+        )
+        self._page_done(job)
+        return None
+
+    # ──────────────────────────────────────────────────────────────
+    # Helpers
+    # ──────────────────────────────────────────────────────────────
+
+    async def _fetch(self, url: str, validators: dict = None):
+        """
+        Fetch with per-host politeness.
+        Holding the host lock across the request keeps one in-flight
+        request per host; the sleep keeps the host's delay (robots.txt
+        Crawl-delay included) between request starts, also for jobs that
+        waited in fetch_q.
+        """
+        domain = urlparse(url).hostname or "unknown"
+        lock = self._host_locks.setdefault(domain, asyncio.Lock())
+
+        async with lock:
+            wait = self.fetcher.reserve_slot(domain, self.frontier.host_delay(domain))
+            if wait > 0:
+                logger.debug(f"Rate limit: waiting {wait:.2f}s for {domain}")
+                await asyncio.sleep(wait)
+            return await asyncio.to_thread(self.fetcher.fetch, url, validators, False)
+
+    async def _robots_allowed_async(self, item: dict) -> bool:
+        """robots.txt check; a host's rules are fetched in a worker thread, never on the loop."""
+        verdict = self.frontier.robots_verdict(item["url"])
+        if verdict == "unknown":
+            verdict = await asyncio.to_thread(self.frontier.robots_verdict, item["url"], True)
+        return self.frontier.settle_robots(item, verdict)
+
+    def _job_dropped(self, job: PageJob):
+        """A popped URL left the pipeline without being crawled (robots.txt)."""
+        job.done = True
+        self._active -= 1
+        self._progress.set()
+
+    def _page_done(self, job: PageJob):
+        """Mark one job as finished (once) and log progress; the index flush runs off the loop."""
+        job.done = True
+        self.frontier.mark_visited(job.item["url"])
+        self._active -= 1
+        self._pages_processed += 1
+        self._progress.set()
+        if self._pages_processed % self.log_every == 0:
+            self._log_rate(self._pages_processed, self._start_time)
+            self._log_stage_stats()
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_in_thread())
+
+    async def _flush_in_thread(self):
+        """Periodic index flush in a worker thread (skipped while the previous one runs)."""
+        try:
+            await asyncio.to_thread(self._flush_indexes)
+        except Exception as e:
+            logger.error(f"Index flush failed: {e}")
+
+    def _log_stage_stats(self):
+        for name, stats in self._stage_stats.items():
+            s = stats.to_dict()
+            logger.info(
+                f"  Stage {name:<6} | workers={s['workers']} | done={s['processed']} | "
+                f"avg={s['avg_ms']}ms | busy/worker={s['busy_sec_per_worker']}s | "
+                f"queue={s['queue_depth']} (max {s['max_queue_depth']})"
+            )
+
+    def _pipeline_stats(self) -> dict:
+        return {name: stats.to_dict() for name, stats in self._stage_stats.items()}
@@ -2,23 +2,38 @@
 asset_downloader.py
 -------------------
 Downloads images and PDFs found during crawling.
+- One streaming GET per asset: status / type / size checked on the
+  response headers, body hashed while it streams to a temp file
+  (optional HEAD preflight: assets.head_preflight)
 - Validates content type before saving
 - Generates content hash (dedup)
-- Extracts image dimensions
-- Classifies image type (poster, photo, icon, etc.)
-- Extracts basic PDF metadata
+- Extracts image dimensions from the header and classifies the image
+  (poster, photo, icon, etc.) from a reduced-size decode
+  (crawler/image_inspector.py), optionally in worker processes
+- Broken transfers resume with HTTP Range requests (assets.resume_attempts)
+- Extracts basic PDF metadata (page count, title, author, encryption)
+  from the trailer / xref with pypdf (crawler/pdf_inspector.py)
 - Size filtering
+- URL → result cache (metadata/asset_cache.json): an asset URL seen on an
+  earlier page or crawl is answered without any request
 """
 
 import os
-import io
+import json
+import time
 import hashlib
 import logging
+import tempfile
 import mimetypes
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
 from typing import Optional
-from PIL import Image as PILImage
+
+import requests
+
+from app.components.web_crawler.crawler.image_inspector import inspect_image
+from app.components.web_crawler.crawler.pdf_inspector import inspect_pdf
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +47,19 @@ IMAGE_MIME_MAP = {
 }
 
 PDF_MIME = "application/pdf"
+CHUNK_SIZE = 64 * 1024
+
+
+# a body read that broke off — resumable with a Range request
+_TRANSFER_ERRORS = (
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+class _Rejected(Exception):
+    """Asset skipped on a size / type check; the message is the skip_reason."""
 
 
 class DownloadedAsset:
@@ -52,6 +80,9 @@ class DownloadedAsset:
         self.image_type: str = ""     # poster | photo | icon | infographic | diagram | unknown
         # PDF-specific
         self.pdf_page_count: int = 0
+        self.pdf_title: Optional[str] = None
+        self.pdf_author: Optional[str] = None
+        self.pdf_encrypted: bool = False
 
     def to_dict(self) -> dict:
         return {k: v for k, v in self.__dict__.items()}
@@ -82,71 +113,89 @@ class AssetDownloader:
         self.min_image_bytes = self.assets_cfg.get("min_image_size_bytes", 5120)   # 5KB
         self.max_image_mb = self.assets_cfg.get("max_image_size_mb", 20)
         self.max_pdf_mb = self.assets_cfg.get("max_pdf_size_mb", 100)
+        # False: one streaming GET per asset; True: HEAD first (old behaviour)
+        self.head_preflight = self.assets_cfg.get("head_preflight", False)
+        # Range-request retries for a transfer that breaks off midway
+        self.resume_attempts = self.assets_cfg.get("resume_attempts", 3)
+        self.resumed_transfers = 0
+        # image classification: reduced-decode pixel stats, optionally in worker processes
+        self.pixel_stats = self.assets_cfg.get("image_pixel_stats", True)
+        self.image_processes = self.assets_cfg.get("image_processes", 0)
+        self._image_pool = (ProcessPoolExecutor(max_workers=self.image_processes)
+                            if self.image_processes > 0 else None)
 
         # Track downloaded hashes to avoid re-saving duplicates
         self._downloaded_hashes: dict = {}   # hash → file_path
 
+        # URL → DownloadedAsset fields, persisted between crawls
+        self.use_url_cache = self.assets_cfg.get("url_cache", True)
+        self.cache_ttl = self.assets_cfg.get("url_cache_ttl_hours", 168) * 3600
+        self.cache_path = self.output_dir / "metadata" / "asset_cache.json"
+        self._url_cache: dict = {}
+        self.cache_hits = 0
+        if self.use_url_cache:
+            self._load_cache()
+
     # ──────────────────────────────────────────────────────────────
     # Image download
     # ──────────────────────────────────────────────────────────────
 
     def download_image(self, url: str, source_domain: str) -> DownloadedAsset:
+        cached = self.cached(url)
+        if cached is not None:
+            return cached
+        result = self._download_image(url, source_domain)
+        self._remember(result)
+        return result
+
+    def _download_image(self, url: str, source_domain: str) -> DownloadedAsset:
         result = DownloadedAsset()
         result.url = url
+        max_bytes = self.max_image_mb * 1024 * 1024
 
         try:
-            # HEAD check first to avoid downloading trash
-            head = self._head(url)
-            if not head:
-                result.error = "HEAD request failed"
+            # Optional HEAD check (assets.head_preflight)
+            if self.head_preflight and self._image_preflight_rejects(url, result):
                 return result
 
-            content_type = head.get("content_type", "").split(";")[0].strip().lower()
-            content_length = head.get("content_length", 0)
-
-            # Size check
-            if content_length > 0:
-                if content_length < self.min_image_bytes:
-                    result.skipped = True
-                    result.skip_reason = f"Too small ({content_length}B < {self.min_image_bytes}B)"
-                    return result
-                if content_length > self.max_image_mb * 1024 * 1024:
-                    result.skipped = True
-                    result.skip_reason = f"Too large (>{self.max_image_mb}MB)"
-                    return result
-
-            # Validate MIME type
-            if content_type and not content_type.startswith("image/"):
-                # Try to infer from URL
-                ext = Path(urlparse(url).path).suffix.lower()
-                if ext not in {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}:
-                    result.skipped = True
-                    result.skip_reason = f"Not an image: {content_type}"
+            # Download: one streaming GET, checked on its headers
+            with self.session.get(url, timeout=30, stream=True) as response:
+                if response.status_code != 200:
+                    result.error = f"HTTP {response.status_code}"
                     return result
 
-            # Download
-            response = self.session.get(url, timeout=30, stream=True)
-            if response.status_code != 200:
-                result.error = f"HTTP {response.status_code}"
-                return result
-
-            data = response.content
-
-            # Content-type from actual response
-            actual_ct = response.headers.get("Content-Type", content_type).split(";")[0].strip().lower()
-            result.content_type = actual_ct
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                result.content_type = content_type
+
+                # Validate MIME type
+                if content_type and not content_type.startswith("image/"):
+                    # Try to infer from URL
+                    ext = Path(urlparse(url).path).suffix.lower()
+                    if ext not in {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}:
+                        raise _Rejected(f"Not an image: {content_type}")
+
+                # Size check
+                content_length = self._content_length(response)
+                if content_length > 0:
+                    if content_length < self.min_image_bytes:
+                        raise _Rejected(f"Too small ({content_length}B < {self.min_image_bytes}B)")
+                    if content_length > max_bytes:
+                        raise _Rejected(f"Too large (>{self.max_image_mb}MB)")
+
+                domain_dir = self.images_dir / self._sanitize_domain(source_domain)
+                tmp_path, size, content_hash = self._stream_to_file(
+                    response, domain_dir, max_bytes, f"Too large (>{self.max_image_mb}MB)", timeout=30,
+                )
 
             # Size validation after download
-            if len(data) < self.min_image_bytes:
-                result.skipped = True
-                result.skip_reason = f"Too small after download ({len(data)}B)"
-                return result
+            if size < self.min_image_bytes:
+                tmp_path.unlink()
+                raise _Rejected(f"Too small after download ({size}B)")
 
             # Hash for dedup
-            content_hash = hashlib.sha256(data).hexdigest()[:16]
             result.content_hash = content_hash
-
             if content_hash in self._downloaded_hashes:
+                tmp_path.unlink()
                 result.file_path = self._downloaded_hashes[content_hash]
                 result.success = True
                 result.skipped = True
@@ -154,7 +203,7 @@ class AssetDownloader:
                 return result
 
             # Extension
-            ext = IMAGE_MIME_MAP.get(actual_ct, "")
+            ext = IMAGE_MIME_MAP.get(content_type, "")
             if not ext:
                 ext = Path(urlparse(url).path).suffix.lower()
             if not ext:
@@ -162,57 +211,67 @@ class AssetDownloader:
             result.extension = ext
 
             # Save
-            domain_dir = self.images_dir / self._sanitize_domain(source_domain)
-            domain_dir.mkdir(parents=True, exist_ok=True)
-            file_name = f"{content_hash}{ext}"
-            file_path = domain_dir / file_name
-
-            file_path.write_bytes(data)
+            file_path = domain_dir / f"{content_hash}{ext}"
+            os.replace(tmp_path, file_path)
             result.file_path = str(file_path)
-            result.file_size_bytes = len(data)
+            result.file_size_bytes = size
             self._downloaded_hashes[content_hash] = str(file_path)
 
-            # Image analysis
-            try:
-                img = PILImage.open(io.BytesIO(data))
-                result.width, result.height = img.size
-                result.image_type = self._classify_image(img, result.width, result.height, len(data))
-            except Exception:
-                pass
+            # Image analysis: header dimensions + reduced-size decode
+            info = self._inspect_image(file_path)
+            result.width, result.height = info["width"], info["height"]
+            result.image_type = info["image_type"]
 
             if not result.image_type:
                 result.image_type = self._classify_image_heuristic(
-                    url, result.width, result.height, len(data)
+                    url, result.width, result.height, size
                 )
 
             result.success = True
 
+        except _Rejected as e:
+            result.skipped = True
+            result.skip_reason = str(e)
+
         except Exception as e:
             result.error = str(e)[:200]
             logger.warning(f"Failed to download image {url}: {e}")
 
         return result
 
-    def _classify_image(self, img, width: int, height: int, size_bytes: int) -> str:
-        """Classify image type using PIL."""
-        # Icon: small
-        if width <= 64 or height <= 64:
-            return "icon"
-        if width <= 200 and height <= 200:
-            return "icon"
-
-        # Likely a poster/banner: very wide
-        aspect = width / max(height, 1)
-        if aspect > 3:
-            return "banner"
-        if aspect < 0.4:
-            return "poster_vertical"
+    def _image_preflight_rejects(self, url: str, result: DownloadedAsset) -> bool:
+        """HEAD-based checks (head_preflight mode). Sets the skip/error on result."""
+        head = self._head(url)
+        if not head:
+            result.error = "HEAD request failed"
+            return True
 
-        # Large image
-        if width >= 800 and height >= 600:
-            return "photo_or_poster"
+        content_type = head.get("content_type", "").split(";")[0].strip().lower()
+        content_length = head.get("content_length", 0)
 
-        return "image_unknown"
+        if content_length > 0:
+            if content_length < self.min_image_bytes:
+                result.skipped = True
+                result.skip_reason = f"Too small ({content_length}B < {self.min_image_bytes}B)"
+                return True
+            if content_length > self.max_image_mb * 1024 * 1024:
+                result.skipped = True
+                result.skip_reason = f"Too large (>{self.max_image_mb}MB)"
+                return True
+
+        if content_type and not content_type.startswith("image/"):
+            ext = Path(urlparse(url).path).suffix.lower()
+            if ext not in {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}:
+                result.skipped = True
+                result.skip_reason = f"Not an image: {content_type}"
+                return True
+        return False
+
+    def _inspect_image(self, file_path: Path) -> dict:
+        """inspect_image() inline, or in the worker process pool (assets.image_processes)."""
+        if self._image_pool is not None:
+            return self._image_pool.submit(inspect_image, str(file_path), self.pixel_stats).result()
+        return inspect_image(file_path, self.pixel_stats)
 
     def _classify_image_heuristic(self, url: str, width: int, height: int, size_bytes: int) -> str:
         """Classify image type from URL patterns and size hints."""
@@ -234,92 +293,248 @@ class AssetDownloader:
     # ──────────────────────────────────────────────────────────────
 
     def download_pdf(self, url: str, source_domain: str) -> DownloadedAsset:
+        cached = self.cached(url)
+        if cached is not None:
+            return cached
+        result = self._download_pdf(url, source_domain)
+        self._remember(result)
+        return result
+
+    def _download_pdf(self, url: str, source_domain: str) -> DownloadedAsset:
         result = DownloadedAsset()
         result.url = url
         result.content_type = "application/pdf"
         result.extension = ".pdf"
+        max_bytes = self.max_pdf_mb * 1024 * 1024
 
         try:
-            # HEAD check
-            head = self._head(url)
-            if head:
-                content_length = head.get("content_length", 0)
-                if content_length > self.max_pdf_mb * 1024 * 1024:
+            # Optional HEAD check (assets.head_preflight)
+            if self.head_preflight:
+                head = self._head(url)
+                if head and head.get("content_length", 0) > max_bytes:
                     result.skipped = True
                     result.skip_reason = f"Too large (>{self.max_pdf_mb}MB)"
                     return result
 
-            # Download
-            response = self.session.get(url, timeout=60, stream=True)
-            if response.status_code != 200:
-                result.error = f"HTTP {response.status_code}"
-                return result
-
-            # Verify it's actually a PDF
-            data = response.content
-            if not data.startswith(b"%PDF"):
-                result.skipped = True
-                result.skip_reason = "Not a valid PDF (missing %PDF header)"
-                return result
-
-            if len(data) > self.max_pdf_mb * 1024 * 1024:
-                result.skipped = True
-                result.skip_reason = f"Too large (>{self.max_pdf_mb}MB)"
-                return result
+            # Download: one streaming GET, checked on its headers
+            with self.session.get(url, timeout=60, stream=True) as response:
+                if response.status_code != 200:
+                    result.error = f"HTTP {response.status_code}"
+                    return result
+                if self._content_length(response) > max_bytes:
+                    raise _Rejected(f"Too large (>{self.max_pdf_mb}MB)")
+
+                # Verify it's actually a PDF (first bytes) while streaming
+                domain_dir = self.pdfs_dir / self._sanitize_domain(source_domain)
+                tmp_path, size, content_hash = self._stream_to_file(
+                    response, domain_dir, max_bytes, f"Too large (>{self.max_pdf_mb}MB)",
+                    magic=(b"%PDF", "Not a valid PDF (missing %PDF header)"), timeout=60,
+                )
 
             # Hash for dedup
-            content_hash = hashlib.sha256(data).hexdigest()[:16]
             result.content_hash = content_hash
-
             if content_hash in self._downloaded_hashes:
+                tmp_path.unlink()
                 result.file_path = self._downloaded_hashes[content_hash]
                 result.success = True
                 result.skipped = True
                 result.skip_reason = "Duplicate (hash match)"
+                self._fill_pdf_info(result, result.file_path)
                 return result
 
             # Save
-            domain_dir = self.pdfs_dir / self._sanitize_domain(source_domain)
-            domain_dir.mkdir(parents=True, exist_ok=True)
-            file_name = f"{content_hash}.pdf"
-            file_path = domain_dir / file_name
-
-            file_path.write_bytes(data)
+            file_path = domain_dir / f"{content_hash}.pdf"
+            os.replace(tmp_path, file_path)
             result.file_path = str(file_path)
-            result.file_size_bytes = len(data)
+            result.file_size_bytes = size
             self._downloaded_hashes[content_hash] = str(file_path)
 
-            # Basic PDF metadata (page count from xref)
-            result.pdf_page_count = self._count_pdf_pages(data)
+            # Basic PDF metadata (trailer / xref / Info dict via pypdf)
+            self._fill_pdf_info(result, file_path)
 
             result.success = True
 
+        except _Rejected as e:
+            result.skipped = True
+            result.skip_reason = str(e)
+
         except Exception as e:
             result.error = str(e)[:200]
             logger.warning(f"Failed to download PDF {url}: {e}")
 
         return result
 
-    def _count_pdf_pages(self, data: bytes) -> int:
-        """Quick page count from raw PDF bytes without full parsing."""
+    @staticmethod
+    def _fill_pdf_info(result: DownloadedAsset, file_path):
+        info = inspect_pdf(file_path)
+        result.pdf_page_count = info["page_count"]
+        result.pdf_title = info["title"]
+        result.pdf_author = info["author"]
+        result.pdf_encrypted = info["encrypted"]
+
+    # ──────────────────────────────────────────────────────────────
+    # URL cache
+    # ──────────────────────────────────────────────────────────────
+
+    def cached(self, url: str) -> Optional[DownloadedAsset]:
+        """Result of an earlier download of this URL, or None (expired / file gone)."""
+        entry = self._url_cache.get(url)
+        if entry is None:
+            return None
+        # pop, not del: asset workers can expire the same entry concurrently
+        if self.cache_ttl and time.time() - entry.get("cached_at", 0) > self.cache_ttl:
+            self._url_cache.pop(url, None)
+            return None
+        if entry.get("file_path") and not os.path.exists(entry["file_path"]):
+            self._url_cache.pop(url, None)
+            return None
+
+        result = DownloadedAsset()
+        for key in result.__dict__:
+            if key in entry:
+                setattr(result, key, entry[key])
+        if result.success:
+            # same semantics as a hash match: stored already, not re-saved
+            result.skipped = True
+            result.skip_reason = "Duplicate (URL cache)"
+        self.cache_hits += 1
+        return result
+
+    def _remember(self, result: DownloadedAsset):
+        """Cache outcomes that won't change on the next page: saved, skipped, 4xx."""
+        if not self.use_url_cache:
+            return
+        status = result.error or ""
+        permanent_error = status.startswith("HTTP 4") and status not in ("HTTP 408", "HTTP 429")
+        if result.success or result.skipped or permanent_error:
+            self._url_cache[result.url] = {**result.to_dict(), "cached_at": time.time()}
+
+    def save_cache(self):
+        """Write the URL cache next to image_index.json / pdf_index.json."""
+        if not self.use_url_cache:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(dict(self._url_cache), ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.cache_path)
+
+    def close(self):
+        """Stop the image classification processes (if any)."""
+        if self._image_pool is not None:
+            self._image_pool.shutdown(wait=True, cancel_futures=True)
+            self._image_pool = None
+
+    def _load_cache(self):
+        if not self.cache_path.exists():
+            return
         try:
-            # Count /Page objects (approximation)
-            count = data.count(b"/Type /Page\n") + data.count(b"/Type/Page\n") + data.count(b"/Type /Page\r")
-            if count > 0:
-                return count
-            # Fallback: look for /Count in Pages dict
-            import re
-            matches = re.findall(rb"/Count\s+(\d+)", data)
-            if matches:
-                return int(matches[-1])
-        except Exception:
-            pass
-        return 0
+            self._url_cache = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable asset cache {self.cache_path}: {e}")
+            return
+        for entry in self._url_cache.values():
+            if entry.get("content_hash") and entry.get("file_path"):
+                self._downloaded_hashes.setdefault(entry["content_hash"], entry["file_path"])
+        logger.info(f"Asset URL cache loaded: {len(self._url_cache)} URLs")
 
     # ──────────────────────────────────────────────────────────────
     # Helpers
     # ──────────────────────────────────────────────────────────────
 
+    def _stream_to_file(self, response, directory: Path, max_bytes: int, too_large: str,
+                        magic: tuple = None, timeout: int = 60) -> tuple[Path, int, str]:
+        """
+        Stream the body into a temp file in `directory`, hashing as it goes.
+        A transfer that breaks off (or ends short of Content-Length) is
+        resumed with a Range request (If-Range on the ETag / Last-Modified),
+        up to resume_attempts times; a server that answers 200 instead of
+        206 restarts it from byte 0. Content-encoded bodies are neither
+        length-checked nor resumed.
+        Returns (tmp_path, size, content_hash); the caller renames or deletes it.
+        Raises _Rejected (temp file removed) past max_bytes or on a magic mismatch.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".part")
+        url = response.url
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        # iter_content decodes gzip/deflate: neither Content-Length nor byte
+        # offsets refer to what we write, so only identity bodies are
+        # length-checked and resumed
+        identity = self._identity_encoded(response)
+        expected = self._content_length(response) if identity else 0    # 0 = unknown / unchecked
+        hasher = hashlib.sha256()
+        size = 0
+        attempts = 0
+        resumed = []                                  # responses opened here, closed here
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    try:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            if size == 0 and magic and not chunk.startswith(magic[0]):
+                                raise _Rejected(magic[1])
+                            size += len(chunk)
+                            if size > max_bytes:
+                                raise _Rejected(too_large)
+                            hasher.update(chunk)
+                            f.write(chunk)
+                        if expected and size < expected:
+                            raise requests.exceptions.ChunkedEncodingError(
+                                f"short read ({size} of {expected} bytes)")
+                        break
+                    except _TRANSFER_ERRORS as e:
+                        if not identity or attempts >= self.resume_attempts:
+                            raise
+                        attempts += 1
+                        response = self._resume(url, size, validator, attempts, timeout, e)
+                        resumed.append(response)
+                        if response.status_code == 206 and self._range_start(response) == size:
+                            continue
+                        if response.status_code != 200:
+                            raise requests.exceptions.HTTPError(
+                                f"HTTP {response.status_code} resuming at byte {size}")
+                        # range ignored (or entity changed): start over
+                        f.seek(0)
+                        f.truncate()
+                        hasher = hashlib.sha256()
+                        size = 0
+                        identity = self._identity_encoded(response)
+                        expected = self._content_length(response) if identity else 0
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        finally:
+            for r in resumed:
+                r.close()
+        if attempts:
+            self.resumed_transfers += 1
+        return Path(tmp_name), size, hasher.hexdigest()[:16]
+
+    def _resume(self, url: str, offset: int, validator: Optional[str], attempt: int,
+                timeout: int, error: Exception):
+        """GET the rest of a broken transfer: Range from `offset`, If-Range on the validator."""
+        logger.info(f"Resuming {url} at byte {offset} (attempt {attempt}: {str(error)[:80]})")
+        time.sleep(0.5 * attempt)
+        headers = {"Range": f"bytes={offset}-"}
+        if validator:
+            headers["If-Range"] = validator
+        return self.session.get(url, headers=headers, timeout=timeout, stream=True)
+
+    @staticmethod
+    def _range_start(response) -> int:
+        """First byte of a 206 body, from 'Content-Range: bytes 100-999/1000' (-1 if absent)."""
+        match = re.match(r"bytes\s+(\d+)-", response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else -1
+
+    @staticmethod
+    def _identity_encoded(response) -> bool:
+        return response.headers.get("Content-Encoding", "").strip().lower() in ("", "identity")
+
+    @staticmethod
+    def _content_length(response) -> int:
+        value = response.headers.get("Content-Length", "")
+        return int(value) if value.isdigit() else 0
+
     def _head(self, url: str) -> Optional[dict]:
         try:
             resp = self.session.head(url, timeout=10, allow_redirects=True)
@@ -0,0 +1,147 @@
+"""
+asset_pool.py
+-------------
+Background image / PDF downloads, decoupled from page crawling.
+
+- A thread pool (assets.download_workers) runs AssetDownloader calls;
+  the crawl loop only submits and moves on to the next page
+- Per-host politeness: at most assets.per_host_connections downloads
+  in flight per host, and assets.per_host_delay_sec between their starts
+- A URL already in flight is not submitted twice: the new caller's
+  callback is attached to the running download (site logos, banners)
+- URL-cache hits are answered without waiting for a host slot
+- on_done(DownloadedAsset) runs in a worker thread once the download
+  finishes — the orchestrator uses it to fill MetadataWriter's indexes
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from app.components.web_crawler.crawler.asset_downloader import AssetDownloader, DownloadedAsset
+
+logger = logging.getLogger(__name__)
+
+
+class AssetPool:
+    """
+    Thread pool in front of an AssetDownloader.
+    submit() is safe to call from any thread.
+    """
+
+    def __init__(self, config: dict, downloader: AssetDownloader):
+        assets_cfg = config.get("assets", {})
+        self.workers = max(1, int(assets_cfg.get("download_workers", 4)))
+        self.per_host = max(1, int(assets_cfg.get("per_host_connections", 2)))
+        self.host_delay = float(assets_cfg.get("per_host_delay_sec", 0.0))
+
+        self.downloader = downloader
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="assets")
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._inflight: dict = {}        # asset url → on_done callbacks waiting for it
+        self._active = 0                 # downloads queued or running
+        self._host_slots: dict = {}      # host → BoundedSemaphore
+        self._host_next: dict = {}       # host → earliest start of its next download
+
+        # stats
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # Public interface
+    # ──────────────────────────────────────────────────────────────
+
+    def submit(self, kind: str, url: str, source_domain: str, on_done):
+        """
+        Queue a download ("image" | "pdf").
+        on_done(DownloadedAsset) is called when it finishes.
+        """
+        with self._lock:
+            self.submitted += 1
+            waiting = self._inflight.get(url)
+            if waiting is not None:
+                waiting.append(on_done)
+                self.coalesced += 1
+                return
+            self._inflight[url] = [on_done]
+            self._active += 1
+        self._executor.submit(self._run, kind, url, source_domain)
+
+    def pending(self) -> int:
+        """Downloads queued or running."""
+        with self._lock:
+            return self._active
+
+    def drain(self):
+        """Block until every submitted download and its callbacks are done."""
+        with self._idle:
+            while self._active:
+                self._idle.wait()
+
+    def close(self, wait_for_pending: bool = True):
+        """Finish (or, on interrupt, cancel) the queued downloads and stop the workers."""
+        if wait_for_pending:
+            self.drain()
+        self._executor.shutdown(wait=True, cancel_futures=not wait_for_pending)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "completed": self.completed,
+            "pending": self.pending(),
+        }
+
+    # ──────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────
+
+    def _run(self, kind: str, url: str, source_domain: str):
+        try:
+            result = self._download(kind, url, source_domain)
+        except Exception as e:
+            result = DownloadedAsset()
+            result.url = url
+            result.error = str(e)[:200]
+
+        with self._lock:
+            callbacks = self._inflight.pop(url, [])
+        for on_done in callbacks:
+            try:
+                on_done(result)
+            except Exception as e:
+                logger.error(f"Asset callback failed for {url}: {e}")
+
+        with self._idle:
+            self._active -= 1
+            self.completed += 1
+            self._idle.notify_all()
+
+    def _download(self, kind: str, url: str, source_domain: str) -> DownloadedAsset:
+        cached = self.downloader.cached(url)
+        if cached is not None:
+            return cached
+
+        host = urlparse(url).hostname or "unknown"
+        with self._lock:
+            slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        with slot:
+            self._wait_turn(host)
+            if kind == "pdf":
+                return self.downloader.download_pdf(url, source_domain)
+            return self.downloader.download_image(url, source_domain)
+
+    def _wait_turn(self, host: str):
+        """Keep host_delay between download starts on one host."""
+        if self.host_delay <= 0:
+            return
+        with self._lock:
+            now = time.time()
+            start = max(now, self._host_next.get(host, 0.0))
+            self._host_next[host] = start + self.host_delay
+        if start > now:
+            time.sleep(start - now)
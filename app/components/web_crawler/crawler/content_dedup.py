@@ -0,0 +1,237 @@
+"""
+content_dedup.py
+----------------
+Near-duplicate page detection on extracted body text (MinHash-LSH).
+
+- Signature: one-permutation MinHash over word shingles (default 3
+  words), num_perm 32-bit values (default 128 → 512 B per page). Each
+  shingle is hashed once; the low 32 bits pick one of num_perm bins and
+  the bin keeps the smallest high 32 bits. Empty bins (short pages) take
+  the next filled bin's value, rotated by the distance. The share of
+  equal values estimates the Jaccard similarity of two pages' shingle
+  sets — one hash per shingle instead of num_perm
+- Lookup: the signature is cut into `bands` bands; pages that agree on a
+  whole band are candidates and are kept as near-duplicates if their
+  estimated similarity is ≥ threshold (default 0.9). With 16 bands of
+  8 rows a pair at 0.9 becomes a candidate with probability > 0.999.
+- The first page seen with some content is the canonical doc; later
+  near-duplicates (print views, language toggles, query-string
+  variants) point at it.
+- Pages with fewer than min_words words are not checked (short stubs
+  collide too easily).
+- Signatures of canonical pages are appended to metadata/dedup_index.jsonl
+  (storage/index_log.py) so a resumed crawl keeps deduplicating against
+  earlier pages; a flush writes only the pages added since the last one.
+  The first line records the signature settings; an index built with
+  other settings (or an older dedup_index.json) is not reused
+"""
+
+import re
+import base64
+import hashlib
+import logging
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from app.components.web_crawler.storage.index_log import IndexLog
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+_MASK32 = (1 << 32) - 1
+_EMPTY = _MASK32 + 1             # larger than any bin value
+_ROTATION = 0x9E3779B1           # densification: added once per bin skipped
+_SETTINGS_KEY = "#settings"      # never a URL
+_SCHEME = "oph"                  # signature layout, checked when an index is loaded
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def shingles(text: str, shingle_size: int = 3) -> set:
+    """Set of word n-grams of the text (lowercased, punctuation ignored)."""
+    words = _WORD_RE.findall(text.lower())
+    n = max(1, min(shingle_size, len(words)))
+    return {" ".join(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+
+class ContentDedupIndex:
+    """
+    MinHash-LSH index of the pages written so far.
+    signature() is pure CPU work and safe to run in a worker thread;
+    match_or_add() must be called from one thread at a time.
+    """
+
+    def __init__(self, config: dict, path: Optional[str] = None):
+        dedup_cfg = config.get("dedup", {})
+        self.threshold = float(dedup_cfg.get("threshold", 0.9))
+        self.num_perm = int(dedup_cfg.get("num_perm", 128))
+        self.bands = int(dedup_cfg.get("bands", 16))
+        self.shingle_size = int(dedup_cfg.get("shingle_size", 3))
+        self.min_words = int(dedup_cfg.get("min_words", 50))
+        if self.num_perm % self.bands:
+            raise ValueError(f"dedup.num_perm ({self.num_perm}) must be a multiple of "
+                             f"dedup.bands ({self.bands})")
+        self.rows = self.num_perm // self.bands
+        self.path = Path(path) if path else None
+        self._compact_ratio = config.get("output", {}).get("index_compact_ratio", 2.0)
+        self._log = IndexLog(self.path, self._compact_ratio) if self.path else None
+
+        self._tables: list[dict] = [{} for _ in range(self.bands)]   # band key → set of URLs
+        self._by_url: dict = {}                                        # url → signature
+        self._dirty: set = set()                                       # added since the last flush
+
+        # stats
+        self.duplicates = 0
+
+        if self._log is not None:
+            self._load()
+
+    # ──────────────────────────────────────────────────────────────
+    # Public interface
+    # ──────────────────────────────────────────────────────────────
+
+    def signature(self, text: str) -> Optional[array]:
+        """MinHash signature of a page's body text, or None if it is too short to judge."""
+        if not text or len(_WORD_RE.findall(text)) < self.min_words:
+            return None
+        k = self.num_perm
+        bins = [_EMPTY] * k
+        for h in map(_hash64, shingles(text, self.shingle_size)):
+            i = (h & _MASK32) % k
+            value = h >> 32
+            if value < bins[i]:
+                bins[i] = value
+
+        # densify: an empty bin borrows the next filled bin (cyclically), rotated by the distance
+        filled = [i for i, v in enumerate(bins) if v != _EMPTY]
+        if not filled:
+            return None
+        if len(filled) < k:
+            nxt = filled[0] + k
+            for i in range(k - 1, -1, -1):
+                if bins[i] != _EMPTY:
+                    nxt = i
+                else:
+                    distance = nxt - i
+                    bins[i] = (bins[nxt % k] + distance * _ROTATION) & _MASK32
+        return array("I", bins)
+
+    def match_or_add(self, url: str, signature: Optional[array]) -> Optional[dict]:
+        """
+        Canonical page for a near-duplicate → {"url", "similarity"}.
+        Otherwise the page is indexed as canonical and None is returned.
+        """
+        if signature is None:
+            return None
+
+        best = None
+        for candidate in self._candidates(signature):
+            if candidate == url:
+                continue                 # recrawl of the same page
+            similarity = self.similarity(signature, self._by_url[candidate])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+
+        if best is not None:
+            self.duplicates += 1
+            return {"url": best[0], "similarity": round(best[1], 3)}
+
+        self.add(url, signature)
+        self._dirty.add(url)
+        return None
+
+    def add(self, url: str, signature: array):
+        """Index a canonical page (replaces its previous signature)."""
+        self._remove(url)
+        self._by_url[url] = signature
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            table.setdefault(key, set()).add(url)
+
+    @staticmethod
+    def similarity(a: array, b: array) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+    def flush(self):
+        """
+        Append the signatures indexed since the last flush (base64 of the
+        uint32 array). May run off the loop thread while match_or_add() goes on.
+        """
+        if self._log is None or not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        records = {} if self._log.exists() else {_SETTINGS_KEY: self._settings()}
+        for url in dirty:
+            signature = self._by_url.get(url)
+            if signature is not None:
+                records[url] = _encode(signature)
+        self._log.append(records)
+        if self._log.needs_compaction(len(self._by_url) + 1):
+            self._log.compact(self._records())
+
+    def save(self, path: Optional[str] = None):
+        """Rewrite the whole index to path (default self.path), one line per page."""
+        target = Path(path) if path else self.path
+        if target is None:
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        IndexLog(target, self._compact_ratio).compact(self._records())
+        self._dirty.clear()
+
+    def stats(self) -> dict:
+        return {"canonical_pages": len(self._by_url), "duplicates": self.duplicates}
+
+    # ──────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────
+
+    def _settings(self) -> dict:
+        return {"scheme": _SCHEME, "num_perm": self.num_perm, "shingle_size": self.shingle_size}
+
+    def _records(self) -> dict:
+        records = {_SETTINGS_KEY: self._settings()}
+        records.update((url, _encode(sig)) for url, sig in dict(self._by_url).items())
+        return records
+
+    def _band_keys(self, signature: array) -> list[int]:
+        r = self.rows
+        return [hash(tuple(signature[i:i + r])) for i in range(0, self.num_perm, r)]
+
+    def _candidates(self, signature: array) -> set:
+        found = set()
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            found.update(table.get(key, ()))
+        return found
+
+    def _remove(self, url: str):
+        old = self._by_url.pop(url, None)
+        if old is None:
+            return
+        for table, key in zip(self._tables, self._band_keys(old)):
+            urls = table.get(key)
+            if urls is not None:
+                urls.discard(url)
+                if not urls:
+                    del table[key]
+
+    def _load(self):
+        """Re-index the signatures saved by a previous crawl (resume)."""
+        if not self._log.exists():
+            return
+        records = self._log.load()
+        if records.pop(_SETTINGS_KEY, None) != self._settings():
+            logger.warning(f"Dedup index {self.path} was built with other settings — starting a new one")
+            self._log.compact({_SETTINGS_KEY: self._settings()})
+            return
+        for url, encoded in records.items():
+            sig = array("I")
+            sig.frombytes(base64.b64decode(encoded))
+            self.add(url, sig)
+        logger.info(f"Dedup index loaded: {len(self._by_url)} signatures")
+
+
+def _encode(signature: array) -> str:
+    return base64.b64encode(signature.tobytes()).decode("ascii")
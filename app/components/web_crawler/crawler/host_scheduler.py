@@ -0,0 +1,110 @@
+"""
+host_scheduler.py
+-----------------
+Host-aware politeness scheduler used as the frontier queue.
+
+- One FIFO queue per host (BFS order within a host)
+- A heap of (ready_at, seq, host) with one entry per host that has URLs
+- pop_ready() hands out the next URL of a host whose politeness delay
+  has passed; among ready hosts, the one that has waited longest wins
+  (round robin over hosts)
+- mark_hit(host) starts the host's cool-down once its URL is handed out
+
+A caller only has to idle when every queued host is cooling down
+(seconds_until_ready() > 0), instead of sleeping before each request
+whenever the next URL happens to share a host with the previous one.
+"""
+
+import heapq
+import time
+from collections import deque
+from typing import Optional
+
+
+class HostScheduler:
+    """
+    Per-host queues + ready-time heap.
+    Heap entries are lazy: a host hit after its entry was pushed is
+    re-queued at its new ready time when the entry reaches the top.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.host_delays: dict = {}      # host → delay override (e.g. robots Crawl-delay)
+        self._queues: dict = {}          # host → deque of items
+        self._ready_at: dict = {}        # host → time it may be hit again
+        self._heap: list = []            # (ready_at, seq, host)
+        self._seq = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, host: str, item):
+        queue = self._queues.get(host)
+        if queue is None:
+            queue = self._queues[host] = deque()
+            self._schedule(host)
+        queue.append(item)
+        self._size += 1
+
+    def pop_ready(self, now: float = None) -> Optional[tuple]:
+        """(host, item) for a host that may be hit now, else None."""
+        now = time.time() if now is None else now
+        head = self._head()
+        if head is None or head[0] > now:
+            return None
+
+        _, _, host = heapq.heappop(self._heap)
+        queue = self._queues[host]
+        item = queue.popleft()
+        self._size -= 1
+        if queue:
+            self._schedule(host)
+        else:
+            del self._queues[host]
+        return host, item
+
+    def mark_hit(self, host: str, now: float = None):
+        """Start the host's cool-down (call when its URL is handed out)."""
+        now = time.time() if now is None else now
+        self._ready_at[host] = now + self.host_delays.get(host, self.delay)
+
+    def set_host_delay(self, host: str, delay: float):
+        self.host_delays[host] = delay
+
+    def defer(self, host: str, seconds: float, now: float = None):
+        """Hold the host back for at least `seconds` (e.g. robots.txt unavailable)."""
+        now = time.time() if now is None else now
+        self._ready_at[host] = max(self._ready_at.get(host, 0.0), now + seconds)
+
+    def seconds_until_ready(self, now: float = None) -> Optional[float]:
+        """Seconds until some queued host is ready (0 = now); None if empty."""
+        now = time.time() if now is None else now
+        head = self._head()
+        if head is None:
+            return None
+        return max(0.0, head[0] - now)
+
+    def hosts(self) -> int:
+        """Number of hosts with queued URLs."""
+        return len(self._queues)
+
+    # ──────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────
+
+    def _schedule(self, host: str):
+        self._seq += 1
+        heapq.heappush(self._heap, (self._ready_at.get(host, 0.0), self._seq, host))
+
+    def _head(self) -> Optional[tuple]:
+        """Top heap entry, after refreshing entries made stale by mark_hit()."""
+        heap = self._heap
+        while heap:
+            ready_at, seq, host = heap[0]
+            current = self._ready_at.get(host, 0.0)
+            if ready_at >= current:
+                return heap[0]
+            heapq.heapreplace(heap, (current, seq, host))
+        return None
@@ -0,0 +1,89 @@
+"""
+image_inspector.py
+------------------
+Size and type of a downloaded image without a full-resolution decode.
+
+- Dimensions come from the file header (PIL opens lazily; no pixels
+  are decoded for width / height)
+- Most images are classified from dimensions alone: icons, banners,
+  vertical posters
+- The rest get pixel statistics from a reduced decode: JPEGs are
+  decoded at 1/2–1/8 scale by the DCT decoder (Image.draft), other
+  formats are decoded once and shrunk to a thumbnail with nearest-
+  neighbour sampling (keeps the original colours)
+- "flat" images — most pixels in a handful of colours, as in charts,
+  infographics and scanned notices — are told apart from photos:
+  portrait ones become "poster", the others "infographic_or_chart"
+- inspect_image() is a plain module-level function so it can run in a
+  worker process (assets.image_processes)
+"""
+
+import logging
+from typing import Optional
+
+from PIL import Image as PILImage
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIZE = 128           # longest side of the statistics thumbnail
+FLAT_TOP_COLORS = 8         # colours counted for the flat-share statistic
+FLAT_SHARE = 0.5            # ≥ this share of pixels in the top colours → flat graphic
+_POSTERIZE_MASK = 0xF0      # 4 bits per channel: JPEG noise collapses into one colour
+
+
+def inspect_image(path, pixel_stats: bool = True) -> dict:
+    """
+    {"width", "height", "image_type"} for the image at `path`.
+    image_type is "" if the file can't be read (caller falls back to URL hints).
+    """
+    info = {"width": 0, "height": 0, "image_type": ""}
+    try:
+        with PILImage.open(path) as img:
+            info["width"], info["height"] = img.size
+            info["image_type"] = classify_by_size(*img.size)
+            if pixel_stats and info["image_type"] in ("photo_or_poster", "image_unknown"):
+                share = flat_share(img)
+                if share is not None and share >= FLAT_SHARE:
+                    info["image_type"] = "poster" if info["height"] > info["width"] else "infographic_or_chart"
+    except Exception as e:
+        logger.debug(f"Image inspect failed for {path}: {e}")
+    return info
+
+
+def classify_by_size(width: int, height: int) -> str:
+    """Classify image type from its dimensions."""
+    # Icon: small
+    if width <= 64 or height <= 64:
+        return "icon"
+    if width <= 200 and height <= 200:
+        return "icon"
+
+    # Likely a poster/banner: very wide
+    aspect = width / max(height, 1)
+    if aspect > 3:
+        return "banner"
+    if aspect < 0.4:
+        return "poster_vertical"
+
+    # Large image
+    if width >= 800 and height >= 600:
+        return "photo_or_poster"
+
+    return "image_unknown"
+
+
+def flat_share(img: PILImage.Image) -> Optional[float]:
+    """
+    Share of pixels in the FLAT_TOP_COLORS most common (posterized) colours,
+    measured on a SAMPLE_SIZE thumbnail. None if the image can't be decoded.
+    """
+    try:
+        img.draft("RGB", (SAMPLE_SIZE, SAMPLE_SIZE))      # JPEG only; no-op elsewhere
+        img.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE), PILImage.NEAREST, reducing_gap=None)
+        small = img.convert("RGB").point(lambda v: v & _POSTERIZE_MASK)
+    except Exception:
+        return None
+    pixels = small.width * small.height
+    colors = small.getcolors(maxcolors=pixels) or []
+    top = sorted((count for count, _ in colors), reverse=True)[:FLAT_TOP_COLORS]
+    return sum(top) / max(pixels, 1)
@@ -11,18 +11,39 @@ Features:
 - redirects tracking
 - response timing
 - proper headers
+- conditional GET (If-None-Match / If-Modified-Since → 304 not_modified)
+- streamed bodies: headers are checked first, types we don't process
+  are never downloaded, and HTML reads stop at crawl.max_html_size_mb
+- PDF / image bodies are left unread (is_pdf / is_image set from the
+  headers): AssetDownloader streams them to disk instead of memory
+- optional raw-response archive (archive.enabled): every HTML body read
+  is also written to storage/response_archive.py for `main.py reparse`
 """
 
+import io
 import time
 import logging
+import threading
 import requests
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from urllib3.util.retry import Retry
 from urllib.parse import urlparse
 from typing import Optional
+from datetime import datetime, timezone
+
+from app.components.web_crawler.storage.response_archive import ResponseArchive
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 64 * 1024
+IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/webp', 'image/gif', 'image/bmp']
+
+
+class BodyTooLarge(Exception):
+    """Response body passed the size cap for its type."""
+
+
 class FetchResult:
     """
     Structured result from fetch page
@@ -33,19 +54,26 @@ class FetchResult:
         self.status_code: int = 0
         self.content_type: str = ""
         self.html: Optional[str] = None
-        self.raw_bytes: Optional[bytes] = None
+        self.raw_bytes: Optional[bytes] = None   # unused: binary bodies go through AssetDownloader
         self.is_html: bool = False
         self.is_pdf: bool = False
         self.is_image: bool = False
         self.redirected: bool = False
         self.redirect_chain: list = []
         self.response_time_ms: int = 0
+        self.fetched_at: str = ""          # UTC ISO-8601, when the request was sent
         self.error: Optional[str] = None
         self.headers: dict = {}
+        self.not_modified: bool = False   # 304 to a conditional GET
 
     @property
     def success(self) -> bool:
         return self.status_code == 200 and self.error is None
+
+    def validators(self) -> dict:
+        """HTTP cache validators from the response (for conditional recrawls)."""
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        return {"etag": headers.get("etag"), "last_modified": headers.get("last-modified")}
     
     def to_dict(self) -> dict:
         return {
@@ -59,7 +87,9 @@ class FetchResult:
             "redirected": self.redirected,
             "redirect_chain": self.redirect_chain,
             "response_time_ms": self.response_time_ms,
+            "fetched_at": self.fetched_at,
             "error": self.error,
+            "not_modified": self.not_modified,
         }
 
 def _build_session(config: dict) -> requests.Session:
@@ -70,6 +100,8 @@ def _build_session(config: dict) -> requests.Session:
     crawl_cfg = config.get("crawl", {})
     max_retries = crawl_cfg.get("max_retries", 3)
     user_agent = crawl_cfg.get("user_agent", "RAGBot/1.0")
+    # one pooled connection per concurrent worker (async engine shares this session)
+    pool_size = max(10, crawl_cfg.get("concurrent_requests", 1))
 
     session = requests.Session()
 
@@ -81,7 +113,11 @@ def _build_session(config: dict) -> requests.Session:
         raise_on_status=False,
     )
 
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
@@ -96,6 +132,18 @@ def _build_session(config: dict) -> requests.Session:
 
     return session
 
+
+def decode_body(body: bytes, headers: dict) -> str:
+    """Decode like response.text: header charset, else detected encoding."""
+    encoding = requests.utils.get_encoding_from_headers(CaseInsensitiveDict(headers))
+    if encoding is None:
+        encoding = requests.compat.chardet.detect(body)["encoding"]
+    try:
+        return str(body, encoding or "utf-8", errors="replace")
+    except (LookupError, TypeError):
+        return str(body, "utf-8", errors="replace")
+
+
 class PageFetcher:
     """
     Fetches URLs. Returns FetchResult
@@ -110,71 +158,89 @@ class PageFetcher:
         self.timeout = self.crawl_cfg.get("request_timeout_sec", 20)
         self.delay = self.crawl_cfg.get("delay_between_requests_sec", 1.5)
 
+        self.max_html_bytes = int(self.crawl_cfg.get("max_html_size_mb", 10) * 1024 * 1024)
+
         self._session = _build_session(config)
-        self._last_request_time: dict = {}  # domain → timestamp
+        self._last_request_time: dict = {}  # domain → start time of its latest (reserved) request
+        self._rate_lock = threading.Lock()
+
+        self.archive = ResponseArchive(config) \
+            if config.get("archive", {}).get("enabled", False) else None
 
     # ---------------
     # Main fetch
     # ----------------
-    def fetch(self, url: str) -> FetchResult:
+    def fetch(self, url: str, validators: dict = None, rate_limit: bool = True) -> FetchResult:
         """
         Fetch a URL
         Args:
             url (str): website url to fetch
+            validators (dict): {"etag", "last_modified"} from a previous crawl →
+                conditional GET; a 304 comes back as result.not_modified
+            rate_limit (bool): sleep out the domain's delay first; False when the
+                caller already waited for a reserve_slot() (async engine)
         """
-        self._rate_limit(url)
-        domain = urlparse(url).hostname or ""
-        return self._fetch_requests(url)
+        if rate_limit:
+            self._rate_limit(url)
+        return self._fetch_requests(url, validators)
     
 
     # -----------------------
     # HTTP fetch
     # ------------------
-    def _fetch_requests(self, url) -> FetchResult:
+    def _fetch_requests(self, url, validators: dict = None) -> FetchResult:
         result = FetchResult()
         result.url = url
+        result.fetched_at = datetime.now(timezone.utc).isoformat()
         start = time.time()
+        body = None
+
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
 
         try:
-            response = self._session.get(
-                url, 
+            with self._session.get(
+                url,
                 timeout = self.timeout,
                 allow_redirects=True,
-                stream = False
-            )
+                stream = True,
+                headers = headers or None,
+            ) as response:
+                result.status_code = response.status_code
+                result.final_url = response.url
+                result.headers = dict(response.headers)
+                result.redirected = len(response.history) > 0
+                result.redirect_chain = [r.url for r in response.history]
 
-            result.response_time_ms = int((time.time() - start) * 1000)
-            result.status_code = response.status_code
-            result.final_url = response.url
-            result.headers = dict(response.headers)
-            result.redirected = len(response.history) > 0
-            result.redirect_chain = [r.url for r in response.history]
-
-            content_type = response.headers.get('Content-Type', '').lower()
-            result.content_type = content_type
-
-            result.is_html = 'text/html' in content_type or 'application/xhtml' in content_type
-            result.is_pdf = 'application/pdf' in content_type
-            result.is_image = any(t in content_type for t in [
-                'image/jpeg', 'image/png', 'image/webp', 'image/gif', 'image/bmp'
-            ])
-
-            if response.status_code == 200:
-                if result.is_html:
-                    # detect encoding
-                    result.html = response.text
-                elif result.is_pdf or result.is_image:
-                    result.raw_bytes = response.content
+                content_type = response.headers.get('Content-Type', '').lower()
+                result.content_type = content_type
+
+                result.is_html = 'text/html' in content_type or 'application/xhtml' in content_type
+                result.is_pdf = 'application/pdf' in content_type
+                result.is_image = any(t in content_type for t in IMAGE_TYPES)
+
+                if response.status_code == 304 and headers:
+                    # unchanged since the stored copy — nothing to download
+                    result.not_modified = True
+                elif response.status_code == 200:
+                    body = self._read_body(response, result)
                 else:
-                    # unknown type - try as text
-                    try:
-                        result.html = response.text
-                        result.is_html = True
-                    except Exception:
-                        result.raw_bytes = response.content
-            else:
-                result.error = f"HTTP {response.status_code}"
-                logger.warning(f"HTTP {response.status_code} for {url}")
+                    result.error = f"HTTP {response.status_code}"
+                    logger.warning(f"HTTP {response.status_code} for {url}")
+
+            result.response_time_ms = int((time.time() - start) * 1000)
+            if self.archive is not None and body is not None:
+                self._archive(result, body)
+
+        except BodyTooLarge as e:
+            result.error = f"TooLarge: {e}"
+            result.response_time_ms = int((time.time() - start) * 1000)
+            logger.warning(f"Skipping oversized response ({e}): {url}")
+
         except requests.exceptions.Timeout:
             result.error = "Timeout"
             result.response_time_ms = int((time.time() - start) * 1000)
@@ -194,6 +260,54 @@ class PageFetcher:
 
         return result
 
+    def _read_body(self, response: requests.Response, result: FetchResult) -> Optional[bytes]:
+        """
+        Read a 200 HTML body in chunks (→ result.html), up to max_html_bytes.
+        Returns the body bytes (None if nothing was read).
+        PDF / image bodies are left for AssetDownloader; other types are
+        not read at all. A response without a Content-Type is kept if its
+        first chunk looks like HTML.
+        """
+        if result.is_html:
+            kind = "html"
+        elif result.is_pdf or result.is_image:
+            return None
+        elif not result.content_type:
+            kind = "sniff"
+        else:
+            result.error = f"UnsupportedContentType: {result.content_type.split(';')[0]}"
+            logger.debug(f"Not downloading {result.content_type}: {result.url}")
+            return None
+
+        limit = self.max_html_bytes
+        declared = response.headers.get("Content-Length", "")
+        if declared.isdigit() and int(declared) > limit:
+            raise BodyTooLarge(f"Content-Length {declared} > {limit} bytes")
+
+        buffer = io.BytesIO()
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if kind == "sniff":
+                head = chunk.lstrip()[:512].lower()
+                if not (head.startswith(b"<!doctype html") or b"<html" in head):
+                    result.error = "UnsupportedContentType: (none, not HTML)"
+                    return None
+                kind = "html"
+                result.is_html = True
+            buffer.write(chunk)
+            if buffer.tell() > limit:
+                raise BodyTooLarge(f"more than {limit} bytes")
+
+        body = buffer.getvalue()
+        result.html = decode_body(body, response.headers)
+        return body
+
+    def _archive(self, result: FetchResult, body: bytes):
+        """Store the response for reparse; a failed write never fails the fetch."""
+        try:
+            self.archive.record(result, result.headers, body)
+        except OSError as e:
+            logger.warning(f"Could not archive {result.url}: {e}")
+
 
     # --------------------
     # Rate limiting
@@ -205,13 +319,23 @@ class PageFetcher:
         Ensures at least 'delay' seconds between requests to same domain
         """
         domain = urlparse(url).hostname or 'unknown'
-        last = self._last_request_time.get(domain, 0)
-        elapsed = time.time() - last
-        if elapsed < self.delay:
-            sleep_time = self.delay - elapsed
+        sleep_time = self.reserve_slot(domain)
+        if sleep_time > 0:
             logger.debug(f"Rate limit: sleeping {sleep_time:.2f}s for {domain}")
             time.sleep(sleep_time)
-        self._last_request_time[domain] = time.time()
+
+    def reserve_slot(self, domain: str, delay: float = None) -> float:
+        """
+        Claim the domain's next request slot without sleeping.
+        Returns the seconds to wait before sending. `delay` overrides
+        self.delay (e.g. the frontier's robots.txt Crawl-delay for the host).
+        """
+        delay = self.delay if delay is None else delay
+        with self._rate_lock:
+            now = time.time()
+            start = max(now, self._last_request_time.get(domain, 0) + delay)
+            self._last_request_time[domain] = start
+        return start - now
 
     def head(self, url: str) -> dict:
         """
@@ -11,24 +11,32 @@ Parses HTML pages and extracts:
 
 IMPORTANT ORDER OF OPERATIONS:
   1. Parse raw HTML → soup
-  2. Extract metadata, headings, images, PDFs, links, tables  
-  3. Then clean soup (decompose noise, remove imgs, etc.)      
-  4. Convert cleaned soup → Markdown                           
-  5. Post-process Markdown (strip blank lines, empty headings) 
+  2. Extract metadata, headings, images, PDFs, links, tables
+     (one document-order walk of the soup)
+  3. Then clean soup in place (decompose noise, remove imgs, etc.)
+  4. Convert cleaned soup → Markdown (directly, no str() round trip)
+  5. Post-process Markdown (strip blank lines, empty headings)
 """
 
 import re
 import json
-import copy
 import logging
+from concurrent.futures import Future, ProcessPoolExecutor
 from urllib.parse import urljoin, urlparse
 from html import unescape
-from bs4 import BeautifulSoup, Comment
+from bs4 import BeautifulSoup, Comment, Tag
+
+from app.components.web_crawler.crawler.parser_engines import build_soup, resolve_engine
+from app.components.web_crawler.crawler.markdown_cleaner import MarkdownCleaner
 
 logger = logging.getLogger(__name__)
 
-from markdownify import markdownify as md
+from markdownify import MarkdownConverter
 MARKDOWNIFY_AVAILABLE = True
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+# Container tags removed by _clean_soup once they end up empty
+PRUNABLE_TAGS = ["div", "span", "p", "li", "ul", "ol", "section"]
 # ─────────────────────────────────────────────────────────────────
 # ParsedPage
 # ─────────────────────────────────────────────────────────────────
@@ -100,6 +108,8 @@ class PageParser:
         self.assets_cfg = config.get("assets", {})
 
         self.min_text_length = self.extraction_cfg.get("min_text_length_chars", 100)
+        # html.parser | lxml (see parser_engines.py)
+        self.engine = resolve_engine(self.extraction_cfg.get("parser_engine", "html.parser"))
         self.image_extensions = set(self.assets_cfg.get("image_extensions", [
             ".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"
         ]))
@@ -117,6 +127,18 @@ class PageParser:
             self.extraction_cfg.get("skip_link_prefixes", ["skip", "jump to"])
         )
 
+        # Converts the cleaned soup directly — no str(soup) + re-parse
+        self._md_converter = MarkdownConverter(
+            heading_style="ATX",        # # H1  ## H2  etc.
+            bullets="-",                # consistent bullet char
+            strip=["a"],                # keep link text, drop [text](url) syntax
+                                        # (links are captured separately)
+            newline_style="backslash",
+        ) if MARKDOWNIFY_AVAILABLE else None
+
+        # Site-specific line-drop rules ("Click here", pagination, ...) — None → defaults
+        self._md_cleaner = MarkdownCleaner(self.extraction_cfg.get("markdown_line_rules"))
+
     # ─────────────────────────────────────────────────────────────
     # Main entry
     # ─────────────────────────────────────────────────────────────
@@ -128,27 +150,19 @@ class PageParser:
         page.raw_html_length = len(html)
 
         try:
-            soup = BeautifulSoup(html, "html.parser")
+            soup = build_soup(html, self.engine)
         except Exception as e:
             page.extraction_warnings.append(f"HTML parse failed: {e}")
             return page
 
-        # ── PHASE 1: Extract everything from ORIGINAL soup
-        # Order matters — all of these must run BEFORE _clean_soup()
-        self._extract_metadata(soup, page, url)
-        self._extract_headings(soup, page)
-        self._extract_images(soup, page, url)       # must be before img.decompose()
-        self._extract_pdfs(soup, page, url)          # must be before link cleaning
-        self._extract_links(soup, page, url)
-        if self.extraction_cfg.get("extract_tables", True):
-            self._extract_tables(soup, page)
-        if self.extraction_cfg.get("extract_structured_data", True):
-            self._extract_schema_org(soup, page)
-
-        # ── PHASE 2: Clean → Markdown (on a copy)
-        clean_soup = copy.copy(soup)
-        self._clean_soup(clean_soup)
-        page.body_text = self._to_markdown(clean_soup)
+        # ── PHASE 1: Extract everything in ONE walk of the ORIGINAL soup
+        # Must run BEFORE _clean_soup() — results are plain dicts/strings,
+        # so the soup can then be cleaned in place (no copy needed)
+        self._extract_all(soup, page, url)
+
+        # ── PHASE 2: Clean → Markdown (in place, no re-serialization)
+        self._clean_soup(soup)
+        page.body_text = self._to_markdown(soup)
         page.body_text_length = len(page.body_text)
 
         if page.body_text_length < self.min_text_length:
@@ -160,59 +174,121 @@ class PageParser:
         return page
 
     # ─────────────────────────────────────────────────────────────
-    # Phase 1 extractors
+    # Phase 1: single-pass extraction
     # ─────────────────────────────────────────────────────────────
 
-    def _extract_metadata(self, soup: BeautifulSoup, page: ParsedPage, url: str):
-        """Title, meta tags, og tags, canonical, language."""
-        title_tag = soup.find("title")
-        page.title = title_tag.get_text(strip=True) if title_tag else ""
-
-        html_tag = soup.find("html")
-        if html_tag:
-            page.language = html_tag.get("lang", "") or html_tag.get("xml:lang", "")
-
-        for meta in soup.find_all("meta"):
-            name = (meta.get("name") or meta.get("property") or "").lower().strip()
-            content = (meta.get("content") or "").strip()
-            if not content:
-                continue
-            if name == "description":
-                page.meta_description = content
-            elif name == "keywords":
-                page.meta_keywords = content
-            elif name == "og:title":
-                page.og_title = content
-            elif name == "og:description":
-                page.og_description = content
-            elif name == "og:image":
-                page.og_image = content
-            elif name == "og:type":
-                page.page_type = content
-
-        canonical = soup.find("link", rel="canonical")
-        if canonical:
-            page.canonical_url = canonical.get("href", "")
-
-    def _extract_headings(self, soup: BeautifulSoup, page: ParsedPage):
+    def _extract_all(self, soup: BeautifulSoup, page: ParsedPage, base_url: str):
         """
-        Extract h1–h6 from ORIGINAL soup.
-        Builds flat list + breadcrumb hierarchy for section-aware chunking.
+        Walk the ORIGINAL soup once, in document order, collecting metadata,
+        headings, images, PDFs, links, tables and JSON-LD.
+
+        Document order gives "nearest heading above" for free: it is simply
+        the last heading seen before the img / a tag.
         """
-        headings = []
-        for tag in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
-            text = tag.get_text(separator=" ", strip=True)
-            if not text or len(text) < 2:
-                continue
-            headings.append({
-                "level": int(tag.name[1]),
-                "text": text[:200],
-                "id": tag.get("id", ""),
-            })
-        page.headings = headings
+        extract_tables = self.extraction_cfg.get("extract_tables", True)
+        extract_schema = self.extraction_cfg.get("extract_structured_data", True)
+        base_domain = urlparse(base_url).netloc or ""
 
-        if headings:
-            page.heading_hierarchy = self._build_heading_hierarchy(headings)
+        found_title = found_html = found_canonical = False
+        last_heading = ""                  # get_text(strip=True) of latest h1–h6
+        seen_images: set = set()
+        seen_pdfs: set = set()
+        seen_links: set = set()
+
+        for tag in soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            name = tag.name
+
+            # ── Metadata: title, lang, meta tags, canonical
+            if name == "title":
+                if not found_title:
+                    found_title = True
+                    page.title = tag.get_text(strip=True)
+
+            elif name == "html":
+                if not found_html:
+                    found_html = True
+                    page.language = tag.get("lang", "") or tag.get("xml:lang", "")
+
+            elif name == "meta":
+                self._read_meta(tag, page)
+
+            elif name == "link":
+                if not found_canonical and self._is_canonical(tag):
+                    found_canonical = True
+                    page.canonical_url = tag.get("href", "")
+
+            # ── Headings
+            elif name in HEADING_TAGS:
+                last_heading = tag.get_text(strip=True)
+                text = tag.get_text(separator=" ", strip=True)
+                if text and len(text) >= 2:
+                    page.headings.append({
+                        "level": int(name[1]),
+                        "text": text[:200],
+                        "id": tag.get("id", ""),
+                    })
+
+            # ── Images (must be before img.decompose() in _clean_soup)
+            elif name == "img":
+                record = self._image_record(tag, base_url, last_heading)
+                if record and record["url"] not in seen_images:
+                    seen_images.add(record["url"])
+                    page.images.append(record)
+
+            # ── Anchors: PDFs + links
+            elif name == "a":
+                href = tag.get("href")
+                if href is None:
+                    continue
+                href = href.strip()
+                if not href:
+                    continue
+                self._collect_pdf(tag, href, page, base_url, last_heading, seen_pdfs)
+                self._collect_link(tag, href, page, base_url, base_domain, seen_links)
+
+            elif name == "table":
+                if extract_tables:
+                    self._collect_table(tag, page)
+
+            elif name == "script":
+                if extract_schema and tag.get("type") == "application/ld+json":
+                    try:
+                        page.schema_org.append(json.loads(tag.string or "{}"))
+                    except Exception:
+                        pass
+
+        if page.headings:
+            page.heading_hierarchy = self._build_heading_hierarchy(page.headings)
+
+    @staticmethod
+    def _read_meta(meta: Tag, page: ParsedPage):
+        """Description, keywords and og tags from one <meta>."""
+        name = (meta.get("name") or meta.get("property") or "").lower().strip()
+        content = (meta.get("content") or "").strip()
+        if not content:
+            return
+        if name == "description":
+            page.meta_description = content
+        elif name == "keywords":
+            page.meta_keywords = content
+        elif name == "og:title":
+            page.og_title = content
+        elif name == "og:description":
+            page.og_description = content
+        elif name == "og:image":
+            page.og_image = content
+        elif name == "og:type":
+            page.page_type = content
+
+    @staticmethod
+    def _is_canonical(link: Tag) -> bool:
+        """Same match as soup.find("link", rel="canonical")."""
+        rel = link.get("rel")
+        if isinstance(rel, list):
+            return "canonical" in rel or " ".join(rel) == "canonical"
+        return rel == "canonical"
 
     def _build_heading_hierarchy(self, headings: list) -> list:
         """
@@ -230,10 +306,9 @@ class PageParser:
             hierarchy.append(" → ".join(t for _, t in stack))
         return hierarchy
 
-    def _extract_images(self, soup: BeautifulSoup, page: ParsedPage, base_url: str):
+    def _image_record(self, img: Tag, base_url: str, nearest_heading: str):
         """
-        Extract ALL <img> tags with full context from ORIGINAL soup.
-        Must run before _clean_soup() which calls img.decompose().
+        Build the record for one <img>, or None if it has no usable src.
 
         Captures:
           - src with lazy-load fallbacks (data-src, data-lazy-src, data-original)
@@ -242,216 +317,151 @@ class PageParser:
           - nearest heading above the image
           - surrounding paragraph/div text as context
         """
-        seen_urls: set = set()
-
-        # Build tag position map for "nearest heading" lookup
-        all_tags = list(soup.find_all(True))
-        tag_pos = {id(t): i for i, t in enumerate(all_tags)}
-
-        headings_positioned = [
-            (tag_pos.get(id(h), 0), h.get_text(strip=True))
-            for h in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"])
-        ]
-
-        for img in soup.find_all("img"):
-            # src with common lazy-load attribute fallbacks
-            src = (
-                img.get("src") or
-                img.get("data-src") or
-                img.get("data-lazy-src") or
-                img.get("data-original") or
-                img.get("data-url") or
-                ""
-            ).strip()
-
-            if not src or src.startswith("data:"):
-                continue
-
-            abs_url = urljoin(base_url, src)
-            if abs_url in seen_urls:
-                continue
-            seen_urls.add(abs_url)
-
-            # figcaption
-            caption = ""
-            figure = img.find_parent("figure")
-            if figure:
-                figcap = figure.find("figcaption")
-                if figcap:
-                    caption = figcap.get_text(strip=True)
-
-            # Nearest heading above this image in document order
-            img_pos = tag_pos.get(id(img), 0)
-            nearest_heading = ""
-            for h_pos, h_text in reversed(headings_positioned):
-                if h_pos < img_pos:
-                    nearest_heading = h_text
+        # src with common lazy-load attribute fallbacks
+        src = (
+            img.get("src") or
+            img.get("data-src") or
+            img.get("data-lazy-src") or
+            img.get("data-original") or
+            img.get("data-url") or
+            ""
+        ).strip()
+
+        if not src or src.startswith("data:"):
+            return None
+
+        # figcaption
+        caption = ""
+        figure = img.find_parent("figure")
+        if figure:
+            figcap = figure.find("figcaption")
+            if figcap:
+                caption = figcap.get_text(strip=True)
+
+        # Context: walk up to nearest meaningful block parent
+        context_text = ""
+        for parent_tag_name in ["p", "div", "section", "article", "li", "td"]:
+            parent = img.find_parent(parent_tag_name)
+            if parent:
+                ctx = parent.get_text(separator=" ", strip=True)
+                if len(ctx) > 20:
+                    context_text = ctx[:300]
                     break
 
-            # Context: walk up to nearest meaningful block parent
-            context_text = ""
-            for parent_tag_name in ["p", "div", "section", "article", "li", "td"]:
-                parent = img.find_parent(parent_tag_name)
-                if parent:
-                    ctx = parent.get_text(separator=" ", strip=True)
-                    if len(ctx) > 20:
-                        context_text = ctx[:300]
-                        break
-
-            page.images.append({
-                "url": abs_url,
-                "alt": unescape(img.get("alt", "")).strip()[:200],
-                "title": unescape(img.get("title", "")).strip()[:200],
-                "width": img.get("width", ""),
-                "height": img.get("height", ""),
-                "loading": img.get("loading", ""),
-                "caption": caption[:300],
-                "nearest_heading": nearest_heading[:200],
-                "context_text": context_text,
-                "src_original": src,
-            })
-
-    def _extract_pdfs(self, soup: BeautifulSoup, page: ParsedPage, base_url: str):
-        """
-        Extract all PDF links with context from ORIGINAL soup.
-        Must run before any link cleaning.
-        """
-        seen_urls: set = set()
-
-        all_tags = list(soup.find_all(True))
-        tag_pos = {id(t): i for i, t in enumerate(all_tags)}
-        headings_positioned = [
-            (tag_pos.get(id(h), 0), h.get_text(strip=True))
-            for h in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"])
-        ]
-
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
-            if not href:
-                continue
-
-            abs_url = urljoin(base_url, href)
-            path = urlparse(abs_url).path.lower()
-            is_pdf = (
-                path.endswith(".pdf") or
-                "pdf" in a.get("type", "").lower() or
-                "/pdf/" in path
-            )
-            if not is_pdf:
-                continue
-
-            if abs_url in seen_urls:
-                continue
-            seen_urls.add(abs_url)
-
-            a_pos = tag_pos.get(id(a), 0)
-            nearest_heading = ""
-            for h_pos, h_text in reversed(headings_positioned):
-                if h_pos < a_pos:
-                    nearest_heading = h_text
-                    break
-
-            parent = a.find_parent(["p", "li", "div", "td"])
-            context = parent.get_text(separator=" ", strip=True)[:200] if parent else ""
-
-            page.pdfs.append({
-                "url": abs_url,
-                "link_text": a.get_text(strip=True)[:200],
-                "nearest_heading": nearest_heading[:200],
-                "context_text": context,
-            })
-
-    def _extract_links(self, soup: BeautifulSoup, page: ParsedPage, base_url: str):
+        return {
+            "url": urljoin(base_url, src),
+            "alt": unescape(img.get("alt", "")).strip()[:200],
+            "title": unescape(img.get("title", "")).strip()[:200],
+            "width": img.get("width", ""),
+            "height": img.get("height", ""),
+            "loading": img.get("loading", ""),
+            "caption": caption[:300],
+            "nearest_heading": nearest_heading[:200],
+            "context_text": context_text,
+            "src_original": src,
+        }
+
+    def _collect_pdf(self, a: Tag, href: str, page: ParsedPage, base_url: str,
+                     nearest_heading: str, seen_urls: set):
+        """Record <a> if it points to a PDF."""
+        abs_url = urljoin(base_url, href)
+        path = urlparse(abs_url).path.lower()
+        is_pdf = (
+            path.endswith(".pdf") or
+            "pdf" in a.get("type", "").lower() or
+            "/pdf/" in path
+        )
+        if not is_pdf or abs_url in seen_urls:
+            return
+        seen_urls.add(abs_url)
+
+        parent = a.find_parent(["p", "li", "div", "td"])
+        context = parent.get_text(separator=" ", strip=True)[:200] if parent else ""
+
+        page.pdfs.append({
+            "url": abs_url,
+            "link_text": a.get_text(strip=True)[:200],
+            "nearest_heading": nearest_heading[:200],
+            "context_text": context,
+        })
+
+    def _collect_link(self, a: Tag, href: str, page: ParsedPage, base_url: str,
+                      base_domain: str, seen_urls: set):
         """
-        Extract internal and external links.
-        Skips: PDF links (captured above), skip-links, fragment/mailto anchors.
+        Record <a> as an internal or external link.
+        Skips: PDF links (captured separately), skip-links, fragment/mailto anchors.
         """
-        base_domain = urlparse(base_url).netloc or ""
-        seen_urls: set = set()
-
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
-            if not href or href.startswith(("#", "javascript:", "mailto:", "tel:", "data:")):
-                continue
-
-            abs_url = urljoin(base_url, href)
-            parsed = urlparse(abs_url)
-            if parsed.scheme not in ("http", "https"):
-                continue
-            if abs_url in seen_urls:
-                continue
-            seen_urls.add(abs_url)
-
-            # Skip PDF links — already captured
-            if parsed.path.lower().endswith(".pdf"):
-                continue
-
-            # Skip skip-to-content links
-            link_text = a.get_text(strip=True)
-            if link_text.lower().startswith(self.skip_link_prefixes):
-                continue
-
-            rel = a.get("rel", [])
-            rel_str = " ".join(rel) if isinstance(rel, list) else str(rel)
-            entry = {"url": abs_url, "text": link_text[:200], "rel": rel_str}
-
-            link_domain = parsed.netloc or ""
-            if link_domain == base_domain or link_domain.endswith("." + base_domain):
-                page.internal_links.append(entry)
-            else:
-                page.external_links.append(entry)
+        if href.startswith(("#", "javascript:", "mailto:", "tel:", "data:")):
+            return
+
+        abs_url = urljoin(base_url, href)
+        parsed = urlparse(abs_url)
+        if parsed.scheme not in ("http", "https"):
+            return
+        if abs_url in seen_urls:
+            return
+        seen_urls.add(abs_url)
+
+        # Skip PDF links — already captured
+        if parsed.path.lower().endswith(".pdf"):
+            return
+
+        # Skip skip-to-content links
+        link_text = a.get_text(strip=True)
+        if link_text.lower().startswith(self.skip_link_prefixes):
+            return
+
+        rel = a.get("rel", [])
+        rel_str = " ".join(rel) if isinstance(rel, list) else str(rel)
+        entry = {"url": abs_url, "text": link_text[:200], "rel": rel_str}
+
+        link_domain = parsed.netloc or ""
+        if link_domain == base_domain or link_domain.endswith("." + base_domain):
+            page.internal_links.append(entry)
+        else:
+            page.external_links.append(entry)
 
-    def _extract_tables(self, soup: BeautifulSoup, page: ParsedPage):
+    def _collect_table(self, table: Tag, page: ParsedPage):
         """
-        Extract tables as Markdown from ORIGINAL soup.
+        Convert one <table> to Markdown.
         Tables are easier to parse here than from converted Markdown.
         """
-        for table in soup.find_all("table"):
-            rows = table.find_all("tr")
-            if not rows:
-                continue
-
-            caption_tag = table.find("caption")
-            caption = caption_tag.get_text(strip=True) if caption_tag else ""
-
-            # Headers — prefer <thead>, fall back to first row
-            headers = []
-            thead = table.find("thead")
-            if thead:
-                headers = [th.get_text(strip=True) for th in thead.find_all(["th", "td"])]
-            elif rows:
-                headers = [c.get_text(strip=True) for c in rows[0].find_all(["th", "td"])]
-
-            md_lines = []
-            if headers:
-                md_lines.append("| " + " | ".join(headers) + " |")
-                md_lines.append("| " + " | ".join(["---"] * len(headers)) + " |")
-
-            data_rows = []
-            for row in (rows[1:] if headers else rows):
-                cells = [td.get_text(strip=True) for td in row.find_all(["td", "th"])]
-                if any(c.strip() for c in cells):
-                    md_lines.append("| " + " | ".join(cells) + " |")
-                    data_rows.append(cells)
-
-            if not data_rows:
-                continue
-
-            page.tables.append({
-                "caption": caption,
-                "headers": headers,
-                "row_count": len(data_rows),
-                "markdown": "\n".join(md_lines),
-            })
-
-    def _extract_schema_org(self, soup: BeautifulSoup, page: ParsedPage):
-        """Extract JSON-LD structured data blocks."""
-        for script in soup.find_all("script", type="application/ld+json"):
-            try:
-                data = json.loads(script.string or "{}")
-                page.schema_org.append(data)
-            except Exception:
-                pass
+        rows = table.find_all("tr")
+        if not rows:
+            return
+
+        caption_tag = table.find("caption")
+        caption = caption_tag.get_text(strip=True) if caption_tag else ""
+
+        # Headers — prefer <thead>, fall back to first row
+        headers = []
+        thead = table.find("thead")
+        if thead:
+            headers = [th.get_text(strip=True) for th in thead.find_all(["th", "td"])]
+        elif rows:
+            headers = [c.get_text(strip=True) for c in rows[0].find_all(["th", "td"])]
+
+        md_lines = []
+        if headers:
+            md_lines.append("| " + " | ".join(headers) + " |")
+            md_lines.append("| " + " | ".join(["---"] * len(headers)) + " |")
+
+        data_rows = []
+        for row in (rows[1:] if headers else rows):
+            cells = [td.get_text(strip=True) for td in row.find_all(["td", "th"])]
+            if any(c.strip() for c in cells):
+                md_lines.append("| " + " | ".join(cells) + " |")
+                data_rows.append(cells)
+
+        if not data_rows:
+            return
+
+        page.tables.append({
+            "caption": caption,
+            "headers": headers,
+            "row_count": len(data_rows),
+            "markdown": "\n".join(md_lines),
+        })
 
     # ─────────────────────────────────────────────────────────────
     # Phase 2: Clean soup → Markdown
@@ -522,13 +532,34 @@ class PageParser:
 
         # 8. Remove tags that became empty after all the above
         # (avoids cluttering markdown with orphaned empty divs/spans)
-        changed = True
-        while changed:
-            changed = False
-            for tag in soup.find_all(["div", "span", "p", "li", "ul", "ol", "section"]):
-                if tag.get_text(strip=True) == "" and not tag.find(True):
-                    tag.decompose()
-                    changed = True
+        self._prune_empty_tags(soup)
+
+    def _prune_empty_tags(self, soup: BeautifulSoup):
+        """
+        Remove PRUNABLE_TAGS that hold no text and no other tags,
+        repeatedly, until nothing else qualifies — in ONE post-order pass.
+
+        A tag is empty if every child is whitespace text or an empty
+        prunable tag. Visiting tags in reverse document order sees all
+        children before their parent, so each tag is checked once
+        (linear, vs. re-scanning the whole tree per nesting level).
+        """
+        empty: set = set()   # id() of empty prunable tags
+        for tag in reversed(soup.find_all(PRUNABLE_TAGS)):
+            text_types = tag.interesting_string_types
+            for child in tag.contents:
+                if isinstance(child, Tag):
+                    if id(child) not in empty:
+                        break
+                elif type(child) in text_types and child.strip():
+                    break
+            else:
+                empty.add(id(tag))
+
+        # Decompose only the outermost empty tags — their subtrees go with them
+        for tag in soup.find_all(PRUNABLE_TAGS):
+            if id(tag) in empty and id(tag.parent) not in empty:
+                tag.decompose()
 
     def _to_markdown(self, soup: BeautifulSoup) -> str:
         """
@@ -536,14 +567,7 @@ class PageParser:
         Falls back to plain text if markdownify not installed.
         """
         if MARKDOWNIFY_AVAILABLE:
-            raw_md = md(
-                str(soup),
-                heading_style="ATX",        # # H1  ## H2  etc.
-                bullets="-",                # consistent bullet char
-                strip=["a"],               # keep link text, drop [text](url) syntax
-                                            # (links are captured separately)
-                newline_style="backslash",
-            )
+            raw_md = self._md_converter.convert_soup(soup)
             return self._clean_markdown(raw_md)
         else:
             text = soup.get_text(separator="\n", strip=True)
@@ -552,62 +576,66 @@ class PageParser:
     def _clean_markdown(self, text: str) -> str:
         """
         Post-process markdownify output.
-        Your exact regex pipeline + a few extra cleanup passes.
+        Single compiled pass — see markdown_cleaner.py for the rule order.
         """
-        # 1. Collapse 3+ blank lines → 2
-        text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)
+        return self._md_cleaner.clean(text)
 
-        # 2. Remove empty headings (# with nothing / only spaces after)
-        text = re.sub(r"^#{1,6}\s*$", "", text, flags=re.MULTILINE)
+    def _clean_plaintext(self, text: str) -> str:
+        """Fallback cleaner when markdownify is not installed."""
+        text = re.sub(r"\n{3,}", "\n\n", text)
+        text = re.sub(r"[ \t]+", " ", text)
+        text = "\n".join(line.rstrip() for line in text.splitlines())
+        return text.strip()
 
-        # 3. Remove headings that are only punctuation/symbols
-        text = re.sub(r"^#{1,6}\s*[\W_]+\s*$", "", text, flags=re.MULTILINE)
 
-        # 4. Collapse multiple spaces/tabs within a line
-        text = re.sub(r"[ \t]+", " ", text)
+# ─────────────────────────────────────────────────────────────────
+# ParserPool — parse in worker processes
+# ─────────────────────────────────────────────────────────────────
 
-        # 5. Strip trailing whitespace per line (your exact logic)
-        text = "\n".join(line.rstrip() for line in text.splitlines())
+_worker_parser = None   # PageParser built once per worker process
 
-        # 6. Remove lines that are only markdown horizontal rules
-        text = re.sub(r"^[-=*_]{3,}\s*$", "", text, flags=re.MULTILINE)
 
-        # 7. Remove broken empty markdown links
-        text = re.sub(r"\[\s*\]\([^)]*\)", "", text)
+def _init_parse_worker(config: dict):
+    global _worker_parser
+    _worker_parser = PageParser(config)
 
-        # Remove "Click here" standalone lines
-        text = re.sub(r"^Click here\s*$", "", text, flags=re.MULTILINE)
 
-        # Remove "View all" standalone lines  
-        text = re.sub(r"^View all\s*$", "", text, flags=re.MULTILINE)
+def _parse_in_worker(html: str, url: str, final_url: str) -> ParsedPage:
+    return _worker_parser.parse(html, url, final_url)
 
-        # Remove "Read more about ..." lines
-        text = re.sub(r"^Read more about .+$", "", text, flags=re.MULTILINE)
 
-        # Remove "और पढ़े" / "Read more" standalone lines
-        text = re.sub(r"^(Read more|और पढ़े)\s*$", "", text, flags=re.MULTILINE)
+class ParserPool:
+    """
+    Persistent process pool for PageParser.parse.
 
-        # Remove "Subscribe to" standalone
-        text = re.sub(r"^Subscribe to\s*$", "", text, flags=re.MULTILINE)
+    Parsing (BeautifulSoup, _clean_soup, markdownify) is CPU-bound and holds
+    the GIL; running it in worker processes keeps the crawl process free to
+    fetch and lets parse throughput scale with cores.
+    Each worker builds its PageParser once; only HTML + URL go in and a
+    ParsedPage (plain attributes, picklable) comes back.
+    """
 
-        # Remove pagination blocks
-        text = re.sub(r"(Current page|Next page|Last page|Next ›|Last »).*", "", text, flags=re.MULTILINE)
+    def __init__(self, config: dict, processes: int):
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_parse_worker,
+            initargs=(config,),
+        )
 
-        # Remove "Published Date: DD-MM-YYYY" lines
-        text = re.sub(r"^\s*Published Date:\s*\d{1,2}-\d{2}-\d{4}\s*$", "", text, flags=re.MULTILINE)
+    def submit(self, html: str, url: str, final_url: str = "") -> Future:
+        """Queue a page for parsing. Future resolves to a ParsedPage."""
+        return self._executor.submit(_parse_in_worker, html, url, final_url)
 
-        # Remove lines that are only hashtags
-        text = re.sub(r"^#\w+(\s+#\w+)*\s*$", "", text, flags=re.MULTILINE)
+    def parse(self, html: str, url: str, final_url: str = "") -> ParsedPage:
+        """Blocking parse in a worker process."""
+        return self.submit(html, url, final_url).result()
 
-        # Remove lines that are pure whitespace
-        lines = [line for line in text.splitlines() if line.strip()]
-        text = "\n".join(lines)
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
 
-        return text.strip()
+    def __enter__(self):
+        return self
 
-    def _clean_plaintext(self, text: str) -> str:
-        """Fallback cleaner when markdownify is not installed."""
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = re.sub(r"[ \t]+", " ", text)
-        text = "\n".join(line.rstrip() for line in text.splitlines())
-        return text.strip()
\ No newline at end of file
+    def __exit__(self, *args):
+        self.close()
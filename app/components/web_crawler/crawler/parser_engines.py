@@ -0,0 +1,52 @@
+"""
+parser_engines.py
+-----------------
+HTML parser engines for PageParser.
+
+Every engine produces a BeautifulSoup tree, so extraction, _clean_soup and
+markdownify run unchanged — only tokenizing / tree construction differs:
+
+- "html.parser" : Python stdlib, pure Python. Reference output, slowest.
+- "lxml"        : libxml2 (C) through bs4's lxml tree builder.
+
+A C parser whose tree is replayed into BeautifulSoup (e.g. selectolax /
+lexbor) is no faster than lxml end to end: building the bs4 tree is the
+cost, not tokenizing. Getting more out of one would mean extracting on its
+own node API instead of bs4.
+
+Engines differ slightly on broken markup (unclosed tags, stray </p>, etc.).
+Check a corpus against the reference with
+app/Experiments/check_parser_engines.py before switching.
+"""
+
+import logging
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+DEFAULT_ENGINE = "html.parser"
+PARSER_ENGINES = ("html.parser", "lxml")
+
+
+def resolve_engine(name: str) -> str:
+    """Validate an engine name; fall back to html.parser if unknown or not installed."""
+    name = (name or DEFAULT_ENGINE).lower()
+    if name not in PARSER_ENGINES:
+        logger.warning(f"Unknown parser engine '{name}' — using {DEFAULT_ENGINE}")
+        return DEFAULT_ENGINE
+    if name == "lxml" and not LXML_AVAILABLE:
+        logger.warning(f"lxml not installed — using {DEFAULT_ENGINE}")
+        return DEFAULT_ENGINE
+    return name
+
+
+def build_soup(html: str, engine: str = DEFAULT_ENGINE) -> BeautifulSoup:
+    """Parse HTML into a BeautifulSoup tree with the given engine."""
+    return BeautifulSoup(html, engine)
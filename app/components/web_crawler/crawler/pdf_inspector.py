@@ -0,0 +1,119 @@
+"""
+pdf_inspector.py
+----------------
+Cheap metadata for a downloaded PDF: page count, title, author, encryption.
+
+- The file is memory-mapped and opened with pypdf, which reads the
+  trailer and xref table (or xref stream) and resolves objects on demand
+  — page contents and images are never decoded
+- Page count is the /Count of the root /Pages node (what viewers show);
+  the page tree is only walked if that entry is missing or broken
+- Title / author come from the /Info dictionary. Encrypted files are
+  tried with the empty user password (common for "no-copy" PDFs); if
+  that fails only the page count is reported
+- Damaged files fall back to pypdf's xref reconstruction (strict=False).
+  If the page tree still can't be read (truncated file, password set),
+  page objects are counted with one regex pass over the mapped bytes
+- pypdf's WARNING logs (every recoverable xref problem) are muted only
+  while an inspection runs; other pypdf users keep them
+"""
+
+import re
+import mmap
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+# page dicts are never encrypted, but the regex only sees uncompressed objects:
+# pages inside compressed object streams (PDF 1.5+) are missed, so the
+# fallback undercounts such files (0 if every page is in one)
+_PAGE_OBJ_RE = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+
+_pypdf_logger = logging.getLogger("pypdf")
+_quiet_lock = threading.Lock()
+_quiet_depth = 0                 # inspections running (asset threads)
+_saved_level = logging.NOTSET
+
+
+@contextmanager
+def _pypdf_errors_only():
+    """Raise pypdf's log level to ERROR for the duration; restored when the last inspection ends."""
+    global _quiet_depth, _saved_level
+    with _quiet_lock:
+        if _quiet_depth == 0:
+            _saved_level = _pypdf_logger.level
+            _pypdf_logger.setLevel(logging.ERROR)
+        _quiet_depth += 1
+    try:
+        yield
+    finally:
+        with _quiet_lock:
+            _quiet_depth -= 1
+            if _quiet_depth == 0:
+                _pypdf_logger.setLevel(_saved_level)
+
+
+def inspect_pdf(path) -> dict:
+    """
+    {"page_count", "title", "author", "encrypted"} for the PDF at `path`.
+    Never raises: unreadable files give page_count 0 and None strings.
+    """
+    info = {"page_count": 0, "title": None, "author": None, "encrypted": False}
+    try:
+        with open(Path(path), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            try:
+                with _pypdf_errors_only():
+                    _read_with_pypdf(mm, info)
+            except Exception as e:
+                logger.debug(f"pypdf could not read {path}: {e}")
+            if not info["page_count"]:
+                info["page_count"] = sum(1 for _ in _PAGE_OBJ_RE.finditer(mm))
+    except Exception as e:                  # empty file, permission error
+        logger.debug(f"PDF inspect failed for {path}: {e}")
+    return info
+
+
+def _read_with_pypdf(mm: mmap.mmap, info: dict):
+    reader = PdfReader(mm, strict=False)
+    info["encrypted"] = reader.is_encrypted
+    if reader.is_encrypted and not _try_empty_password(reader):
+        return
+    info["page_count"] = _page_count(reader)
+    meta = reader.metadata
+    if meta is not None:
+        info["title"] = _clean(meta.title)
+        info["author"] = _clean(meta.author)
+
+
+def _try_empty_password(reader: PdfReader) -> bool:
+    try:
+        return bool(reader.decrypt(""))
+    except Exception:                       # unsupported cipher / missing crypto backend
+        return False
+
+
+def _page_count(reader: PdfReader) -> int:
+    try:
+        count = reader.trailer["/Root"]["/Pages"]["/Count"]
+        if int(count) > 0:
+            return int(count)
+    except Exception:
+        pass
+    try:
+        return len(reader.pages)            # walk the page tree
+    except Exception:
+        return 0
+
+
+def _clean(value) -> Optional[str]:
+    """Metadata string → stripped str, None if empty."""
+    if value is None:
+        return None
+    value = str(value).replace("\x00", "").strip()
+    return value or None
@@ -0,0 +1,178 @@
+"""
+robots_cache.py
+---------------
+robots.txt fetch + per-host rules cache for URLFrontier.
+
+- One fetch per origin (scheme://host:port), parsed with urllib.robotparser
+- Entries expire after cache_ttl_sec and are re-fetched on next use
+- Negative caching (RFC 9309):
+    4xx (no robots.txt)        → allow everything, cached negative_ttl_sec
+    5xx / network error        → "error" verdict for error_ttl_sec: the
+                                 caller holds the URL and retries later
+- verdict(url, fetch=False) only looks at cached rules and never blocks,
+  so it is safe on the async engine's event loop; fetching is thread-safe
+  (one fetch per origin) and done from worker threads there
+- Crawl-delay for our user agent is reported back to the caller
+  (capped at max_crawl_delay_sec) so the frontier can slow that host down
+"""
+
+import time
+import logging
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class RobotsEntry:
+    """Parsed rules for one origin."""
+
+    def __init__(self, parser: RobotFileParser, expires_at: float, status: str,
+                 crawl_delay: Optional[float] = None):
+        self.parser = parser
+        self.expires_at = expires_at
+        self.status = status          # "ok" | "missing" | "error"
+        self.crawl_delay = crawl_delay
+
+
+class RobotsCache:
+    """
+    Per-origin robots.txt cache.
+    Pass the crawler's requests session to reuse its connection pool.
+    """
+
+    def __init__(self, config: dict, session: requests.Session = None):
+        crawl_cfg = config.get("crawl", {})
+        robots_cfg = config.get("robots", {})
+
+        self.user_agent = crawl_cfg.get("user_agent", "RAGBot/1.0")
+        self.timeout = robots_cfg.get("timeout_sec", 10)
+        self.cache_ttl = robots_cfg.get("cache_ttl_sec", 86400)
+        self.negative_ttl = robots_cfg.get("negative_ttl_sec", 3600)
+        self.error_ttl = robots_cfg.get("error_ttl_sec", 300)
+        self.max_crawl_delay = robots_cfg.get("max_crawl_delay_sec", 30)
+
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = self.user_agent
+        self._session = session
+        self._entries: dict = {}      # origin → RobotsEntry
+        self._lock = threading.Lock()
+        self._fetch_locks: dict = {}  # origin → Lock (one robots.txt fetch per origin at a time)
+
+        # stats
+        self.fetches = 0
+        self.blocked = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # Public interface
+    # ──────────────────────────────────────────────────────────────
+
+    def verdict(self, url: str, fetch: bool = True) -> str:
+        """
+        "allow" | "block" | "error" (robots.txt unavailable — retry after retry_in())
+        | "unknown" (fetch=False and no fresh rules cached for the origin).
+        """
+        entry = self._entry(url) if fetch else self._cached(url)
+        if entry is None:
+            return "unknown"
+        if entry.status == "error":
+            return "error"
+        if not entry.parser.can_fetch(self.user_agent, url):
+            with self._lock:
+                self.blocked += 1
+            return "block"
+        return "allow"
+
+    def is_allowed(self, url: str) -> bool:
+        """True if robots.txt lets our user agent fetch this URL (fetches the rules if needed)."""
+        return self.verdict(url) == "allow"
+
+    def retry_in(self, url: str) -> float:
+        """Seconds until this URL's origin's cached rules expire (0 if none are cached)."""
+        entry = self._cached(url)
+        return max(0.0, entry.expires_at - time.time()) if entry else 0.0
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """Crawl-delay for this URL's origin (seconds, capped), None if unknown or unset."""
+        entry = self._cached(url)
+        return entry.crawl_delay if entry else None
+
+    def sitemaps(self, url: str) -> list[str]:
+        """Sitemap URLs listed in this URL's robots.txt."""
+        return self._entry(url).parser.site_maps() or []
+
+    def stats(self) -> dict:
+        return {
+            "origins": len(self._entries),
+            "fetches": self.fetches,
+            "blocked": self.blocked,
+        }
+
+    # ──────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def _cached(self, url: str) -> Optional[RobotsEntry]:
+        """Fresh cached entry for the URL's origin, without fetching."""
+        entry = self._entries.get(self._origin(url))
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry
+
+    def _entry(self, url: str) -> RobotsEntry:
+        origin = self._origin(url)
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(origin, threading.Lock())
+        with fetch_lock:
+            entry = self._cached(url)
+            if entry is None:
+                entry = self._fetch(origin)
+                with self._lock:
+                    self._entries[origin] = entry
+                    self.fetches += 1
+        return entry
+
+    def _fetch(self, origin: str) -> RobotsEntry:
+        """Fetch and parse {origin}/robots.txt."""
+        robots_url = f"{origin}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        now = time.time()
+
+        try:
+            response = self._session.get(robots_url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"robots.txt unreachable ({e}) — holding {origin} "
+                           f"for {self.error_ttl}s")
+            parser.disallow_all = True
+            return RobotsEntry(parser, now + self.error_ttl, "error")
+
+        if response.status_code >= 500:
+            logger.warning(f"robots.txt [{response.status_code}] — holding {origin} "
+                           f"for {self.error_ttl}s")
+            parser.disallow_all = True
+            return RobotsEntry(parser, now + self.error_ttl, "error")
+
+        if response.status_code >= 400:
+            logger.debug(f"No robots.txt [{response.status_code}] for {origin} — allowing all")
+            parser.allow_all = True
+            return RobotsEntry(parser, now + self.negative_ttl, "missing")
+
+        parser.parse(response.text.splitlines())
+        parser.modified()
+
+        crawl_delay = parser.crawl_delay(self.user_agent)
+        if crawl_delay is not None:
+            crawl_delay = min(float(crawl_delay), self.max_crawl_delay)
+        logger.info(f"robots.txt loaded for {origin}"
+                    + (f" | Crawl-delay: {crawl_delay}s" if crawl_delay is not None else ""))
+        return RobotsEntry(parser, now + self.cache_ttl, "ok", crawl_delay)
@@ -0,0 +1,173 @@
+"""
+sitemap_loader.py
+-----------------
+sitemap.xml discovery and streaming parse for bulk frontier seeding.
+
+- Sitemap URLs come from robots.txt `Sitemap:` lines, falling back to
+  the configured paths (default /sitemap.xml) on each seed origin
+- <sitemapindex> files are followed (breadth-first, up to max_sitemaps);
+  child sitemaps outside the crawl scope (in_scope) are not fetched
+- Responses are parsed as a stream with ElementTree.iterparse; gzipped
+  sitemaps (.xml.gz or gzip magic bytes) are decompressed on the fly
+- Yields (loc, lastmod, sitemap_url), lastmod normalized to ISO-8601 UTC
+"""
+
+import io
+import gzip
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Iterator, Optional
+from urllib.parse import urlparse
+import xml.etree.ElementTree as ET
+
+import requests
+
+from app.components.web_crawler.crawler.robots_cache import RobotsCache
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def parse_lastmod(value: str) -> Optional[str]:
+    """
+    W3C datetime (2024-03-12, 2024-03-12T10:00:00+05:30, ...Z) → ISO UTC string.
+    Returns None if it can't be parsed. Date-only values mean midnight UTC.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace: '{http://...}url' → 'url'."""
+    return tag.rsplit("}", 1)[-1]
+
+
+class SitemapLoader:
+    """
+    Finds and reads the sitemaps of the seed sites.
+    Pass the crawler's requests session to reuse its connection pool.
+    in_scope: URL → bool (URLFrontier.in_scope), checked before a child
+    sitemap from an index is fetched.
+    """
+
+    def __init__(self, config: dict, session: requests.Session, robots: RobotsCache = None,
+                 in_scope: Callable[[str], bool] = None):
+        sitemap_cfg = config.get("sitemaps", {})
+        self.paths = sitemap_cfg.get("paths", ["/sitemap.xml"])
+        self.use_robots = sitemap_cfg.get("discover_from_robots", True)
+        self.max_sitemaps = sitemap_cfg.get("max_sitemaps", 50)
+        self.max_urls = sitemap_cfg.get("max_urls", 50000)
+        self.timeout = config.get("crawl", {}).get("request_timeout_sec", 20)
+
+        self._session = session
+        self._robots = robots
+        self._in_scope = in_scope
+
+        # stats
+        self.sitemaps_read = 0
+        self.sitemaps_skipped = 0        # out-of-scope children of sitemap indexes
+        self.urls_found = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # Public interface
+    # ──────────────────────────────────────────────────────────────
+
+    def discover(self, seed_urls: list[str]) -> list[str]:
+        """Sitemap URLs for each seed origin (robots.txt first, then default paths)."""
+        sitemaps = []
+        for origin in dict.fromkeys(self._origin(u) for u in seed_urls):
+            found = self._robots.sitemaps(origin + "/") if (self._robots and self.use_robots) else []
+            sitemaps.extend(found or [origin + path for path in self.paths])
+        return sitemaps
+
+    def iter_urls(self, sitemap_urls: list[str]) -> Iterator[tuple[str, Optional[str], str]]:
+        """
+        Yield (loc, lastmod, sitemap_url) for every page URL, following
+        sitemap indexes. Stops at max_sitemaps files or max_urls URLs.
+        """
+        queue = deque(sitemap_urls)
+        seen: set = set()
+        while queue and len(seen) < self.max_sitemaps:
+            sitemap_url = queue.popleft()
+            if sitemap_url in seen:
+                continue
+            seen.add(sitemap_url)
+
+            for kind, loc, lastmod in self._read(sitemap_url):
+                if kind == "sitemap":
+                    if self._in_scope is None or self._in_scope(loc):
+                        queue.append(loc)
+                    else:
+                        self.sitemaps_skipped += 1
+                        logger.debug(f"Child sitemap out of scope, not fetched: {loc}")
+                    continue
+                self.urls_found += 1
+                yield loc, lastmod, sitemap_url
+                if self.urls_found >= self.max_urls:
+                    logger.info(f"Sitemap URL limit reached ({self.max_urls})")
+                    return
+
+    # ──────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────
+
+    def _read(self, sitemap_url: str) -> Iterator[tuple[str, str, Optional[str]]]:
+        """Stream-parse one sitemap → ("url" | "sitemap", loc, lastmod)."""
+        try:
+            response = self._session.get(sitemap_url, timeout=self.timeout, stream=True)
+        except requests.RequestException as e:
+            logger.warning(f"Sitemap fetch failed: {sitemap_url} ({e})")
+            return
+        if response.status_code != 200:
+            logger.debug(f"No sitemap [{response.status_code}]: {sitemap_url}")
+            response.close()
+            return
+
+        count = 0
+        try:
+            response.raw.decode_content = True       # undo Content-Encoding: gzip
+            response.raw.auto_close = False          # BufferedReader closes it, not EOF
+            stream = io.BufferedReader(response.raw)
+            if stream.peek(2)[:2] == GZIP_MAGIC:     # .xml.gz file
+                stream = gzip.GzipFile(fileobj=stream)
+
+            root = None
+            loc, lastmod = "", None
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                if root is None:
+                    root = elem
+                if event != "end":
+                    continue
+                tag = _local_name(elem.tag)
+                if tag == "loc":
+                    loc = (elem.text or "").strip()
+                elif tag == "lastmod":
+                    lastmod = parse_lastmod(elem.text)
+                elif tag in ("url", "sitemap"):
+                    if loc:
+                        count += 1
+                        yield tag, loc, lastmod
+                    loc, lastmod = "", None
+                    root.clear()                     # keep memory flat on huge files
+        except (ET.ParseError, OSError, EOFError) as e:
+            logger.warning(f"Sitemap parse error: {sitemap_url} ({e})")
+        finally:
+            response.close()
+
+        self.sitemaps_read += 1
+        logger.info(f"Sitemap read: {sitemap_url} ({count} entries)")
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
@@ -0,0 +1,247 @@
+"""
+sqlite_frontier.py
+------------------
+Disk-backed URL frontier for large / resumable crawls.
+
+Same interface and scope rules as URLFrontier, but the queue, the visited
+set and the per-domain counts live in a SQLite file. Only a small "hot
+buffer" of the next queued rows is held in memory; the host scheduler
+picks among the hosts in that buffer.
+
+URL states:
+    0 = queued     waiting in the frontier
+    1 = in flight  popped, page not finished yet
+    2 = done       mark_visited() called after the page was handled
+
+On restart with the same db file the exact queue is restored: in-flight
+rows go back to queued (in their original BFS order), done rows stay
+visited and count against max_pages.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from app.components.web_crawler.crawler.robots_cache import RobotsCache
+from app.components.web_crawler.crawler.url_frontier import URLFrontier, normalize_url
+
+logger = logging.getLogger(__name__)
+
+QUEUED, IN_FLIGHT, DONE = 0, 1, 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    seq            INTEGER PRIMARY KEY AUTOINCREMENT,
+    normalized_url TEXT NOT NULL UNIQUE,
+    url            TEXT NOT NULL,
+    depth          INTEGER NOT NULL,
+    parent_url     TEXT,
+    anchor_text    TEXT,
+    url_hash       TEXT,
+    lastmod        TEXT,
+    state          INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_urls_state_seq ON urls (state, seq);
+CREATE TABLE IF NOT EXISTS domains (
+    domain TEXT PRIMARY KEY,
+    count  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_ITEM_COLUMNS = ("url", "normalized_url", "depth", "parent_url", "anchor_text", "url_hash", "lastmod")
+
+
+class SQLiteURLFrontier(URLFrontier):
+    """
+    BFS frontier stored in SQLite.
+    Config: config["frontier"] → db_path, hot_buffer_size, resume
+    """
+
+    def __init__(self, config: dict, robots: RobotsCache = None):
+        super().__init__(config, robots)
+        frontier_cfg = config.get("frontier", {})
+        output_dir = config.get("output", {}).get("base_dir", "./output")
+
+        self.db_path = Path(frontier_cfg.get("db_path") or Path(output_dir) / "frontier.db")
+        self.hot_buffer_size = max(1, int(frontier_cfg.get("hot_buffer_size", 1000)))
+        self.resume = frontier_cfg.get("resume", True)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.resume and self.db_path.exists():
+            logger.info(f"Starting fresh frontier — removing {self.db_path}")
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
+
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        # self.queue (HostScheduler) is the hot buffer: (seq, item) per host
+        self._last_buffered_seq = 0
+        self._visited_count = 0
+        self._queued_count = 0
+        self._restore()
+
+    # ──────────────────────────────────────────────────────────────
+    # Public interface
+    # ──────────────────────────────────────────────────────────────
+
+    def add_seeds(self, urls: list[str]):
+        super().add_seeds(urls)
+        self._save_counters()
+
+    def add_links(self, links: list[dict], from_url: str, current_depth: int):
+        super().add_links(links, from_url, current_depth)
+        self._save_counters()
+
+    def add_sitemap_urls(self, entries) -> int:
+        added = super().add_sitemap_urls(entries)
+        self._save_counters()
+        return added
+
+    def pop_ready(self) -> Optional[dict]:
+        """Next URL of a host that may be hit now, marked in flight; else None."""
+        if len(self.queue) <= self.hot_buffer_size // 2:
+            self._refill()
+        entry = self.queue.pop_ready()
+        if entry is None:
+            return None
+
+        host, (seq, item) = entry
+        self._conn.execute("UPDATE urls SET state = ? WHERE seq = ?", (IN_FLIGHT, seq))
+        self._conn.commit()
+        self._queued_count -= 1
+        self._visited_count += 1
+        self.queue.mark_hit(host)
+        return item
+
+    def requeue(self, item: dict, delay: float):
+        """Put a popped (in-flight) URL back in the queue; its host waits `delay` seconds."""
+        row = self._conn.execute(
+            "SELECT seq FROM urls WHERE normalized_url = ?", (item["normalized_url"],)
+        ).fetchone()
+        if row is None:
+            return
+        self._conn.execute("UPDATE urls SET state = ? WHERE seq = ?", (QUEUED, row[0]))
+        self._conn.commit()
+        self._queued_count += 1
+        self._visited_count -= 1
+        host = urlparse(item["url"]).hostname or ""
+        self.queue.push(host, (row[0], item))
+        self.queue.defer(host, delay)
+
+    def seconds_until_ready(self) -> Optional[float]:
+        if not len(self.queue):
+            self._refill()
+        return self.queue.seconds_until_ready()
+
+    def mark_visited(self, url: str):
+        """Mark a popped URL as done so a resumed crawl does not fetch it again."""
+        self._conn.execute(
+            "UPDATE urls SET state = ? WHERE normalized_url = ?", (DONE, normalize_url(url))
+        )
+        self._conn.commit()
+
+    def has_items(self) -> bool:
+        return self._queued_count > 0
+
+    def is_within_budget(self) -> bool:
+        return self._visited_count < self.max_pages
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "visited": self._visited_count,
+            "queued": self._queued_count,
+        }
+
+    def close(self):
+        """Commit and close the db. The file is kept for resuming."""
+        try:
+            self._save_counters()
+            self._conn.close()
+        except sqlite3.ProgrammingError:
+            pass      # already closed
+
+    # ──────────────────────────────────────────────────────────────
+    # Storage hooks
+    # ──────────────────────────────────────────────────────────────
+
+    def _is_known(self, norm: str) -> bool:
+        # queued URLs are known too — each URL is stored once
+        row = self._conn.execute(
+            "SELECT 1 FROM urls WHERE normalized_url = ?", (norm,)
+        ).fetchone()
+        return row is not None
+
+    def _push(self, host: str, item: dict) -> bool:
+        cur = self._conn.execute(
+            f"INSERT OR IGNORE INTO urls ({', '.join(_ITEM_COLUMNS)}) VALUES ({', '.join('?' * len(_ITEM_COLUMNS))})",
+            tuple(item[c] for c in _ITEM_COLUMNS),
+        )
+        if cur.rowcount != 1:
+            return False
+        self._queued_count += 1
+        return True
+
+    # ──────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────
+
+    def _restore(self):
+        """Load counters from an existing db and requeue in-flight URLs."""
+        requeued = self._conn.execute(
+            "UPDATE urls SET state = ? WHERE state = ?", (QUEUED, IN_FLIGHT)
+        ).rowcount
+        self._conn.commit()
+
+        counts = dict(self._conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+        self._queued_count = counts.get(QUEUED, 0)
+        self._visited_count = counts.get(DONE, 0)
+        self.domain_counts = dict(self._conn.execute("SELECT domain, count FROM domains").fetchall())
+        counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        self.total_enqueued = counters.get("total_enqueued", 0)
+        self.total_skipped = counters.get("total_skipped", 0)
+
+        if self._queued_count or self._visited_count:
+            logger.info(
+                f"Resuming frontier from {self.db_path}: {self._visited_count} done, "
+                f"{self._queued_count} queued ({requeued} were in flight)"
+            )
+
+    def _refill(self):
+        """Load the next batch of queued rows (BFS order) into the hot buffer."""
+        rows = self._conn.execute(
+            f"SELECT seq, {', '.join(_ITEM_COLUMNS)} FROM urls "
+            f"WHERE state = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (QUEUED, self._last_buffered_seq, self.hot_buffer_size),
+        ).fetchall()
+        for row in rows:
+            item = dict(zip(_ITEM_COLUMNS, row[1:]))
+            host = urlparse(item["url"]).hostname or ""
+            if self.robots is not None and host not in self.queue.host_delays:
+                # resumed rows: restore the host's Crawl-delay
+                self._apply_crawl_delay(host, item["url"])
+            self.queue.push(host, (row[0], item))
+        if rows:
+            self._last_buffered_seq = rows[-1][0]
+
+    def _save_counters(self):
+        """Persist per-domain counts and stats, committing pending inserts."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO domains (domain, count) VALUES (?, ?)",
+            self.domain_counts.items(),
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)",
+            [("total_enqueued", self.total_enqueued), ("total_skipped", self.total_skipped)],
+        )
+        self._conn.commit()
+
@@ -3,19 +3,27 @@ url_frontier.py
 ---------------
 BFS-based URL queue with:
 - Depth tracking per URL
+- Host-aware politeness scheduling (per-host queues + ready-time heap)
 - Visited set (deduplication by normalized URL)
 - Domain scope enforcement
-- robots.txt compliance
+- robots.txt compliance (RobotsCache; Crawl-delay → per-host delay).
+  Enqueueing only uses cached rules and never fetches; a URL whose host
+  rules aren't known yet is queued and checked when it is popped
+  (robots_verdict / settle_robots, called by the engines)
 - URL normalization and filtering
 """
 
 import re
+import time
 import hashlib
 import logging
 from typing import Optional
-from collections import deque
 from urllib.parse import urlparse, urljoin, urlunparse, parse_qs, urlencode
 
+from app.components.web_crawler.crawler.host_scheduler import HostScheduler
+from app.components.web_crawler.crawler.robots_cache import RobotsCache
+from app.components.web_crawler.crawler.visited_set import create_visited_set
+
 logger = logging.getLogger(__name__)
 
 def normalize_url(url: str) -> str:
@@ -85,7 +93,7 @@ class URLFrontier:
     Queue items: (url, depth, parent url, anchor_text)
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, robots: RobotsCache = None):
         self.config = config
         self.crawl_cfg = config.get('crawl', {})
         self.scope_cfg = config.get("scope", {})
@@ -96,10 +104,16 @@ class URLFrontier:
         self.internal_only = self.scope_cfg.get("internal_only", True)
         self.allow_subdomains = self.scope_cfg.get("allow_subdomains", True)
 
-        self.queue: deque = deque()
+        # per-host queues; a host is handed out again only after `delay`
+        self.delay = self.crawl_cfg.get("delay_between_requests_sec", 1.5)
+        self.queue = HostScheduler(self.delay)
 
-        # visited normalized urls
-        self.visited: set = set()
+        # visited normalized urls (set / HashedURLSet / ScalableBloomFilter)
+        self.visited = create_visited_set(config.get("frontier", {}))
+        # normalized urls ever queued (so duplicates aren't queued / checked again).
+        # Same compact structure as visited; nothing is removed, since a popped
+        # URL is in visited from then on
+        self._queued = create_visited_set(config.get("frontier", {}))
 
         # count per domain
         self.domain_counts: dict = {}
@@ -125,6 +139,9 @@ class URLFrontier:
 
         self.user_agent = self.crawl_cfg.get('user_agent', 'RAGBot/1.0')
 
+        # robots.txt rules (None → not checked)
+        self.robots = robots if self.crawl_cfg.get("respect_robots_txt", True) else None
+
         # stats
         self.total_enqueued = 0
         self.total_skipped = 0
@@ -149,6 +166,22 @@ class URLFrontier:
     # Public interface
     # ──────────────────────────────────────────────────────────────
 
+    def add_sitemap_urls(self, entries) -> int:
+        """
+        Bulk-add URLs listed in sitemaps, as depth-0 seeds.
+        Each entry: (url, lastmod, sitemap_url) from SitemapLoader.iter_urls().
+        Returns the number of URLs queued.
+        """
+        before = self.total_enqueued
+        for url, lastmod, sitemap_url in entries:
+            self._enqueue(url, depth=0, parent_url=sitemap_url, anchor_text="[SITEMAP]", lastmod=lastmod)
+        return self.total_enqueued - before
+
+    def in_scope(self, url: str) -> bool:
+        """Scope check alone (http/https, seed domains, whitelist) for URLs that aren't queued, e.g. sitemaps."""
+        parsed = urlparse(url)
+        return parsed.scheme in ("http", "https") and self._is_in_scope(url, parsed)
+
     def add_links(self, links: list[dict], from_url: str, current_depth: int):
         """
         Add discovered links back into the queue.
@@ -172,16 +205,82 @@ class URLFrontier:
     def pop(self) -> Optional[dict]:
         """
         Get next URL to crawl.
-        Skips URLs already visited. Returns None if queue is empty.
+        Hands out a URL whose host is past its politeness delay; only sleeps
+        when every queued host is cooling down. Returns None if queue is empty.
+        """
+        while self.has_items():
+            item = self.pop_ready()
+            if item is not None:
+                return item
+            wait = self.seconds_until_ready()
+            if wait is None:
+                break
+            logger.debug(f"All queued hosts cooling down — waiting {wait:.2f}s")
+            time.sleep(wait)
+        return None
+
+    def pop_ready(self) -> Optional[dict]:
         """
-        while self.queue:
-            item = self.queue.popleft()
+        Non-blocking pop: next URL of a host that may be hit now, else None.
+        Skips URLs already visited.
+        """
+        while True:
+            entry = self.queue.pop_ready()
+            if entry is None:
+                return None
+            host, item = entry
             norm = normalize_url(item["url"])
-            if norm in self.visited:
+            if norm in self.visited and not item.pop("requeued", False):
                 continue
             self.visited.add(norm)
+            self.queue.mark_hit(host)
             return item
-        return None
+
+    def seconds_until_ready(self) -> Optional[float]:
+        """Seconds until a queued host is ready (0 = now); None if nothing is queued."""
+        return self.queue.seconds_until_ready()
+
+    def robots_verdict(self, url: str, fetch: bool = False) -> str:
+        """
+        robots.txt verdict for a popped URL: "allow" | "block" | "error" | "unknown".
+        fetch=False never does network I/O ("unknown" → fetch off the event loop
+        with fetch=True, e.g. via asyncio.to_thread(self.robots.verdict, url)).
+        """
+        if self.robots is None:
+            return "allow"
+        return self.robots.verdict(url, fetch=fetch)
+
+    def settle_robots(self, item: dict, verdict: str) -> bool:
+        """
+        Act on a popped URL's robots verdict. True → crawl it now.
+        block → marked visited and skipped; error → requeued until the
+        host's robots.txt can be fetched again.
+        """
+        url = item["url"]
+        host = urlparse(url).hostname or ""
+        if verdict == "allow":
+            if self.robots is not None:
+                self._apply_crawl_delay(host, url)
+            return True
+        if verdict == "block":
+            logger.debug(f"Disallowed by robots.txt: {url}")
+            self.total_skipped += 1
+            self.mark_visited(url)
+            return False
+        delay = max(self.robots.retry_in(url), 1.0) if self.robots is not None else 1.0
+        logger.debug(f"robots.txt unavailable — retrying in {delay:.0f}s: {url}")
+        self.requeue(item, delay)
+        return False
+
+    def host_delay(self, host: str) -> float:
+        """Seconds between requests to a host (robots.txt Crawl-delay if longer than ours)."""
+        return self.queue.host_delays.get(host, self.delay)
+
+    def requeue(self, item: dict, delay: float):
+        """Put a popped item back; its host is not handed out again for `delay` seconds."""
+        host = urlparse(item["url"]).hostname or ""
+        self.queue.push(host, {**item, "requeued": True})
+        self.queue.defer(host, delay)
 
     def mark_visited(self, url: str):
         """Explicitly mark a URL as visited (e.g. after a successful crawl)."""
@@ -203,15 +302,22 @@ class URLFrontier:
             "total_enqueued": self.total_enqueued,
             "total_skipped": self.total_skipped,
             "domain_counts": dict(self.domain_counts),
+            "robots": self.robots.stats() if self.robots else {},
         }
 
+    def close(self):
+        """Release frontier storage (nothing to do for the in-memory queue)."""
+        pass
+
     # ──────────────────────────────────────────────────────────────
     # Internal helpers
     # ──────────────────────────────────────────────────────────────
 
-    def _enqueue(self, url: str, depth: int, parent_url: Optional[str], anchor_text: str):
+    def _enqueue(self, url: str, depth: int, parent_url: Optional[str], anchor_text: str,
+                 lastmod: Optional[str] = None):
         """
         Validate and add URL to queue.
+        lastmod: sitemap <lastmod> (ISO UTC), used to skip unchanged pages on recrawl.
         """
         try:
             # basic cleanup
@@ -228,9 +334,9 @@ class URLFrontier:
             if parsed.scheme not in ('http', 'https'):
                 return
 
-            # normalize for deduplication check
+            # normalize for deduplication check (visited or already queued)
             norm = normalize_url(url)
-            if norm in self.visited:
+            if self._is_known(norm):
                 return
 
             # scope check
@@ -251,21 +357,34 @@ class URLFrontier:
                     self.total_skipped += 1
                     return
 
-            # domain budget
+            # robots.txt, cached rules only: unknown / unavailable rules are
+            # checked again when the URL is popped (settle_robots)
             domain = parsed.hostname or ""
+            verdict = self.robots.verdict(url, fetch=False) if self.robots is not None else "allow"
+            if verdict == "block":
+                logger.debug(f"Disallowed by robots.txt: {url}")
+                self.total_skipped += 1
+                return
+            if verdict == "allow" and self.robots is not None:
+                self._apply_crawl_delay(domain, url)
+
+            # domain budget
             if self.domain_counts.get(domain, 0) >= self.max_per_domain:
                 self.total_skipped += 1
                 return
 
             # add to queue
-            self.queue.append({
+            added = self._push(domain, {
                 'url': url,
                 'normalized_url': norm,
                 'depth': depth,
                 'parent_url': parent_url,
                 'anchor_text': anchor_text,
                 'url_hash': url_hash(url),
+                'lastmod': lastmod,
             })
+            if not added:
+                return
 
             self.domain_counts[domain] = self.domain_counts.get(domain, 0) + 1
             self.total_enqueued += 1
@@ -273,6 +392,25 @@ class URLFrontier:
         except Exception as e:
             logger.warning(f"Error enqueuing {url}: {e}")
 
+    # Storage hooks — overridden by disk-backed frontiers (sqlite_frontier.py)
+
+    def _is_known(self, norm: str) -> bool:
+        """True if this normalized URL should not be enqueued again."""
+        return norm in self._queued or norm in self.visited
+
+    def _push(self, host: str, item: dict) -> bool:
+        """Append an item to its host's queue. Returns False if it was not added."""
+        self.queue.push(host, item)
+        self._queued.add(item["normalized_url"])
+        return True
+
+    def _apply_crawl_delay(self, host: str, url: str):
+        """Slow the host down to its robots.txt Crawl-delay if that is longer than ours."""
+        crawl_delay = self.robots.crawl_delay(url)
+        if crawl_delay is not None and crawl_delay > self.queue.host_delays.get(host, self.delay):
+            logger.info(f"Using robots.txt Crawl-delay {crawl_delay}s for {host}")
+            self.queue.set_host_delay(host, crawl_delay)
+
     def _root_domain(self, hostname: str) -> str:
         """
         Extract root domain. e.g. 'sub.example.gov.in' -> 'example.gov.in'
@@ -305,4 +443,18 @@ class URLFrontier:
         if not self.internal_only and root in self.external_whitelist:
             return True
 
-        return False
\ No newline at end of file
+        return False
+
+def create_frontier(config: dict, robots: RobotsCache = None) -> URLFrontier:
+    """
+    Build the frontier backend named in config["frontier"]["backend"].
+    - "memory" : deque + set, lost when the process exits (default)
+    - "sqlite" : on-disk queue / visited set, resumable after a crash
+    """
+    backend = config.get("frontier", {}).get("backend", "memory")
+    if backend == "sqlite":
+        from app.components.web_crawler.crawler.sqlite_frontier import SQLiteURLFrontier
+        return SQLiteURLFrontier(config, robots)
+    if backend != "memory":
+        logger.warning(f"Unknown frontier backend '{backend}' — using memory")
+    return URLFrontier(config, robots)
@@ -0,0 +1,187 @@
+"""
+visited_set.py
+--------------
+Compact dedup structures for URLFrontier.visited.
+
+- "exact"  : Python set of normalized URL strings (default). ~150-250 B/URL.
+- "hashed" : 64-bit BLAKE2b hash per URL in an open-addressing table on
+             array('Q'). 8 B per slot at ≤ 70% load → ~12-23 B/URL.
+             Collisions are possible but negligible (~n²/2^65:
+             about 1 in 370k crawls of 10M URLs).
+- "bloom"  : scalable Bloom filter with a bounded false-positive rate.
+             ~2.5-5 B/URL at 1e-4 (more once it has grown past
+             expected_urls). A false positive means a new URL is
+             treated as visited and never crawled.
+
+All three support `in`, add() and len(), so the frontier code is the same.
+Measure with app/Experiments/bench_visited_set.py.
+"""
+
+import math
+import hashlib
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+VISITED_SET_TYPES = ("exact", "hashed", "bloom")
+
+
+def _hash64(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), "little")
+
+
+class HashedURLSet:
+    """
+    Set of 64-bit URL hashes. Linear probing, power-of-two capacity,
+    doubles when the load factor passes MAX_LOAD. Slot value 0 = empty.
+    """
+
+    MAX_LOAD = 0.7
+
+    def __init__(self, expected_items: int = 100_000):
+        capacity = 1 << max(4, math.ceil(math.log2(max(expected_items, 1) / self.MAX_LOAD)))
+        self._slots = array("Q", bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._count = 0
+
+    def _find(self, h: int) -> int:
+        """Index of h's slot, or of the empty slot where it would go."""
+        slots, mask = self._slots, self._mask
+        i = h & mask
+        while True:
+            value = slots[i]
+            if value == h or value == 0:
+                return i
+            i = (i + 1) & mask
+
+    def add(self, url: str):
+        h = _hash64(url) or 1        # 0 marks an empty slot
+        i = self._find(h)
+        if self._slots[i] == h:
+            return
+        self._slots[i] = h
+        self._count += 1
+        if self._count > self.MAX_LOAD * (self._mask + 1):
+            self._grow()
+
+    def __contains__(self, url: str) -> bool:
+        h = _hash64(url) or 1
+        return self._slots[self._find(h)] == h
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _grow(self):
+        old = self._slots
+        self._slots = array("Q", bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        for h in old:
+            if h:
+                self._slots[self._find(h)] = h
+
+    @property
+    def nbytes(self) -> int:
+        return self._slots.itemsize * len(self._slots)
+
+
+class _BloomSlice:
+    """One fixed-size Bloom filter (bit array + k hash positions)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def positions(self, h1: int, h2: int):
+        # Kirsch–Mitzenmacher double hashing: k positions from two hashes
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def contains(self, positions: list) -> bool:
+        bits = self.bits
+        for p in positions:
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def add(self, positions: list):
+        bits = self.bits
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """
+    Scalable Bloom filter (Almeida et al.): when a slice fills up, a new one
+    with GROWTH x the capacity and TIGHTENING x the error rate is added, so
+    the overall false-positive rate stays below `error_rate` however many
+    URLs are added.
+    """
+
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(self, expected_items: int = 100_000, error_rate: float = 1e-4):
+        if not 0 < error_rate < 1:
+            raise ValueError(f"bloom error_rate must be in (0, 1), got {error_rate}")
+        self.error_rate = error_rate
+        # Σ p0·r^i = p0 / (1 - r) ≤ error_rate
+        self._next_error = error_rate * (1 - self.TIGHTENING)
+        self._next_capacity = max(expected_items, 1000)
+        self._slices: list[_BloomSlice] = []
+        self._add_slice()
+
+    def _add_slice(self):
+        self._slices.append(_BloomSlice(self._next_capacity, self._next_error))
+        self._next_capacity *= self.GROWTH
+        self._next_error *= self.TIGHTENING
+
+    @staticmethod
+    def _hashes(url: str) -> tuple[int, int]:
+        digest = hashlib.blake2b(url.encode(), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def add(self, url: str):
+        h1, h2 = self._hashes(url)
+        positions = None
+        for s in self._slices:
+            positions = s.positions(h1, h2)
+            if s.contains(positions):
+                return
+        current = self._slices[-1]
+        if current.count >= current.capacity:
+            self._add_slice()
+            current = self._slices[-1]
+            positions = current.positions(h1, h2)
+        current.add(positions)
+
+    def __contains__(self, url: str) -> bool:
+        h1, h2 = self._hashes(url)
+        return any(s.contains(s.positions(h1, h2)) for s in self._slices)
+
+    def __len__(self) -> int:
+        return sum(s.count for s in self._slices)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(s.bits) for s in self._slices)
+
+
+def create_visited_set(frontier_cfg: dict):
+    """
+    Build the visited-set type named in frontier_cfg["visited_set"].
+    Sized from frontier_cfg["expected_urls"]; grows past it if needed.
+    """
+    kind = frontier_cfg.get("visited_set", "exact")
+    expected = int(frontier_cfg.get("expected_urls", 100_000))
+    if kind == "hashed":
+        return HashedURLSet(expected)
+    if kind == "bloom":
+        return ScalableBloomFilter(expected, float(frontier_cfg.get("bloom_error_rate", 1e-4)))
+    if kind != "exact":
+        logger.warning(f"Unknown visited_set '{kind}' — using exact")
+    return set()
@@ -6,9 +6,12 @@ Ties together: URLFrontier → PageFetcher → PageParser → AssetDownloader 
 
 Flow per URL:
 1. Pop from frontier
-2. Fetch page
+   robots.txt check (host's rules fetched on first use; unavailable → requeued)
+2. Fetch page (recrawl mode: conditional GET; 304 → reuse stored page, skip 3-5)
 3. Parse HTML (text, links, images, PDFs)
-4. Download images + PDFs
+   Near-duplicate check on body text (MinHash-LSH): flag, or drop before 4-5
+4. Download images + PDFs (background AssetPool: queued here, results
+   reach image_index / pdf_index when done; download_workers = 0 → inline)
 5. Write page JSON + update indexes
 6. Add discovered links back to frontier
 7. Repeat until queue empty or budget exhausted
@@ -19,10 +22,14 @@ import time
 from pathlib import Path
 from urllib.parse import urlparse
 
-from app.components.web_crawler.crawler.url_frontier import URLFrontier
+from app.components.web_crawler.crawler.url_frontier import create_frontier
+from app.components.web_crawler.crawler.robots_cache import RobotsCache
+from app.components.web_crawler.crawler.sitemap_loader import SitemapLoader
+from app.components.web_crawler.crawler.content_dedup import ContentDedupIndex
 from app.components.web_crawler.crawler.page_fetcher import PageFetcher
 from app.components.web_crawler.crawler.page_parser import PageParser
 from app.components.web_crawler.crawler.asset_downloader import AssetDownloader
+from app.components.web_crawler.crawler.asset_pool import AssetPool
 from app.components.web_crawler.storage.metadata_writer import MetadataWriter
 
 logger = logging.getLogger(__name__)
@@ -39,8 +46,11 @@ class CrawlOrchestrator:
         self.log_every = config.get("logging", {}).get("progress_every_n_pages", 10)
 
         # Init components
-        self.frontier = URLFrontier(config)
         self.fetcher = PageFetcher(config)
+        self.frontier = create_frontier(
+            config,
+            robots=RobotsCache(config, session=self.fetcher._session),
+        )
         self.parser = PageParser(config)
         self.writer = MetadataWriter(config, self.output_dir)
         self.downloader = AssetDownloader(
@@ -48,9 +58,20 @@ class CrawlOrchestrator:
             session=self.fetcher._session,
             output_dir=self.output_dir
         )
+        self.asset_pool = AssetPool(config, self.downloader) \
+            if config.get("assets", {}).get("download_workers", 4) > 0 else None
 
         self._crawl_images = config.get("assets", {}).get("download_images", True)
         self._crawl_pdfs = config.get("assets", {}).get("download_pdfs", True)
+        self._use_sitemaps = config.get("sitemaps", {}).get("enabled", False)
+        self._recrawl = config.get("recrawl", {}).get("enabled", False)
+        self._interrupted = False
+
+        dedup_cfg = config.get("dedup", {})
+        self.dedup = ContentDedupIndex(
+            config, path=Path(self.output_dir) / "metadata" / "dedup_index.jsonl"
+        ) if dedup_cfg.get("enabled", False) else None
+        self._drop_duplicates = dedup_cfg.get("action", "flag") == "drop"
 
     # ──────────────────────────────────────────────────────────────
     # Main run loop
@@ -63,6 +84,7 @@ class CrawlOrchestrator:
                     f"Max pages: {self.config['crawl']['max_pages']}")
 
         self.frontier.add_seeds(seed_urls)
+        self._seed_from_sitemaps(seed_urls)
         pages_processed = 0
         start_time = time.time()
 
@@ -76,24 +98,42 @@ class CrawlOrchestrator:
                 depth = item["depth"]
 
                 # Skip if already crawled (resume mode)
-                if self.writer.is_already_crawled(url):
+                if self._should_skip(item):
                     logger.debug(f"Skipping (already crawled): {url}")
+                    self.frontier.mark_visited(url)
+                    continue
+
+                # robots.txt (blocked → skipped; host's robots.txt unavailable → requeued)
+                if not self._robots_allowed(item):
                     continue
 
                 logger.debug(f"[depth={depth}] Crawling: {url}")
 
                 # ── STEP 1: Fetch
-                fetch_result = self.fetcher.fetch(url)
+                fetch_result = self.fetcher.fetch(url, validators=self._validators(url))
+
+                # Unchanged since last crawl: keep the stored page, follow its links
+                if fetch_result.not_modified:
+                    self.frontier.add_links(
+                        links=self._not_modified_links(item, fetch_result),
+                        from_url=url,
+                        current_depth=depth,
+                    )
+                    self.frontier.mark_visited(url)
+                    pages_processed += 1
+                    continue
 
                 # ── STEP 2: Handle non-HTML (PDF/image directly linked)
                 if fetch_result.success and fetch_result.is_pdf:
                     self._handle_direct_pdf(item, fetch_result)
+                    self.frontier.mark_visited(url)
                     pages_processed += 1
                     continue
 
                 if not fetch_result.success or not fetch_result.is_html:
                     self.writer.write_error(item, fetch_result)
                     logger.warning(f"Failed [{fetch_result.status_code}] [{fetch_result.error}]: {url}")
+                    self.frontier.mark_visited(url)
                     pages_processed += 1
                     continue
 
@@ -112,31 +152,16 @@ class CrawlOrchestrator:
                     current_depth=depth,
                 )
 
-                # ── STEP 5: Download images
-                image_assets = []
-                if self._crawl_images:
-                    domain = urlparse(url).hostname or ""
-                    for img in parsed.images:
-                        img_url = img.get("url", "")
-                        if not img_url:
-                            continue
-                        dl_result = self.downloader.download_image(img_url, domain)
-                        image_assets.append({**img, "download_result": dl_result.to_dict()})
-                        if dl_result.success and not dl_result.skipped:
-                            logger.debug(f"  ↳ Image: {img_url} → {dl_result.file_path}")
-
-                # ── STEP 6: Download PDFs
-                pdf_assets = []
-                if self._crawl_pdfs:
-                    domain = urlparse(url).hostname or ""
-                    for pdf in parsed.pdfs:
-                        pdf_url = pdf.get("url", "")
-                        if not pdf_url:
-                            continue
-                        dl_result = self.downloader.download_pdf(pdf_url, domain)
-                        pdf_assets.append({**pdf, "download_result": dl_result.to_dict()})
-                        if dl_result.success and not dl_result.skipped:
-                            logger.debug(f"  ↳ PDF: {pdf_url} → {dl_result.file_path}")
+                # Near-duplicate of a page already written?
+                dedup = self._check_duplicate(url, self._signature(parsed))
+                if dedup and self._drop_duplicates:
+                    self.writer.write_duplicate(item, fetch_result, parsed, dedup)
+                    self.frontier.mark_visited(url)
+                    pages_processed += 1
+                    continue
+
+                # ── STEP 5 + 6: Download images and PDFs
+                image_assets, pdf_assets = self._download_assets(url, parsed)
 
                 # ── STEP 7: Write metadata
                 file_path = self.writer.write_page(
@@ -145,59 +170,231 @@ class CrawlOrchestrator:
                     parsed_page=parsed,
                     image_assets=image_assets,
                     pdf_assets=pdf_assets,
+                    dedup=dedup,
                 )
+                self.frontier.mark_visited(url)
 
                 pages_processed += 1
 
                 # Progress logging
                 if pages_processed % self.log_every == 0:
-                    elapsed = time.time() - start_time
-                    stats = self.frontier.stats()
-                    logger.info(
-                        f"Progress: {pages_processed} pages | "
-                        f"Queue: {stats['queued']} | "
-                        f"Elapsed: {elapsed:.0f}s | "
-                        f"Rate: {pages_processed/elapsed:.1f} pg/s"
-                    )
-                    # Flush indexes periodically
-                    self.writer.flush_indexes()
+                    self._log_progress(pages_processed, start_time)
 
         except KeyboardInterrupt:
             logger.info("Crawl interrupted by user")
+            self._interrupted = True
 
         finally:
-            # Final flush
-            self.writer.flush_indexes()
-            stats = self.frontier.stats()
-            summary = self.writer.write_crawl_summary(stats)
-
-            elapsed = time.time() - start_time
-            logger.info("=" * 60)
-            logger.info("CRAWL COMPLETE")
-            logger.info(f"  Pages crawled:    {pages_processed}")
-            logger.info(f"  URLs seen:        {stats['visited']}")
-            logger.info(f"  Errors:           {summary.get('errors', 0)}")
-            logger.info(f"  Images saved:     {summary.get('total_images_downloaded', 0)}")
-            logger.info(f"  PDFs saved:       {summary.get('total_pdfs_downloaded', 0)}")
-            logger.info(f"  Time elapsed:     {elapsed:.1f}s")
-            logger.info(f"  Output dir:       {self.output_dir}")
-            logger.info("=" * 60)
-
-            self.fetcher.close()
+            summary = self._finish(pages_processed, start_time)
 
         return summary
 
+    # ──────────────────────────────────────────────────────────────
+    # Shared steps (used by the sync and async engines)
+    # ──────────────────────────────────────────────────────────────
+
+    def _should_skip(self, item: dict) -> bool:
+        """
+        Resume: skip URLs already in the crawl index (unless a sitemap lastmod is newer).
+        Recrawl mode: skip only pages a sitemap lastmod shows as unchanged;
+        the rest are re-fetched with a conditional GET.
+        """
+        lastmod = item.get("lastmod")
+        if self._recrawl and not lastmod:
+            return False
+        return self.writer.is_already_crawled(item["url"], lastmod=lastmod)
+
+    def _robots_allowed(self, item: dict) -> bool:
+        """robots.txt check for a popped URL, fetching the host's rules if needed."""
+        verdict = self.frontier.robots_verdict(item["url"], fetch=True)
+        return self.frontier.settle_robots(item, verdict)
+
+    def _validators(self, url: str):
+        """Stored ETag / Last-Modified for a conditional GET (recrawl mode only)."""
+        return self.writer.get_validators(url) if self._recrawl else None
+
+    def _not_modified_links(self, item: dict, fetch_result) -> list[dict]:
+        """Record a 304 and return the stored page's links for the frontier."""
+        logger.debug(f"Not modified: {item['url']}")
+        self.writer.write_not_modified(item, fetch_result)
+        return self.writer.load_page_links(item["url"])
+
+    def _signature(self, parsed):
+        """MinHash of the page's body text (None if dedup is off or the text is short)."""
+        if self.dedup is None or parsed is None:
+            return None
+        return self.dedup.signature(parsed.body_text)
+
+    def _check_duplicate(self, url: str, signature) -> dict:
+        """
+        Look the page up in the dedup index (indexing it if it is new).
+        Near-duplicate → {"duplicate_of", "similarity"} for write_page, else {}.
+        """
+        if self.dedup is None:
+            return {}
+        match = self.dedup.match_or_add(url, signature)
+        if not match:
+            return {}
+        logger.info(f"Near-duplicate of {match['url']} ({match['similarity']:.2f}): {url}")
+        return {"duplicate_of": match["url"], "similarity": match["similarity"]}
+
+    def _seed_from_sitemaps(self, seed_urls: list[str]):
+        """Bulk-seed the frontier from the seed sites' sitemaps (sitemaps.enabled)."""
+        if not self._use_sitemaps:
+            return
+        loader = SitemapLoader(self.config, session=self.fetcher._session, robots=self.frontier.robots,
+                               in_scope=self.frontier.in_scope)
+        sitemap_urls = loader.discover(seed_urls)
+        added = self.frontier.add_sitemap_urls(loader.iter_urls(sitemap_urls))
+        logger.info(f"Sitemaps: {loader.sitemaps_read} read | "
+                    f"{loader.sitemaps_skipped} out of scope | "
+                    f"{loader.urls_found} URLs listed | {added} queued")
+
+    def _download_assets(self, url: str, parsed) -> tuple[list, list]:
+        """Download images and PDFs found on a parsed page."""
+        if self.asset_pool is not None:
+            return self._queue_assets(url, parsed)
+        domain = urlparse(url).hostname or ""
+
+        image_assets = []
+        if self._crawl_images:
+            for img in parsed.images:
+                img_url = img.get("url", "")
+                if not img_url:
+                    continue
+                dl_result = self.downloader.download_image(img_url, domain)
+                image_assets.append({**img, "download_result": dl_result.to_dict()})
+                if dl_result.success and not dl_result.skipped:
+                    logger.debug(f"  ↳ Image: {img_url} → {dl_result.file_path}")
+
+        pdf_assets = []
+        if self._crawl_pdfs:
+            for pdf in parsed.pdfs:
+                pdf_url = pdf.get("url", "")
+                if not pdf_url:
+                    continue
+                dl_result = self.downloader.download_pdf(pdf_url, domain)
+                pdf_assets.append({**pdf, "download_result": dl_result.to_dict()})
+                if dl_result.success and not dl_result.skipped:
+                    logger.debug(f"  ↳ PDF: {pdf_url} → {dl_result.file_path}")
+
+        return image_assets, pdf_assets
+
+    def _queue_assets(self, url: str, parsed) -> tuple[list, list]:
+        """
+        Hand a page's images and PDFs to the AssetPool and return at once.
+        The page is written with download_pending entries; each result is
+        added to the writer's image / PDF index when its download finishes.
+        """
+        domain = urlparse(url).hostname or ""
+
+        image_assets = []
+        if self._crawl_images:
+            for img in parsed.images:
+                if not img.get("url"):
+                    continue
+                self.asset_pool.submit(
+                    "image", img["url"], domain,
+                    lambda result, img=img: self.writer.record_image(url, img, result.to_dict()),
+                )
+                image_assets.append({**img, "download_result": {"pending": True}})
+
+        pdf_assets = []
+        if self._crawl_pdfs:
+            for pdf in parsed.pdfs:
+                if not pdf.get("url"):
+                    continue
+                self.asset_pool.submit(
+                    "pdf", pdf["url"], domain,
+                    lambda result, pdf=pdf: self.writer.record_pdf(url, pdf, result.to_dict()),
+                )
+                pdf_assets.append({**pdf, "download_result": {"pending": True}})
+
+        return image_assets, pdf_assets
+
+    def _log_progress(self, pages_processed: int, start_time: float):
+        """Log crawl progress and flush indexes."""
+        self._log_rate(pages_processed, start_time)
+        # Flush indexes periodically
+        self._flush_indexes()
+
+    def _log_rate(self, pages_processed: int, start_time: float):
+        elapsed = time.time() - start_time
+        stats = self.frontier.stats()
+        logger.info(
+            f"Progress: {pages_processed} pages | "
+            f"Queue: {stats['queued']} | "
+            f"Elapsed: {elapsed:.0f}s | "
+            f"Rate: {pages_processed/max(elapsed, 1e-6):.1f} pg/s"
+            + (f" | Assets pending: {self.asset_pool.pending()}" if self.asset_pool else "")
+        )
+
+    def _flush_indexes(self, final: bool = False):
+        """Persist the writer indexes, the dedup index and the asset URL cache."""
+        self.writer.flush_indexes(final=final)
+        self.downloader.save_cache()
+        if self.dedup is not None:
+            self.dedup.flush()
+
+    def _finish(self, pages_processed: int, start_time: float) -> dict:
+        """Final flush, crawl summary and cleanup."""
+        if self.asset_pool is not None:
+            pending = self.asset_pool.pending()
+            if pending and not self._interrupted:
+                logger.info(f"Waiting for {pending} asset downloads...")
+            self.asset_pool.close(wait_for_pending=not self._interrupted)
+        self._flush_indexes(final=True)
+        stats = self.frontier.stats()
+        summary = self.writer.write_crawl_summary(stats, pipeline_stats=self._pipeline_stats())
+
+        elapsed = time.time() - start_time
+        logger.info("=" * 60)
+        logger.info("CRAWL COMPLETE")
+        logger.info(f"  Pages crawled:    {pages_processed}")
+        logger.info(f"  URLs seen:        {stats['visited']}")
+        logger.info(f"  Errors:           {summary.get('errors', 0)}")
+        if self._recrawl:
+            logger.info(f"  Not modified:     {summary.get('pages_not_modified', 0)}")
+        if self.dedup is not None:
+            logger.info(f"  Near-duplicates:  {summary.get('pages_duplicate', 0)}")
+        logger.info(f"  Images saved:     {summary.get('total_images_downloaded', 0)}")
+        logger.info(f"  PDFs saved:       {summary.get('total_pdfs_downloaded', 0)}")
+        logger.info(f"  Asset cache hits: {self.downloader.cache_hits}")
+        if self.fetcher.archive is not None:
+            logger.info(f"  Responses archived: {self.fetcher.archive.records_written}")
+        logger.info(f"  Time elapsed:     {elapsed:.1f}s")
+        logger.info(f"  Output dir:       {self.output_dir}")
+        logger.info("=" * 60)
+
+        self.writer.close()
+        self.downloader.close()
+        self.fetcher.close()
+        self.frontier.close()
+        return summary
+
+    def _pipeline_stats(self) -> dict:
+        """Per-stage timing for the crawl summary (sequential engine has none)."""
+        return {}
+
     def _handle_direct_pdf(self, item: dict, fetch_result):
-        """Handle a URL that directly returned a PDF (not linked from HTML)."""
-        domain = urlparse(item["url"]).hostname or ""
-        # Use raw bytes from fetch
-        if fetch_result.raw_bytes:
-            # Write bytes and register
-            import hashlib
-            from pathlib import Path
-            content_hash = hashlib.sha256(fetch_result.raw_bytes).hexdigest()[:16]
-            pdfs_dir = Path(self.output_dir) / "pdfs" / domain
-            pdfs_dir.mkdir(parents=True, exist_ok=True)
-            file_path = pdfs_dir / f"{content_hash}.pdf"
-            file_path.write_bytes(fetch_result.raw_bytes)
-            logger.info(f"Direct PDF: {item['url']} → {file_path}")
\ No newline at end of file
+        """
+        Handle a URL that directly returned a PDF (not linked from HTML).
+        The fetch only read its headers; AssetDownloader streams the body to
+        disk and the PDF is registered in pdf_index.json like a linked one.
+        """
+        url = item["url"]
+        domain = urlparse(url).hostname or ""
+        pdf = {"url": url, "link_text": item.get("anchor_text", "")}
+        source_page = item.get("parent_url") or url
+
+        if self.asset_pool is not None:
+            self.asset_pool.submit(
+                "pdf", url, domain,
+                lambda result: self.writer.record_pdf(source_page, pdf, result.to_dict()),
+            )
+            return
+
+        result = self.downloader.download_pdf(url, domain)
+        self.writer.record_pdf(source_page, pdf, result.to_dict())
+        if result.success:
+            logger.info(f"Direct PDF: {url} → {result.file_path}")
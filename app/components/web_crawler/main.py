@@ -8,6 +8,13 @@ Usage:
     python main.py --config config/crawl_config.json
     python main.py --url https://example.gov.in --dry-run
     python main.py --url https://example.gov.in --depth 2 --output ./my_output
+    python main.py --url https://example.gov.in --concurrency 8
+    python main.py --url https://example.gov.in --frontier sqlite
+    python main.py --url https://example.gov.in --sitemaps
+    python main.py --url https://example.gov.in --recrawl
+    python main.py --url https://example.gov.in --dedup drop
+    python main.py --url https://example.gov.in --archive
+    python main.py reparse --output ./output
 """
 
 import os
@@ -55,11 +62,63 @@ DEFAULT_CONFIG = {
         "max_pages_per_domain": 200,
         "delay_between_requests_sec": 1.5,
         "request_timeout_sec": 20,
+        "max_html_size_mb": 10,      # stop reading a page past this (PDF / image caps: assets)
         "max_retries": 3,
         "concurrent_requests": 1,
         "respect_robots_txt": True,
         "user_agent": "RAGBot/1.0 @cdac",
     },
+    "pipeline": {
+        # worker pool + bounded queue per stage (async engine only)
+        "parse_workers": 2,
+        "parse_processes": 0,        # > 0 → parse in a process pool of this size
+        "asset_workers": 4,
+        "write_workers": 1,
+        "parse_queue_size": 20,
+        "asset_queue_size": 20,
+        "write_queue_size": 50,
+    },
+    "robots": {
+        # used when crawl.respect_robots_txt is true
+        "cache_ttl_sec": 86400,      # re-fetch robots.txt after this
+        "negative_ttl_sec": 3600,    # 4xx (no robots.txt) → allow all, re-check after this
+        "error_ttl_sec": 300,        # 5xx / unreachable → hold the host's URLs, re-check after this
+        "max_crawl_delay_sec": 30,   # cap on a site's Crawl-delay
+        "timeout_sec": 10,
+    },
+    "recrawl": {
+        # re-fetch already-crawled pages with If-None-Match / If-Modified-Since;
+        # 304 → keep the stored page JSON, skip parse / assets / write
+        "enabled": False,
+    },
+    "dedup": {
+        # MinHash-LSH near-duplicate detection on body text (print views, query variants, ...)
+        # opt-in: a duplicate is flagged and then skipped by the chunker
+        "enabled": False,
+        "action": "flag",            # flag → write with duplicate_of, skipped by the chunker
+                                     # drop → index entry only, no page JSON / assets
+        "threshold": 0.9,            # estimated Jaccard similarity of word shingles
+        "num_perm": 128,             # MinHash values per page (4 B each)
+        "bands": 16,                 # LSH bands; num_perm / bands rows per band
+        "shingle_size": 3,           # words per shingle
+        "min_words": 50,             # shorter pages are never treated as duplicates
+    },
+    "sitemaps": {
+        "enabled": False,            # seed the frontier from sitemap.xml / sitemap indexes
+        "discover_from_robots": True,  # use robots.txt Sitemap: lines when present
+        "paths": ["/sitemap.xml"],   # fallback locations on each seed origin
+        "max_sitemaps": 50,
+        "max_urls": 50000,
+    },
+    "frontier": {
+        "backend": "memory",         # memory | sqlite (disk-backed, resumable)
+        "db_path": "",               # sqlite file; default <output.base_dir>/frontier.db
+        "hot_buffer_size": 1000,     # queued rows held in memory
+        "resume": True,              # False → discard a saved frontier and start over
+        "visited_set": "exact",      # memory backend: exact | hashed (8 B/URL hash) | bloom
+        "expected_urls": 100000,     # initial size of hashed / bloom sets
+        "bloom_error_rate": 0.0001,  # bloom only: chance a new URL is wrongly skipped
+    },
     "scope": {
         "internal_only": True,
         "allow_subdomains": True,
@@ -80,10 +139,20 @@ DEFAULT_CONFIG = {
         "min_image_size_bytes": 5120,
         "max_image_size_mb": 20,
         "max_pdf_size_mb": 100,
+        "download_workers": 4,       # background asset downloads (0 = inline, before the page write)
+        "per_host_connections": 2,   # asset downloads in flight per host
+        "per_host_delay_sec": 0.0,   # gap between asset download starts on one host
+        "head_preflight": False,     # True → HEAD before each asset GET (old behaviour)
+        "resume_attempts": 3,        # Range-request retries when an asset transfer breaks off
+        "image_pixel_stats": True,   # classify photos vs flat graphics from a reduced-size decode
+        "image_processes": 0,        # > 0 → classify images in a process pool of this size
+        "url_cache": True,           # reuse results by asset URL (metadata/asset_cache.json)
+        "url_cache_ttl_hours": 168,  # re-download cached URLs after this (0 = never)
         "image_extensions": [".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"],
         "pdf_extensions": [".pdf"],
     },
     "extraction": {
+        "parser_engine": "html.parser",   # html.parser | lxml
         "use_trafilatura": True,
         "preserve_heading_hierarchy": True,
         "extract_tables": True,
@@ -100,6 +169,21 @@ DEFAULT_CONFIG = {
     "output": {
         "base_dir": "./output",
         "pretty_json": True,
+        "index_snapshots": True,     # write crawl/image/pdf_index.json at the end (the .jsonl logs are always kept)
+        "index_compact_ratio": 2.0,  # rewrite an index log once it has this many lines per live record
+        "page_store": "files",       # files (one JSON per page) | shards (compressed, pages/shards/)
+        "page_codec": "gzip",        # shards only: gzip | zstd (pip install zstandard)
+        "shard_size_mb": 64,         # start a new shard past this size
+        "shard_block_records": 64,   # pages per compressed block (random access reads one block)
+        "write_behind": True,        # files only: page JSONs written by a background thread
+        "write_queue_size": 256,     # pages queued before write_page blocks
+        "write_batch_size": 32,      # pages per write batch (one directory fsync per batch)
+        "fsync": True,               # fsync page files before they are renamed into place
+    },
+    "archive": {
+        "enabled": False,            # keep raw HTML responses (WARC) for `main.py reparse`
+        "dir": None,                 # None → <output.base_dir>/archive
+        "max_file_mb": 512,          # start a new .warc.gz past this size
     },
     "logging": {
         "level": "INFO",
@@ -137,6 +221,7 @@ def dry_run(config: dict, seed_urls: list):
     from crawler.url_frontier import URLFrontier
     from crawler.page_fetcher import PageFetcher
     from crawler.page_parser import PageParser
+    from crawler.robots_cache import RobotsCache
 
     logger = logging.getLogger("dry_run")
     logger.info("=== DRY RUN MODE — No files will be saved ===")
@@ -146,9 +231,9 @@ def dry_run(config: dict, seed_urls: list):
     config["assets"]["download_pdfs"] = False
     config["crawl"]["max_pages"] = min(config["crawl"]["max_pages"], 50)
 
-    frontier = URLFrontier(config)
-    frontier.add_seeds(seed_urls)
     fetcher = PageFetcher(config)
+    frontier = URLFrontier(config, robots=RobotsCache(config, session=fetcher._session))
+    frontier.add_seeds(seed_urls)
     parser = PageParser(config)
 
     discovered_urls = []
@@ -159,6 +244,9 @@ def dry_run(config: dict, seed_urls: list):
             if not item:
                 break
             url = item["url"]
+            # robots.txt (blocked → skipped; host's robots.txt unavailable → requeued)
+            if not frontier.settle_robots(item, frontier.robots_verdict(url, fetch=True)):
+                continue
             logger.info(f"[depth={item['depth']}] {url}")
             result = fetcher.fetch(url)
             if result.success and result.is_html:
@@ -193,8 +281,18 @@ Examples:
   python main.py --config config/crawl_config.json
   python main.py --url https://example.gov.in --dry-run
   python main.py --url https://example.gov.in --no-images --no-pdfs
+  python main.py --url https://example.gov.in --concurrency 8
+  python main.py --url https://example.gov.in --frontier sqlite     # resumable
+  python main.py --url https://example.gov.in --frontier sqlite --fresh
+  python main.py --url https://example.gov.in --sitemaps   # seed from sitemap.xml
+  python main.py --url https://example.gov.in --recrawl    # refresh an existing output dir
+  python main.py --url https://example.gov.in --dedup drop  # don't store near-duplicate pages
+  python main.py --url https://example.gov.in --archive    # keep raw responses for reparse
+  python main.py reparse --output ./output --processes 8  # rebuild pages/ from the archive
         """
     )
+    parser.add_argument("mode", nargs="?", choices=["crawl", "reparse"], default="crawl",
+                        help="crawl (default) or reparse: rebuild page JSONs from the response archive")
     parser.add_argument("--url", type=str, help="Seed URL to start crawling")
     parser.add_argument("--urls", nargs="+", help="Multiple seed URLs")
     parser.add_argument("--config", type=str, default="config/crawl_config.json",
@@ -203,6 +301,22 @@ Examples:
     parser.add_argument("--max-pages", type=int, help="Max pages to crawl (overrides config)")
     parser.add_argument("--output", type=str, help="Output directory (overrides config)")
     parser.add_argument("--delay", type=float, help="Delay between requests in seconds")
+    parser.add_argument("--concurrency", type=int,
+                        help="Pages fetched at once (overrides crawl.concurrent_requests)")
+    parser.add_argument("--recrawl", action="store_true",
+                        help="Refresh crawled pages with conditional GETs (recrawl.enabled)")
+    parser.add_argument("--sitemaps", action="store_true",
+                        help="Seed the frontier from the sites' sitemaps (sitemaps.enabled)")
+    parser.add_argument("--dedup", choices=["off", "flag", "drop"],
+                        help="Near-duplicate pages: off (default), flag or drop (overrides dedup)")
+    parser.add_argument("--frontier", choices=["memory", "sqlite"],
+                        help="URL frontier backend (overrides frontier.backend)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Ignore a saved sqlite frontier and start a new crawl")
+    parser.add_argument("--archive", action="store_true",
+                        help="Archive raw HTML responses for reparse (archive.enabled)")
+    parser.add_argument("--processes", type=int,
+                        help="reparse: parse processes (default: all cores)")
     parser.add_argument("--no-images", action="store_true", help="Skip image downloads")
     parser.add_argument("--no-pdfs", action="store_true", help="Skip PDF downloads")
     parser.add_argument("--allow-external", action="store_true",
@@ -233,12 +347,37 @@ def main():
         config["output"]["base_dir"] = args.output
     if args.delay is not None:
         config["crawl"]["delay_between_requests_sec"] = args.delay
+    if args.concurrency is not None:
+        config["crawl"]["concurrent_requests"] = args.concurrency
+    if args.recrawl:
+        config["recrawl"]["enabled"] = True
+    if args.sitemaps:
+        config["sitemaps"]["enabled"] = True
+    if args.dedup:
+        config["dedup"]["enabled"] = args.dedup != "off"
+        if args.dedup != "off":
+            config["dedup"]["action"] = args.dedup
+    if args.frontier:
+        config["frontier"]["backend"] = args.frontier
+    if args.fresh:
+        config["frontier"]["resume"] = False
     if args.no_images:
         config["assets"]["download_images"] = False
     if args.no_pdfs:
         config["assets"]["download_pdfs"] = False
     if args.allow_external:
         config["scope"]["internal_only"] = False
+    if args.archive:
+        config["archive"]["enabled"] = True
+
+    if args.mode == "reparse":
+        setup_logging(
+            level=args.log_level or config.get("logging", {}).get("level", "INFO"),
+            log_file=config.get("logging", {}).get("log_file"),
+        )
+        from app.components.web_crawler.reparse import Reparser
+        Reparser(config, processes=args.processes).run()
+        return
 
     # Determine seed URLs
     seed_urls = []
@@ -265,6 +404,10 @@ def main():
     # Run
     if args.dry_run:
         dry_run(config, seed_urls)
+    elif config["crawl"].get("concurrent_requests", 1) > 1:
+        from app.components.web_crawler.async_crawler_engine import AsyncCrawlOrchestrator
+        orchestrator = AsyncCrawlOrchestrator(config)
+        orchestrator.run(seed_urls)
     else:
         from app.components.web_crawler.crawler_engine import CrawlOrchestrator
         orchestrator = CrawlOrchestrator(config)
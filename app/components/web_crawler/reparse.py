@@ -0,0 +1,243 @@
+"""
+reparse.py
+----------
+Rebuild pages/ from the raw-response archive — no network.
+
+    python main.py reparse --output ./output [--processes 8]
+
+Needs a crawl run with archive.enabled (storage/response_archive.py).
+
+Flow:
+1. Read archive/index.jsonl (newest capture per URL), in archive order
+2. Decompress + decode each body (same charset rules as PageFetcher)
+3. Parse in a ParserPool (PageParser in worker processes); a bounded
+   window of pages is in flight so memory stays flat
+4. Near-duplicate check again on the new body text (dedup.enabled)
+5. Write the page JSON through MetadataWriter, as a crawl would
+
+- depth / parent / url_hash come from the crawl index, anchor text from
+  the stored page; archived URLs missing from the crawl index are skipped
+- Images / PDFs are not downloaded: results come from the asset URL cache
+  (expiry ignored), assets not in it are recorded as not downloaded
+- crawled_at, timing and redirects are those of the archived fetch
+"""
+
+import os
+import copy
+import time
+import logging
+from collections import deque
+from pathlib import Path
+
+from requests.structures import CaseInsensitiveDict
+
+from app.components.web_crawler.crawler.content_dedup import ContentDedupIndex
+from app.components.web_crawler.crawler.page_fetcher import FetchResult, decode_body
+from app.components.web_crawler.crawler.page_parser import ParserPool
+from app.components.web_crawler.crawler.asset_downloader import AssetDownloader, DownloadedAsset
+from app.components.web_crawler.storage.metadata_writer import MetadataWriter
+from app.components.web_crawler.storage.response_archive import (
+    archive_dir, load_archive_index, read_response,
+)
+
+logger = logging.getLogger(__name__)
+
+WINDOW_PER_PROCESS = 4      # pages in flight per parse process
+
+
+class Reparser:
+    """
+    Regenerates page records for every archived response.
+    processes: parse worker processes (default: pipeline.parse_processes, else all cores)
+    """
+
+    def __init__(self, config: dict, processes: int = None):
+        self.config = config
+        self.output_dir = config.get("output", {}).get("base_dir", "./output")
+        self.archive_dir = archive_dir(config)
+        self.processes = max(1, processes
+                             or config.get("pipeline", {}).get("parse_processes", 0)
+                             or os.cpu_count() or 1)
+        self.log_every = config.get("logging", {}).get("progress_every_n_pages", 10)
+
+        self.writer = MetadataWriter(config, self.output_dir)
+
+        # the URL cache is only read: every entry counts, however old
+        assets_config = copy.deepcopy(config)
+        assets_config["assets"].update({"url_cache_ttl_hours": 0, "image_processes": 0})
+        self.downloader = AssetDownloader(assets_config, session=None, output_dir=self.output_dir)
+        if not self.downloader.use_url_cache:
+            logger.warning("assets.url_cache is off — reparsed pages list no downloaded assets")
+        self._crawl_images = config.get("assets", {}).get("download_images", True)
+        self._crawl_pdfs = config.get("assets", {}).get("download_pdfs", True)
+
+        # fresh index: duplicates are decided again from the new body text
+        dedup_cfg = config.get("dedup", {})
+        self.dedup = ContentDedupIndex(config) if dedup_cfg.get("enabled", False) else None
+        self._drop_duplicates = dedup_cfg.get("action", "flag") == "drop"
+
+        # stats
+        self.pages_written = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.errors = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # Main loop
+    # ──────────────────────────────────────────────────────────────
+
+    def run(self) -> dict:
+        index = load_archive_index(self.archive_dir)
+        if not index:
+            logger.error(f"No archived responses in {self.archive_dir} "
+                         f"(crawl with archive.enabled first)")
+            return {}
+
+        entries = sorted(index.items(), key=lambda kv: (kv[1]["file"], kv[1]["offset"]))
+        logger.info(f"Reparsing {len(entries)} archived pages with {self.processes} processes")
+        start_time = time.time()
+        window = self.processes * WINDOW_PER_PROCESS
+        in_flight: deque = deque()     # (queue_item, fetch_result, future), archive order
+
+        pool = ParserPool(self.config, self.processes)
+        try:
+            for url, entry in entries:
+                queued = self._load(url, entry)
+                if queued is None:
+                    continue
+                item, fetch_result = queued
+                in_flight.append((item, fetch_result, pool.submit(fetch_result.html, url, fetch_result.final_url)))
+                if len(in_flight) >= window:
+                    self._write(*in_flight.popleft(), start_time)
+            while in_flight:
+                self._write(*in_flight.popleft(), start_time)
+        except KeyboardInterrupt:
+            logger.info("Reparse interrupted by user")
+        finally:
+            pool.close()
+            summary = self._finish(start_time)
+        return summary
+
+    # ──────────────────────────────────────────────────────────────
+    # Steps
+    # ──────────────────────────────────────────────────────────────
+
+    def _load(self, url: str, entry: dict):
+        """Archived response → (queue_item, FetchResult), None if it can't be used."""
+        crawl_entry = self.writer.crawl_entry(url)
+        if crawl_entry is None:
+            logger.debug(f"Not in crawl index, skipping: {url}")
+            self.skipped += 1
+            return None
+        try:
+            headers, body = read_response(self.archive_dir, entry)
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning(f"Unreadable archive record for {url}: {e}")
+            self.errors += 1
+            return None
+
+        item = {
+            "url": url,
+            "url_hash": crawl_entry["url_hash"],
+            "depth": crawl_entry.get("depth", 0),
+            "parent_url": crawl_entry.get("parent_url"),
+            "anchor_text": self.writer.stored_page(url).get("anchor_text_from_parent", ""),
+        }
+
+        result = FetchResult()
+        result.url = url
+        result.final_url = entry.get("final_url") or url
+        result.status_code = entry.get("status_code", 200)
+        result.headers = headers
+        result.content_type = CaseInsensitiveDict(headers).get("Content-Type", "").lower()
+        result.is_html = True
+        result.redirect_chain = entry.get("redirect_chain", [])
+        result.redirected = bool(result.redirect_chain)
+        result.response_time_ms = entry.get("response_time_ms", 0)
+        result.fetched_at = entry.get("fetched_at", "")
+        result.html = decode_body(body, headers)
+        return item, result
+
+    def _write(self, item: dict, fetch_result, future, start_time: float):
+        url = item["url"]
+        try:
+            parsed = future.result()
+        except Exception as e:
+            logger.warning(f"Parse failed for {url}: {e}")
+            self.errors += 1
+            return
+
+        dedup = self._check_duplicate(url, parsed)
+        if dedup and self._drop_duplicates:
+            self.writer.write_duplicate(item, fetch_result, parsed, dedup)
+            self.duplicates += 1
+            return
+        if dedup:
+            self.duplicates += 1
+
+        image_assets, pdf_assets = self._cached_assets(parsed)
+        self.writer.write_page(
+            queue_item=item,
+            fetch_result=fetch_result,
+            parsed_page=parsed,
+            image_assets=image_assets,
+            pdf_assets=pdf_assets,
+            dedup=dedup,
+        )
+        self.pages_written += 1
+        if self.pages_written % self.log_every == 0:
+            elapsed = time.time() - start_time
+            logger.info(f"Reparsed {self.pages_written} pages | {self.pages_written / max(elapsed, 1e-6):.1f} pages/s")
+
+    def _check_duplicate(self, url: str, parsed) -> dict:
+        if self.dedup is None:
+            return {}
+        match = self.dedup.match_or_add(url, self.dedup.signature(parsed.body_text))
+        if not match:
+            return {}
+        return {"duplicate_of": match["url"], "similarity": match["similarity"]}
+
+    def _cached_assets(self, parsed) -> tuple[list, list]:
+        """Page images / PDFs with their download results from the URL cache."""
+        image_assets = [
+            {**img, "download_result": self._cached(img["url"])}
+            for img in parsed.images if img.get("url")
+        ] if self._crawl_images else []
+        pdf_assets = [
+            {**pdf, "download_result": self._cached(pdf["url"])}
+            for pdf in parsed.pdfs if pdf.get("url")
+        ] if self._crawl_pdfs else []
+        return image_assets, pdf_assets
+
+    def _cached(self, url: str) -> dict:
+        result = self.downloader.cached(url)
+        if result is None:
+            result = DownloadedAsset()
+            result.url = url
+            result.error = "Not in asset cache (reparse does not download)"
+        return result.to_dict()
+
+    def _finish(self, start_time: float) -> dict:
+        self.writer.flush_indexes(final=True)
+        self.writer.close()
+        if self.dedup is not None:
+            self.dedup.save(Path(self.output_dir) / "metadata" / "dedup_index.jsonl")
+
+        summary = {
+            "pages_reparsed": self.pages_written,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "elapsed_sec": round(time.time() - start_time, 1),
+        }
+        logger.info("=" * 60)
+        logger.info("REPARSE COMPLETE")
+        logger.info(f"  Pages reparsed:   {summary['pages_reparsed']}")
+        if self.dedup is not None:
+            logger.info(f"  Near-duplicates:  {summary['duplicates']}")
+        logger.info(f"  Not in index:     {summary['skipped']}")
+        logger.info(f"  Errors:           {summary['errors']}")
+        logger.info(f"  Asset cache hits: {self.downloader.cache_hits}")
+        logger.info(f"  Time elapsed:     {summary['elapsed_sec']}s")
+        logger.info("=" * 60)
+        return summary
@@ -0,0 +1,92 @@
+"""
+index_log.py
+------------
+Append-only, log-structured storage for the crawl / image / PDF indexes.
+
+- One JSON line per record version: {"k": key, "v": record}
+- A flush appends only the records changed since the last flush, so its
+  cost is O(new records) instead of rewriting the whole index
+- Loading replays the log; the last line for a key wins. A torn last
+  line (crash mid-append) is cut off so later appends start clean
+- When the log holds more than compact_ratio × live keys, it is
+  rewritten with one line per key (temp file + rename)
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class IndexLog:
+    """
+    JSONL log behind one in-memory index dict.
+    The owner keeps the dict and tells append() which records changed.
+    """
+
+    def __init__(self, path: Path, compact_ratio: float = 2.0):
+        self.path = Path(path)
+        self.compact_ratio = compact_ratio
+        self._lines = 0              # record lines currently in the file
+
+    # ──────────────────────────────────────────────────────────────
+    # Public interface
+    # ──────────────────────────────────────────────────────────────
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self, repair: bool = True) -> dict:
+        """
+        Replay the log → {key: latest record}.
+        repair: cut off a torn last line (False for read-only readers).
+        """
+        index: dict = {}
+        self._lines = 0
+        if not self.path.exists():
+            return index
+        good_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break                    # torn append
+                good_end += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"{self.path.name}: skipping unreadable line at byte {good_end - len(line)}")
+                    continue
+                index[entry["k"]] = entry["v"]
+                self._lines += 1
+        if repair and good_end < self.path.stat().st_size:
+            logger.warning(f"{self.path.name}: dropping torn last line")
+            os.truncate(self.path, good_end)
+        return index
+
+    def append(self, records: dict):
+        """Append the given {key: record} versions."""
+        if not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(
+                json.dumps({"k": key, "v": record}, ensure_ascii=False) + "\n"
+                for key, record in records.items()
+            ))
+        self._lines += len(records)
+
+    def needs_compaction(self, live: int) -> bool:
+        return self._lines > max(live, 1) * self.compact_ratio
+
+    def compact(self, index: dict):
+        """Rewrite the log as one line per live key."""
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for key, record in index.items():
+                f.write(json.dumps({"k": key, "v": record}, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+        self._lines = len(index)
@@ -5,10 +5,22 @@ Saves all crawl data to disk as structured JSON.
 
 Outputs:
 - output/pages/{domain}/{url_hash}.json     — Full page record
+  (or output/pages/shards/*.jsonl.gz with output.page_store = "shards",
+  see storage/page_store.py)
 - output/metadata/crawl_index.json          — Master URL → hash index
 - output/metadata/image_index.json          — All images with metadata
 - output/metadata/pdf_index.json            — All PDFs with metadata
+- output/metadata/*_index.jsonl             — Append-only logs behind the three
+                                              indexes (what a resume loads)
 - output/crawl_state.json                   — Resumable state (visited URLs, queue)
+
+Periodic flushes append only the index records changed since the last
+flush (storage/index_log.py); the *_index.json files are written once
+when the crawl finishes (output.index_snapshots).
+
+Page JSON files are handed to a background writer thread
+(storage/write_behind.py, output.write_behind) and land via temp file +
+rename; flush_indexes waits for them before the indexes are appended.
 """
 
 import os
@@ -16,10 +28,17 @@ import json
 import time
 import logging
 import hashlib
+import threading
 from pathlib import Path
+from typing import Optional
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
+from app.components.web_crawler.crawler.url_frontier import url_hash
+from app.components.web_crawler.storage.index_log import IndexLog
+from app.components.web_crawler.storage.page_store import PageStore, load_page
+from app.components.web_crawler.storage.write_behind import WriteBehind
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,10 +46,22 @@ def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _parse_timestamp(value: str):
+    """ISO-8601 string → aware datetime (None if missing / unparseable)."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
 def _json_dump(data: dict, path: Path, pretty: bool = True):
+    """Write JSON via a temp file + rename (readers never see a half-written file)."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2 if pretty else None)
+    os.replace(tmp, path)
 
 
 def _json_load(path: Path) -> dict:
@@ -48,7 +79,9 @@ class MetadataWriter:
 
     def __init__(self, config: dict, output_dir: str):
         self.config = config
-        self.pretty = config.get("output", {}).get("pretty_json", True)
+        output_cfg = config.get("output", {})
+        self.pretty = output_cfg.get("pretty_json", True)
+        self.write_snapshots = output_cfg.get("index_snapshots", True)
         self.base = Path(output_dir)
 
         # Directory structure
@@ -58,16 +91,34 @@ class MetadataWriter:
         self.pages_dir.mkdir(parents=True, exist_ok=True)
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
 
+        # "files": pages/{domain}/{url_hash}.json; "shards": storage/page_store.py
+        self.page_store = (PageStore(self.pages_dir, config)
+                           if output_cfg.get("page_store", "files") == "shards" else None)
+        # "files" + write_behind: page JSONs are written by a background thread
+        self._page_writer = (WriteBehind(config)
+                             if self.page_store is None and output_cfg.get("write_behind", True) else None)
+
         # In-memory indexes (flushed to disk periodically)
         self._crawl_index: dict = {}     # url → {hash, status, timestamp}
         self._image_index: dict = {}     # image_url → image_record
         self._pdf_index: dict = {}       # pdf_url → pdf_record
+        self._lock = threading.Lock()    # indexes are filled from download / write threads
+
+        # Append-only logs behind the indexes; keys changed since the last flush
+        compact_ratio = output_cfg.get("index_compact_ratio", 2.0)
+        self._logs = {
+            name: IndexLog(self.metadata_dir / f"{name}_index.jsonl", compact_ratio)
+            for name in ("crawl", "image", "pdf")
+        }
+        self._dirty = {name: set() for name in self._logs}
 
         # Crawl session metadata
         self._session_id = hashlib.md5(str(time.time()).encode()).hexdigest()[:8]
         self._start_time = _utc_now()
         self._page_count = 0
         self._error_count = 0
+        self._not_modified_count = 0
+        self._duplicate_count = 0
 
         # Load existing indexes if resuming
         self._load_indexes()
@@ -83,9 +134,11 @@ class MetadataWriter:
         parsed_page,
         image_assets: list,
         pdf_assets: list,
+        dedup: dict = None,
     ) -> str:
         """
         Build and save the full page JSON record.
+        dedup: {"duplicate_of", "similarity"} if the page is a near-duplicate.
         Returns the file path.
         """
         url = queue_item["url"]
@@ -99,15 +152,24 @@ class MetadataWriter:
             image_assets=image_assets,
             pdf_assets=pdf_assets,
         )
-
-        # Save page JSON
-        domain_dir = self.pages_dir / self._sanitize(domain)
-        domain_dir.mkdir(parents=True, exist_ok=True)
-        page_path = domain_dir / f"{url_hash}.json"
-        _json_dump(page_record, page_path, self.pretty)
+        if dedup:
+            page_record.update(self._duplicate_fields(dedup))
+            page_record["rag_status"]["duplicate"] = True
+
+        # Save page JSON (own file, or buffered into a compressed shard)
+        if self.page_store is not None:
+            page_path = self.page_store.add(url_hash, page_record)
+        elif self._page_writer is not None:
+            page_path = self.pages_dir / self._sanitize(domain) / f"{url_hash}.json"
+            self._page_writer.submit(page_path, page_record)
+        else:
+            domain_dir = self.pages_dir / self._sanitize(domain)
+            domain_dir.mkdir(parents=True, exist_ok=True)
+            page_path = domain_dir / f"{url_hash}.json"
+            _json_dump(page_record, page_path, self.pretty)
 
         # Update crawl index
-        self._crawl_index[url] = {
+        entry = {
             "url_hash": url_hash,
             "depth": queue_item["depth"],
             "parent_url": queue_item.get("parent_url"),
@@ -118,68 +180,167 @@ class MetadataWriter:
             "text_length": parsed_page.body_text_length if parsed_page else 0,
             "image_count": len(image_assets),
             "pdf_count": len(pdf_assets),
+            **fetch_result.validators(),
         }
+        if dedup:
+            entry["duplicate_of"] = dedup["duplicate_of"]
+        self._set_crawl_entry(url, entry)
 
-        # Update image index
+        # Update image / PDF indexes (background downloads report later via record_*)
         for img in image_assets:
-            if img.get("download_result", {}).get("success"):
-                self._image_index[img["url"]] = {
-                    "url": img["url"],
-                    "source_page": url,
-                    "source_domain": domain,
-                    "file_path": img["download_result"].get("file_path", ""),
-                    "content_hash": img["download_result"].get("content_hash", ""),
-                    "file_size_bytes": img["download_result"].get("file_size_bytes", 0),
-                    "width": img["download_result"].get("width", 0),
-                    "height": img["download_result"].get("height", 0),
-                    "image_type": img["download_result"].get("image_type", ""),
-                    "alt": img.get("alt", ""),
-                    "caption": img.get("caption", ""),
-                    "nearest_heading": img.get("nearest_heading", ""),
-                    "context_text": img.get("context_text", ""),
-                    "crawled_at": _utc_now(),
-                    # Processing status for RAG pipeline
-                    "ocr_done": False,
-                    "vision_done": False,
-                    "embedded": False,
-                }
-
-        # Update PDF index
+            self.record_image(url, img, img.get("download_result", {}))
         for pdf in pdf_assets:
-            if pdf.get("download_result", {}).get("success"):
-                self._pdf_index[pdf["url"]] = {
-                    "url": pdf["url"],
-                    "source_page": url,
-                    "source_domain": domain,
-                    "file_path": pdf["download_result"].get("file_path", ""),
-                    "content_hash": pdf["download_result"].get("content_hash", ""),
-                    "file_size_bytes": pdf["download_result"].get("file_size_bytes", 0),
-                    "pdf_page_count": pdf["download_result"].get("pdf_page_count", 0),
-                    "link_text": pdf.get("link_text", ""),
-                    "nearest_heading": pdf.get("nearest_heading", ""),
-                    "context_text": pdf.get("context_text", ""),
-                    "crawled_at": _utc_now(),
-                    # Processing status for RAG pipeline
-                    "parsed": False,
-                    "ocr_done": False,
-                    "embedded": False,
-                }
-
-        self._page_count += 1
+            self.record_pdf(url, pdf, pdf.get("download_result", {}))
+
+        # counters too are updated from worker threads (async engine, asset pool)
+        with self._lock:
+            self._page_count += 1
+            if dedup:
+                self._duplicate_count += 1
         return str(page_path)
 
+    def record_image(self, page_url: str, img: dict, download_result: dict):
+        """Add a downloaded image to the image index (called from download threads too)."""
+        domain = urlparse(page_url).hostname or "unknown"
+        if not download_result.get("success"):
+            return
+        with self._lock:
+            self._image_index[img["url"]] = {
+                "url": img["url"],
+                "source_page": page_url,
+                "source_domain": domain,
+                "file_path": download_result.get("file_path", ""),
+                "content_hash": download_result.get("content_hash", ""),
+                "file_size_bytes": download_result.get("file_size_bytes", 0),
+                "width": download_result.get("width", 0),
+                "height": download_result.get("height", 0),
+                "image_type": download_result.get("image_type", ""),
+                "alt": img.get("alt", ""),
+                "caption": img.get("caption", ""),
+                "nearest_heading": img.get("nearest_heading", ""),
+                "context_text": img.get("context_text", ""),
+                "crawled_at": _utc_now(),
+                # Processing status for RAG pipeline
+                "ocr_done": False,
+                "vision_done": False,
+                "embedded": False,
+            }
+            self._dirty["image"].add(img["url"])
+
+    def record_pdf(self, page_url: str, pdf: dict, download_result: dict):
+        """Add a downloaded PDF to the PDF index (called from download threads too)."""
+        domain = urlparse(page_url).hostname or "unknown"
+        if not download_result.get("success"):
+            return
+        with self._lock:
+            self._pdf_index[pdf["url"]] = {
+                "url": pdf["url"],
+                "source_page": page_url,
+                "source_domain": domain,
+                "file_path": download_result.get("file_path", ""),
+                "content_hash": download_result.get("content_hash", ""),
+                "file_size_bytes": download_result.get("file_size_bytes", 0),
+                "pdf_page_count": download_result.get("pdf_page_count", 0),
+                "title": download_result.get("pdf_title"),
+                "author": download_result.get("pdf_author"),
+                "encrypted": download_result.get("pdf_encrypted", False),
+                "link_text": pdf.get("link_text", ""),
+                "nearest_heading": pdf.get("nearest_heading", ""),
+                "context_text": pdf.get("context_text", ""),
+                "crawled_at": _utc_now(),
+                # Processing status for RAG pipeline
+                "parsed": False,
+                "ocr_done": False,
+                "embedded": False,
+            }
+            self._dirty["pdf"].add(pdf["url"])
+
     def write_error(self, queue_item: dict, fetch_result):
         """Record a failed fetch."""
         url = queue_item["url"]
-        self._crawl_index[url] = {
+        self._set_crawl_entry(url, {
             "url_hash": queue_item["url_hash"],
             "depth": queue_item["depth"],
             "parent_url": queue_item.get("parent_url"),
             "status_code": fetch_result.status_code,
             "error": fetch_result.error,
             "crawled_at": _utc_now(),
-        }
-        self._error_count += 1
+        })
+        with self._lock:
+            self._error_count += 1
+
+    def write_duplicate(self, queue_item: dict, fetch_result, parsed_page, dedup: dict):
+        """Record a dropped near-duplicate: crawl-index entry only, no page JSON."""
+        self._set_crawl_entry(queue_item["url"], {
+            "url_hash": queue_item["url_hash"],
+            "depth": queue_item["depth"],
+            "parent_url": queue_item.get("parent_url"),
+            "status_code": fetch_result.status_code,
+            "crawled_at": _utc_now(),
+            "title": parsed_page.title if parsed_page else "",
+            "text_length": parsed_page.body_text_length if parsed_page else 0,
+            **self._duplicate_fields(dedup),
+        })
+        with self._lock:
+            self._duplicate_count += 1
+
+    def write_not_modified(self, queue_item: dict, fetch_result):
+        """Record a 304 on recrawl: the stored page JSON stays as it is."""
+        url = queue_item["url"]
+        with self._lock:
+            entry = self._crawl_index.get(url)
+            if entry is None:
+                return
+            entry["checked_at"] = fetch_result.fetched_at or _utc_now()
+            # servers may rotate validators on a 304
+            for key, value in fetch_result.validators().items():
+                if value:
+                    entry[key] = value
+            self._dirty["crawl"].add(url)
+            self._not_modified_count += 1
+
+    def _set_crawl_entry(self, url: str, entry: dict):
+        with self._lock:
+            self._crawl_index[url] = entry
+            self._dirty["crawl"].add(url)
+
+    def get_validators(self, url: str) -> Optional[dict]:
+        """Stored ETag / Last-Modified for a previously written page, if any."""
+        entry = self._crawl_index.get(url)
+        if not entry or not entry.get("file_path"):
+            return None
+        validators = {"etag": entry.get("etag"), "last_modified": entry.get("last_modified")}
+        return validators if any(validators.values()) else None
+
+    def crawl_entry(self, url: str) -> Optional[dict]:
+        """Crawl-index entry for a URL, None if it was never crawled."""
+        with self._lock:
+            entry = self._crawl_index.get(url)
+            return dict(entry) if entry else None
+
+    def stored_page(self, url: str) -> dict:
+        """Stored page record for a crawled URL ({} if there is none)."""
+        return self._load_page_record(self._crawl_index.get(url) or {})
+
+    def load_page_links(self, url: str) -> list[dict]:
+        """Links from the stored page JSON — lets a 304 page still feed the frontier."""
+        record = self.stored_page(url)
+        return [
+            {"url": l["url"], "text": l.get("text", "")}
+            for l in record.get("internal_links", []) + record.get("external_links", [])
+        ]
+
+    def _load_page_record(self, entry: dict) -> dict:
+        """Stored page record for a crawl-index entry ({} if there is none)."""
+        if not entry.get("file_path"):
+            return {}
+        if entry["file_path"].endswith(".json"):
+            path = Path(entry["file_path"])
+            queued = self._page_writer.pending(path) if self._page_writer is not None else None
+            return queued if queued is not None else _json_load(path)
+        if self.page_store is not None:
+            return self.page_store.get(entry["url_hash"]) or {}
+        return load_page(self.pages_dir, entry["url_hash"]) or {}
 
     # ──────────────────────────────────────────────────────────────
     # Build page record
@@ -214,7 +375,7 @@ class MetadataWriter:
             "redirect_chain": fetch_result.redirect_chain,
 
             # ── CRAWL META
-            "crawled_at": _utc_now(),
+            "crawled_at": fetch_result.fetched_at or _utc_now(),
             "session_id": self._session_id,
             "response_time_ms": fetch_result.response_time_ms,
             "status_code": fetch_result.status_code,
@@ -270,6 +431,15 @@ class MetadataWriter:
 
         return record
 
+    @staticmethod
+    def _duplicate_fields(dedup: dict) -> dict:
+        """Pointer from a near-duplicate to its canonical page."""
+        return {
+            "duplicate_of": dedup["duplicate_of"],
+            "canonical_doc_id": f"page_{url_hash(dedup['duplicate_of'])}",
+            "duplicate_similarity": dedup.get("similarity", 1.0),
+        }
+
     def _build_image_records(self, image_assets: list) -> list:
         """Build clean image records for storage in page JSON."""
         records = []
@@ -285,6 +455,7 @@ class MetadataWriter:
                 "width_attr": img.get("width", ""),
                 "height_attr": img.get("height", ""),
                 "downloaded": dl.get("success", False),
+                "download_pending": dl.get("pending", False),   # result → image_index.json
                 "file_path": dl.get("file_path", ""),
                 "file_size_bytes": dl.get("file_size_bytes", 0),
                 "content_hash": dl.get("content_hash", ""),
@@ -312,6 +483,7 @@ class MetadataWriter:
                 "nearest_heading": pdf.get("nearest_heading", ""),
                 "context_text": pdf.get("context_text", ""),
                 "downloaded": dl.get("success", False),
+                "download_pending": dl.get("pending", False),   # result → pdf_index.json
                 "file_path": dl.get("file_path", ""),
                 "file_size_bytes": dl.get("file_size_bytes", 0),
                 "content_hash": dl.get("content_hash", ""),
@@ -319,9 +491,11 @@ class MetadataWriter:
                 "skipped": dl.get("skipped", False),
                 "skip_reason": dl.get("skip_reason", ""),
                 "error": dl.get("error"),
+                # From the PDF's Info dict at download time
+                "title": dl.get("pdf_title"),
+                "author": dl.get("pdf_author"),
+                "encrypted": dl.get("pdf_encrypted", False),
                 # Will be filled by Phase 2 (PDF Ingestion)
-                "title": None,
-                "author": None,
                 "parsed": False,
             })
         return records
@@ -330,25 +504,79 @@ class MetadataWriter:
     # Index persistence
     # ──────────────────────────────────────────────────────────────
 
-    def flush_indexes(self):
-        """Write all indexes to disk."""
-        _json_dump(self._crawl_index, self.metadata_dir / "crawl_index.json", self.pretty)
-        _json_dump(self._image_index, self.metadata_dir / "image_index.json", self.pretty)
-        _json_dump(self._pdf_index, self.metadata_dir / "pdf_index.json", self.pretty)
+    def flush_indexes(self, final: bool = False):
+        """
+        Append the index records changed since the last flush to their logs
+        (compacting a log once it is mostly superseded lines).
+        final: also write the crawl_index / image_index / pdf_index JSON files.
+        The page records behind the entries being appended are written
+        first, so the index never lists a page that isn't stored. Pages
+        queued after this call started are not waited for.
+        """
+        indexes = {"crawl": self._crawl_index, "image": self._image_index, "pdf": self._pdf_index}
+        with self._lock:
+            dirty = {name: self._dirty[name] for name in indexes}
+            self._dirty = {name: set() for name in indexes}
+        if self.page_store is not None:
+            self.page_store.flush()
+        if self._page_writer is not None:
+            # every dirty entry's page was submitted before the entry was set
+            self._page_writer.wait_for(self._page_writer.submitted)
+        for name, index in indexes.items():
+            log = self._logs[name]
+            compact = None
+            with self._lock:
+                log.append({key: index[key] for key in dirty[name] if key in index})
+                if log.needs_compaction(len(index)):
+                    compact = dict(index)
+            if compact is not None:
+                log.compact(compact)
+
+        if final and self.write_snapshots:
+            with self._lock:
+                crawl_index = dict(self._crawl_index)
+                image_index, pdf_index = dict(self._image_index), dict(self._pdf_index)
+            _json_dump(crawl_index, self.metadata_dir / "crawl_index.json", self.pretty)
+            _json_dump(image_index, self.metadata_dir / "image_index.json", self.pretty)
+            _json_dump(pdf_index, self.metadata_dir / "pdf_index.json", self.pretty)
 
     def _load_indexes(self):
-        """Load existing indexes for resumable crawl."""
-        self._crawl_index = _json_load(self.metadata_dir / "crawl_index.json")
-        self._image_index = _json_load(self.metadata_dir / "image_index.json")
-        self._pdf_index = _json_load(self.metadata_dir / "pdf_index.json")
+        """
+        Load existing indexes for resumable crawl: replay the JSONL logs, or
+        (output from before the logs) read the JSON files and seed the logs.
+        """
+        indexes = {}
+        for name, log in self._logs.items():
+            if log.exists():
+                indexes[name] = log.load()
+            else:
+                indexes[name] = _json_load(self.metadata_dir / f"{name}_index.json")
+                if indexes[name]:
+                    log.compact(indexes[name])
+        self._crawl_index = indexes["crawl"]
+        self._image_index = indexes["image"]
+        self._pdf_index = indexes["pdf"]
         if self._crawl_index:
             logger.info(f"Resuming crawl — loaded {len(self._crawl_index)} existing URLs from index")
 
-    def is_already_crawled(self, url: str) -> bool:
-        """Check if URL is in the existing crawl index (for resume)."""
-        return url in self._crawl_index
-
-    def write_crawl_summary(self, frontier_stats: dict):
+    def is_already_crawled(self, url: str, lastmod: str = None) -> bool:
+        """
+        Check if URL is in the existing crawl index (for resume).
+        With a sitemap lastmod newer than the last time the page was seen
+        current (crawled_at, or checked_at of a later 304) the page has
+        changed since, so it is not treated as crawled.
+        """
+        entry = self._crawl_index.get(url)
+        if entry is None:
+            return False
+        if lastmod:
+            modified = _parse_timestamp(lastmod)
+            seen = [t for t in map(_parse_timestamp, (entry.get("crawled_at"), entry.get("checked_at"))) if t]
+            if modified and seen and modified > max(seen):
+                return False
+        return True
+
+    def write_crawl_summary(self, frontier_stats: dict, pipeline_stats: dict = None):
         """Write final crawl summary."""
         summary = {
             "session_id": self._session_id,
@@ -356,6 +584,8 @@ class MetadataWriter:
             "end_time": _utc_now(),
             "pages_crawled": self._page_count,
             "errors": self._error_count,
+            "pages_not_modified": self._not_modified_count,
+            "pages_duplicate": self._duplicate_count,
             "total_urls_seen": frontier_stats.get("visited", 0),
             "total_images_downloaded": sum(
                 1 for v in self._image_index.values()
@@ -368,10 +598,19 @@ class MetadataWriter:
             "domain_breakdown": frontier_stats.get("domain_counts", {}),
             "config": self.config,
         }
+        if frontier_stats.get("robots"):
+            summary["robots"] = frontier_stats["robots"]
+        if pipeline_stats:
+            summary["pipeline_stats"] = pipeline_stats
         _json_dump(summary, self.base / "crawl_summary.json", self.pretty)
         logger.info(f"Crawl summary saved: {self._page_count} pages, {self._error_count} errors")
         return summary
 
+    def close(self):
+        """Finish queued page writes and stop the background writer."""
+        if self._page_writer is not None:
+            self._page_writer.close()
+
     # ──────────────────────────────────────────────────────────────
     # Helpers
     # ──────────────────────────────────────────────────────────────
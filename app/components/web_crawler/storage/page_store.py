@@ -0,0 +1,246 @@
+"""
+page_store.py
+-------------
+Sharded, compressed storage for page records (output.page_store = "shards").
+
+Layout under output/pages/:
+- shards/pages-00000.jsonl.gz   — rolling shards, a new one past shard_size_mb
+- shards/index.jsonl            — url_hash → {shard, offset, length, line, url}
+                                  (append-only, storage/index_log.py)
+
+- Records are buffered and written as compressed blocks of up to
+  block_records JSON lines. Each block is a complete gzip member (or
+  zstd frame), so a shard is also a valid .jsonl.gz for zcat / gzip.open
+- Random access by url_hash: index → seek, read one block, decompress
+- A recrawled page is appended again; the index points at the newest copy
+- The crawl index records file_path "shards:<url_hash>": which shard a
+  record lands in is only known once its block is written
+- Blocks are written before their index lines: after a crash the index
+  never points at data that isn't on disk
+- codec: "gzip" (stdlib) or "zstd" (pip install zstandard)
+
+Reading (RAG ingestion, reparse) goes through iter_pages() / load_page(),
+which also read the one-JSON-file-per-page layout (output.page_store = "files").
+The shard index is cached by reader and reloaded only when the file changes.
+"""
+
+import re
+import gzip
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.components.web_crawler.storage.index_log import IndexLog
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+SHARDS_DIR = "shards"
+INDEX_FILE = "index.jsonl"
+FILE_PATH_PREFIX = "shards:"    # crawl-index file_path of a sharded page
+CODEC_EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+COMPRESS_LEVEL = 3          # gzip 3 ≈ 7% larger than 6 at a quarter of the CPU
+_SHARD_RE = re.compile(r"^pages-(\d+)\.jsonl\.(gz|zst)$")
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=COMPRESS_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+
+
+def _decompress(data: bytes, shard_name: str) -> bytes:
+    if shard_name.endswith(".zst"):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"{shard_name} is zstd-compressed — pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class PageStore:
+    """
+    Writer for the sharded page layout. add() is thread-safe; records are
+    on disk (and findable by readers) after flush().
+    """
+
+    def __init__(self, pages_dir, config: dict):
+        output_cfg = config.get("output", {})
+        self.codec = output_cfg.get("page_codec", "gzip")
+        if self.codec == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard not installed — page shards use gzip")
+            self.codec = "gzip"
+        self.block_records = max(1, int(output_cfg.get("shard_block_records", 64)))
+        self.shard_bytes = int(output_cfg.get("shard_size_mb", 64) * 1024 * 1024)
+
+        self.dir = Path(pages_dir) / SHARDS_DIR
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._index_log = IndexLog(self.dir / INDEX_FILE, output_cfg.get("index_compact_ratio", 2.0))
+        self._index = self._index_log.load()
+        self._lock = threading.Lock()
+        self._pending: dict = {}         # url_hash → record, not yet in a block
+
+        # a resumed crawl starts a fresh shard (the last one may end in an unindexed block)
+        numbers = [int(m.group(1)) for m in map(_SHARD_RE.match, (p.name for p in self.dir.iterdir())) if m]
+        self._shard_no = max(numbers, default=-1) + 1
+        self._shard_path = self._new_shard_path()
+
+        # stats
+        self.blocks_written = 0
+        self.bytes_written = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # Public interface
+    # ──────────────────────────────────────────────────────────────
+
+    def add(self, url_hash: str, record: dict) -> str:
+        """Queue a page record; returns its crawl-index file_path ("shards:<url_hash>")."""
+        with self._lock:
+            self._pending[url_hash] = record
+            if len(self._pending) >= self.block_records:
+                self._write_block()
+        return FILE_PATH_PREFIX + url_hash
+
+    def get(self, url_hash: str) -> Optional[dict]:
+        """Page record by url_hash (buffered or on disk), None if unknown."""
+        with self._lock:
+            if url_hash in self._pending:
+                return self._pending[url_hash]
+            entry = self._index.get(url_hash)
+        return _read_record(self.dir, entry) if entry else None
+
+    def flush(self):
+        """Write buffered records as a block and index them."""
+        with self._lock:
+            self._write_block()
+
+    def stats(self) -> dict:
+        return {
+            "pages": len(self._index) + len(self._pending),
+            "blocks_written": self.blocks_written,
+            "bytes_written": self.bytes_written,
+        }
+
+    # ──────────────────────────────────────────────────────────────
+    # Internal helpers (called with self._lock held)
+    # ──────────────────────────────────────────────────────────────
+
+    def _write_block(self):
+        if not self._pending:
+            return
+        if self._shard_path.exists() and self._shard_path.stat().st_size >= self.shard_bytes:
+            self._shard_no += 1
+            self._shard_path = self._new_shard_path()
+
+        records = list(self._pending.items())
+        self._pending = {}
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for _, r in records).encode("utf-8")
+        block = _compress(data, self.codec)
+        with open(self._shard_path, "ab") as f:
+            offset = f.tell()
+            f.write(block)
+
+        entries = {
+            url_hash: {
+                "shard": self._shard_path.name,
+                "offset": offset,
+                "length": len(block),
+                "line": line,
+                "url": record.get("url", ""),
+            }
+            for line, (url_hash, record) in enumerate(records)
+        }
+        self._index_log.append(entries)
+        self._index.update(entries)
+        if self._index_log.needs_compaction(len(self._index)):
+            self._index_log.compact(self._index)
+        self.blocks_written += 1
+        self.bytes_written += len(block)
+
+    def _new_shard_path(self) -> Path:
+        return self.dir / f"pages-{self._shard_no:05d}{CODEC_EXTENSIONS[self.codec]}"
+
+
+# ──────────────────────────────────────────────────────────────────
+# Reader side
+# ──────────────────────────────────────────────────────────────────
+
+def _read_block(shards_dir: Path, shard: str, offset: int, length: int) -> list[bytes]:
+    with open(shards_dir / shard, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    return _decompress(data, shard).splitlines()
+
+
+def _read_record(shards_dir: Path, entry: dict) -> dict:
+    lines = _read_block(shards_dir, entry["shard"], entry["offset"], entry["length"])
+    return json.loads(lines[entry["line"]])
+
+
+_index_cache: dict = {}      # index path → ((mtime_ns, size), index)
+
+
+def _load_index(pages_dir: Path) -> dict:
+    """Shard index of a pages dir; replayed again only after the file changed."""
+    path = pages_dir / SHARDS_DIR / INDEX_FILE
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _index_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    index = IndexLog(path).load(repair=False)
+    _index_cache[path] = (version, index)
+    return index
+
+
+def load_page(pages_dir, url_hash: str) -> Optional[dict]:
+    """
+    One page record by url_hash from either layout, None if not found.
+    (Per-page files are looked up in every domain folder.)
+    """
+    pages_dir = Path(pages_dir)
+    entry = _load_index(pages_dir).get(url_hash)
+    if entry:
+        return _read_record(pages_dir / SHARDS_DIR, entry)
+    for path in pages_dir.glob(f"*/{url_hash}.json"):
+        return json.loads(path.read_text(encoding="utf-8"))
+    return None
+
+
+def iter_pages(pages_dir) -> Iterator[dict]:
+    """
+    Every stored page record: shards first (each block read and
+    decompressed once, newest copy of each page only), then per-page
+    JSON files. Unreadable files / blocks are logged and skipped.
+    """
+    pages_dir = Path(pages_dir)
+    shards_dir = pages_dir / SHARDS_DIR
+
+    blocks: dict = {}    # (shard, offset, length) → [line numbers]
+    for entry in _load_index(pages_dir).values():
+        blocks.setdefault((entry["shard"], entry["offset"], entry["length"]), []).append(entry["line"])
+    for (shard, offset, length), wanted in sorted(blocks.items()):
+        try:
+            lines = _read_block(shards_dir, shard, offset, length)
+            for line in sorted(wanted):
+                yield json.loads(lines[line])
+        except (OSError, ValueError, IndexError, EOFError) as e:
+            logger.warning(f"Skipping unreadable block {shard}@{offset}: {e}")
+
+    for path in pages_dir.rglob("*.json"):
+        if SHARDS_DIR in path.relative_to(pages_dir).parts:
+            continue
+        try:
+            yield json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable page file {path.name}: {e}")
@@ -0,0 +1,174 @@
+"""
+response_archive.py
+-------------------
+Raw-response archive (archive.enabled) for re-parsing without the network.
+
+Layout under output/archive/:
+- responses-00000.warc.gz   — rolling files, a new one past archive.max_file_mb
+- index.jsonl               — url → {file, offset, length, final_url, ...}
+                              (append-only, storage/index_log.py)
+
+- Every 200 HTML response the fetcher reads is stored as a WARC/1.0
+  "response" record: status line, response headers, body
+- Each record is its own gzip member, so the files are ordinary
+  .warc.gz files that WARC tools (and zcat) can read
+- The body is stored as requests hands it over, i.e. with any
+  Content-Encoding already undone; Content-Encoding / Transfer-Encoding
+  are dropped from the stored headers and Content-Length matches the body
+- A record is written before its index line; the newest capture of a
+  URL wins. A resumed crawl starts a fresh file
+- record() is thread-safe (the async engine fetches from worker threads)
+
+Reading (python main.py reparse) goes through load_archive_index() / read_response().
+"""
+
+import re
+import gzip
+import uuid
+import logging
+import threading
+from pathlib import Path
+from http.client import responses as _REASONS
+from datetime import datetime, timezone
+
+from app.components.web_crawler.storage.index_log import IndexLog
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.jsonl"
+COMPRESS_LEVEL = 3          # same trade-off as the page shards
+_FILE_RE = re.compile(r"^responses-(\d+)\.warc\.gz$")
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+
+def archive_dir(config: dict) -> Path:
+    """archive.dir, else <output.base_dir>/archive."""
+    configured = config.get("archive", {}).get("dir")
+    if configured:
+        return Path(configured)
+    return Path(config.get("output", {}).get("base_dir", "./output")) / "archive"
+
+
+class ResponseArchive:
+    """
+    Writer for the archive. One instance per crawl (owned by PageFetcher).
+    """
+
+    def __init__(self, config: dict):
+        archive_cfg = config.get("archive", {})
+        self.file_bytes = int(archive_cfg.get("max_file_mb", 512) * 1024 * 1024)
+        self.dir = archive_dir(config)
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+        self._index_log = IndexLog(self.dir / INDEX_FILE,
+                                   config.get("output", {}).get("index_compact_ratio", 2.0))
+        self._index = self._index_log.load()
+        self._lock = threading.Lock()
+
+        # a resumed crawl starts a fresh file (the last one may end in an unindexed record)
+        numbers = [int(m.group(1)) for m in map(_FILE_RE.match, (p.name for p in self.dir.iterdir())) if m]
+        self._file_no = max(numbers, default=-1) + 1
+        self._path = self._new_path()
+
+        # stats
+        self.records_written = 0
+        self.bytes_written = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # Public interface
+    # ──────────────────────────────────────────────────────────────
+
+    def record(self, fetch_result, headers: dict, body: bytes):
+        """Archive one response (fetch_result supplies url, final_url, status, timing)."""
+        fetched_at = fetch_result.fetched_at or datetime.now(timezone.utc).isoformat()
+        data = gzip.compress(
+            _warc_record(fetch_result.final_url or fetch_result.url, fetch_result.status_code,
+                         headers, body, fetched_at),
+            compresslevel=COMPRESS_LEVEL,
+        )
+        with self._lock:
+            if self._path.exists() and self._path.stat().st_size >= self.file_bytes:
+                self._file_no += 1
+                self._path = self._new_path()
+            with open(self._path, "ab") as f:
+                offset = f.tell()
+                f.write(data)
+
+            entry = {
+                "file": self._path.name,
+                "offset": offset,
+                "length": len(data),
+                "final_url": fetch_result.final_url,
+                "status_code": fetch_result.status_code,
+                "redirect_chain": fetch_result.redirect_chain,
+                "response_time_ms": fetch_result.response_time_ms,
+                "fetched_at": fetched_at,
+            }
+            self._index_log.append({fetch_result.url: entry})
+            self._index[fetch_result.url] = entry
+            if self._index_log.needs_compaction(len(self._index)):
+                self._index_log.compact(self._index)
+            self.records_written += 1
+            self.bytes_written += len(data)
+
+    def stats(self) -> dict:
+        return {
+            "responses": len(self._index),
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written,
+        }
+
+    def _new_path(self) -> Path:
+        return self.dir / f"responses-{self._file_no:05d}.warc.gz"
+
+
+def _warc_record(target_uri: str, status: int, headers: dict, body: bytes, fetched_at: str) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}".rstrip()]
+    lines += [f"{name}: {value}" for name, value in headers.items()
+              if name.lower() not in _DROPPED_HEADERS]
+    lines.append(f"Content-Length: {len(body)}")
+    http_block = ("\r\n".join(lines) + "\r\n\r\n").encode("iso-8859-1", errors="replace") + body
+
+    date = datetime.fromisoformat(fetched_at).astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    warc_headers = (
+        "WARC/1.0\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        f"WARC-Date: {date}\r\n"
+        f"WARC-Target-URI: {target_uri}\r\n"
+        "Content-Type: application/http; msgtype=response\r\n"
+        f"Content-Length: {len(http_block)}\r\n"
+        "\r\n"
+    ).encode("utf-8")
+    return warc_headers + http_block + b"\r\n\r\n"
+
+
+# ──────────────────────────────────────────────────────────────────
+# Reader side
+# ──────────────────────────────────────────────────────────────────
+
+def load_archive_index(directory) -> dict:
+    """{url: index entry} for the archive in `directory` ({} if there is none)."""
+    log = IndexLog(Path(directory) / INDEX_FILE)
+    return log.load(repair=False) if log.exists() else {}
+
+
+def read_response(directory, entry: dict) -> tuple[dict, bytes]:
+    """(headers, body) of the archived response an index entry points at."""
+    with open(Path(directory) / entry["file"], "rb") as f:
+        f.seek(entry["offset"])
+        record = gzip.decompress(f.read(entry["length"]))
+
+    warc_head, _, rest = record.partition(b"\r\n\r\n")
+    lengths = [int(line.split(b":", 1)[1]) for line in warc_head.split(b"\r\n")
+               if line.lower().startswith(b"content-length:")]
+    if not lengths:
+        raise ValueError(f"{entry['file']}@{entry['offset']}: not a WARC record")
+    block_length = lengths[0]
+    http_head, _, body = rest[:block_length].partition(b"\r\n\r\n")
+
+    headers = {}
+    for line in http_head.decode("iso-8859-1").split("\r\n")[1:]:     # skip the status line
+        name, _, value = line.partition(":")
+        headers[name.strip()] = value.strip()
+    return headers, body
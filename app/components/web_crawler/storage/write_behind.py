@@ -0,0 +1,188 @@
+"""
+write_behind.py
+---------------
+Background writer for page JSON files (output.write_behind).
+
+- Crawl threads hand over (path, record) and return immediately; they
+  only block when the bounded queue (output.write_queue_size) is full
+- The writer thread takes up to output.write_batch_size records at a
+  time and serializes them off the crawl thread
+- Every file is written as <name>.tmp and renamed into place, so a
+  crash never leaves a truncated page JSON behind
+- With output.fsync the batch's temp files are fsynced back to back
+  before the renames, then each directory once per batch (instead of
+  a directory fsync per page; skipped on Windows, where directories
+  can't be opened)
+- A record that fails to write or rename is logged, its temp file
+  removed, and the rest of the batch carries on
+- flush() waits until everything queued is on disk; wait_for(n) only
+  until the first n submitted records are (what an index flush needs,
+  without also waiting for pages queued after it). A record still in
+  the queue can be read back with pending()
+"""
+
+import os
+import json
+import queue
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = None
+
+
+class WriteBehind:
+    """
+    One writer thread behind a bounded queue.
+    submit() / pending() / flush() / wait_for() are safe from any thread.
+    """
+
+    def __init__(self, config: dict):
+        output_cfg = config.get("output", {})
+        self.pretty = output_cfg.get("pretty_json", True)
+        self.fsync = output_cfg.get("fsync", True)
+        self.batch_size = max(1, int(output_cfg.get("write_batch_size", 32)))
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(output_cfg.get("write_queue_size", 256))))
+        self._pending: dict = {}         # path → record, queued or being written
+        self._lock = threading.Lock()
+        self._written_cond = threading.Condition(self._lock)
+        self._submit_lock = threading.Lock()    # counter + put in one step: queue order = count order
+        self.submitted = 0               # records queued so far
+        self._finished = 0               # of those, written (or failed) — FIFO, so always a prefix
+        self._thread = threading.Thread(target=self._run, name="page-writer", daemon=True)
+        self._thread.start()
+
+        # stats
+        self.files_written = 0
+        self.batches = 0
+        self.errors = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # Public interface
+    # ──────────────────────────────────────────────────────────────
+
+    def submit(self, path: Path, record: dict):
+        """Queue a record to be written as JSON to `path` (record must not change afterwards)."""
+        with self._submit_lock:
+            with self._lock:
+                self._pending[path] = record
+                self.submitted += 1
+            self._queue.put((path, record))
+
+    def pending(self, path: Path) -> Optional[dict]:
+        """The queued record for `path`, if it hasn't reached the disk yet."""
+        with self._lock:
+            return self._pending.get(path)
+
+    def flush(self):
+        """Block until every queued record is written."""
+        self._queue.join()
+
+    def wait_for(self, count: int):
+        """Block until the first `count` submitted records are written (or failed)."""
+        with self._written_cond:
+            self._written_cond.wait_for(lambda: self._finished >= count)
+
+    def close(self):
+        """Write what is queued and stop the thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        return {"files_written": self.files_written, "batches": self.batches, "errors": self.errors}
+
+    # ──────────────────────────────────────────────────────────────
+    # Writer thread
+    # ──────────────────────────────────────────────────────────────
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch([job for job in batch if job is not _STOP])
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Page write batch failed: {e}")
+            finally:
+                with self._written_cond:
+                    self._finished += sum(1 for job in batch if job is not _STOP)
+                    self._written_cond.notify_all()
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is _STOP:
+                return
+
+    def _write_batch(self, jobs: list):
+        written = []                     # (tmp, path, record)
+        for path, record in jobs:
+            tmp = path.with_name(path.name + ".tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(record, f, ensure_ascii=False, indent=2 if self.pretty else None)
+                written.append((tmp, path, record))
+            except Exception as e:
+                self._failed(tmp, path, record, e)
+
+        if self.fsync:
+            synced = []
+            for tmp, path, record in written:
+                try:
+                    _fsync(tmp)
+                    synced.append((tmp, path, record))
+                except OSError as e:
+                    self._failed(tmp, path, record, e)
+            written = synced
+
+        renamed = []
+        for tmp, path, record in written:
+            try:
+                os.replace(tmp, path)
+                renamed.append(path)
+            except OSError as e:
+                self._failed(tmp, path, record, e)
+            else:
+                self._done(path, record)
+
+        self.files_written += len(renamed)
+        self.batches += 1
+
+        if self.fsync and os.name != "nt":
+            for directory in {path.parent for path in renamed}:
+                try:
+                    _fsync(directory)
+                except OSError as e:
+                    logger.warning(f"Could not fsync {directory}: {e}")
+
+    def _failed(self, tmp: Path, path: Path, record: dict, error: Exception):
+        self.errors += 1
+        logger.error(f"Failed to write {path}: {error}")
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+        self._done(path, record)
+
+    def _done(self, path: Path, record: dict):
+        with self._lock:
+            if self._pending.get(path) is record:
+                del self._pending[path]
+
+
+def _fsync(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)